@@ -0,0 +1,76 @@
+"""
+Micro-benchmarks for attribute access on :class:`Pattern`, comparing the :class:`cached_property` descriptors with
+the ``__getattribute__`` interception :class:`CacheProperties` used before.
+
+Usage: ``python benchmarks/cache_bench.py [repeat]``
+"""
+import sys
+import timeit
+
+from juggling.pattern import Pattern, UserList
+
+
+class LegacyCacheProperties(object):
+    """ The previous implementation of :class:`CacheProperties`, kept here to benchmark against """
+    _cache_exclude = []
+
+    def __init__(self, *args, **kwargs):  # noqa
+        self._cache = {}
+        super(LegacyCacheProperties, self).__init__()
+
+    def _clear_cache(self):
+        try:
+            self._cache.clear()
+        except AttributeError:
+            pass
+
+    def __setattr__(self, key, value):
+        if key != '_cache' and key in self._cache:
+            del self._cache[key]
+        super(LegacyCacheProperties, self).__setattr__(key, value)
+
+    def __getattribute__(self, name, *args, **kwargs):
+        exclude_attrs = super(LegacyCacheProperties, self).__getattribute__('_cache_exclude')
+        if (not name.startswith('__') and
+                name not in ['_cache', '_cached_attrs', '_clear_cache'] + exclude_attrs and
+                isinstance(getattr(self.__class__, name, None), property)):
+            cache = super(LegacyCacheProperties, self).__getattribute__('_cache')
+            if name not in cache:
+                cache[name] = super(LegacyCacheProperties, self).__getattribute__(name)
+            return cache[name]
+
+        return super(LegacyCacheProperties, self).__getattribute__(name, *args, **kwargs)
+
+
+def _legacy_pattern_class():
+    namespace = dict((name, property(attr.fget)) for name, attr in vars(Pattern).items() if isinstance(attr, property))
+    namespace['__init__'] = lambda self, pattern: (LegacyCacheProperties.__init__(self),
+                                                   UserList.__init__(self, initlist=pattern))[0]
+    return type('LegacyPattern', (LegacyCacheProperties, UserList), namespace)
+
+
+LegacyPattern = _legacy_pattern_class()
+
+PATTERN = [9, 7, 5, 3, 1] * 20
+
+BENCHMARKS = [
+    ('cached property', 'p.period', 100000),
+    ('plain attribute', 'p.data', 100000),
+    ('len()', 'len(p)', 100000),
+    ('uncached is_valid', 'p._clear_cache(); p.is_valid', 200),
+]
+
+
+def main(repeat=5):
+    for name, statement, number in BENCHMARKS:
+        results = []
+        for cls in ('LegacyPattern', 'Pattern'):
+            # the pattern is made in the setup, as timeit only takes globals from py3.5
+            setup = 'from {} import {} as cls, PATTERN; p = cls(PATTERN); p.period'.format(__name__, cls)
+            timings = timeit.repeat(statement, setup=setup, repeat=repeat, number=number)
+            results.append(min(timings) / number * 1e9)
+        print('{:<18} before {:10.1f} ns   after {:10.1f} ns'.format(name, *results))
+
+
+if __name__ == '__main__':
+    main(*[int(_) for _ in sys.argv[1:2]])
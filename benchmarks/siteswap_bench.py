@@ -0,0 +1,32 @@
+"""
+Compares the single pass siteswap scanner, :func:`parse_siteswap`, with the regex validation followed by
+:func:`convert_str_to_beat_list` that :class:`Siteswap` used to run.
+
+Usage: ``python benchmarks/siteswap_bench.py [repeat]``
+"""
+import sys
+import timeit
+
+from juggling.notation.siteswap import is_valid_siteswap_syntax, convert_str_to_beat_list, parse_siteswap
+
+
+CORPUS = [
+    '3', '441', '531', '97531', '744', '(4,4)', '(6x,4)*', '[54]24', '[64]020', '(4,2x)(2x,4)',
+    '[33](3,3)123', '(4,2)(2x,[44x])', 'db97531', '9' * 40, '(6x,4)(4,6x)' * 10,
+]
+
+
+def regex_path(siteswap):
+    if is_valid_siteswap_syntax(siteswap):
+        return convert_str_to_beat_list(siteswap)
+
+
+def main(repeat=5, number=2000):
+    for name, func in (('regex + convert', regex_path), ('single pass', parse_siteswap)):
+        timings = timeit.repeat(lambda: [func(_) for _ in CORPUS], repeat=repeat, number=number)
+        per_pattern = min(timings) / (number * len(CORPUS))
+        print('{:<16} {:8.2f} us/pattern'.format(name, per_pattern * 1e6))
+
+
+if __name__ == '__main__':
+    main(*[int(_) for _ in sys.argv[1:2]])
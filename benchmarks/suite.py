@@ -0,0 +1,176 @@
+"""
+Benchmark suite for parsing, validation, state generation and serialisation.
+
+Every operation is timed over a set of fixed corpora, and the memory used by each pattern is measured with
+:mod:`tracemalloc` once it has been parsed and once it has been analysed, on the interpreters that have it. The
+results are written as JSON, and can be compared with the results of an earlier run to catch regressions:
+
+    python benchmarks/suite.py --output baseline.json
+    python benchmarks/suite.py --compare baseline.json --tolerance 0.25
+
+With ``--compare`` the exit status is 1 if any operation got slower, or any pattern bigger, by more than the
+tolerance.
+
+Usage: ``python benchmarks/suite.py [--quick] [--output FILE] [--compare FILE] [--tolerance FRACTION]``
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None  # py3.4+, memory isn't measured without it
+
+import juggling
+from juggling.notation.siteswap import Siteswap, is_valid_siteswap_syntax, parse_siteswap
+from juggling.pattern import Pattern
+from juggling.pattern.generator import generate_siteswaps
+
+
+def _siteswap_str(throws):
+    return ''.join('0123456789abcdefghijklmnopqrstuvwxyz'[_] for _ in throws)
+
+
+# each corpus is a list of (siteswap, number of jugglers), built the same way every run
+CORPORA = {
+    'small': [(_, 1) for _ in ['3', '441', '531', '97531', '744', '51', '423', '4', '55550', '6316131']],
+    'long_period': [(_siteswap_str(_), 1) for _ in generate_siteswaps(5, 9, 12, limit=50)],
+    'multiplex': [(_, 1) for _ in ['[54]24', '[64]020', '[43]23', '[32]', '[53]3[42]2', '[44]4[22]0', '[75]1[63]3']],
+    'sync': [(_, 1) for _ in ['(4,4)', '(6x,4)*', '(4,2x)*', '(4,2x)(2x,4)', '(6,4x)(4x,2)', '([44x],2)*',
+                              '(4,2)(2x,[44x])']],
+    'high_throw': [(_siteswap_str(range(2 * n - 1, 0, -2)), 1) for n in range(8, 19)] +
+                  [(_siteswap_str([n, n - 1, 1]), 1) for n in range(20, 36, 3)],
+    'passing': [('<3p|3p>', 2), ('<4p|3><3|4p>', 2), ('<[3p3]|3><3|[3p3]>', 2), ('<(4p,4)|(4p,4)>', 2),
+                ('<3p2|3p1|3>', 3)],
+}
+
+# each operation is (name, function of a prepared item, kind of item it takes, corpora to run it on or None for
+# every solo corpus). Pattern operations build a new Pattern every time so that nothing is cached between runs.
+OPERATIONS = [
+    ('Siteswap', lambda item: Siteswap(item), 'notation', None),
+    ('Siteswap.pattern', lambda item: Siteswap(item).pattern, 'notation', None),
+    ('is_valid_siteswap_syntax', lambda item: is_valid_siteswap_syntax(*item), 'notation_jugglers',
+     list(CORPORA)),
+    ('Pattern.is_valid', lambda item: Pattern(item).is_valid, 'beats', None),
+    ('Pattern.states', lambda item: Pattern(item).states, 'beats', None),
+    ('Pattern.transitions', lambda item: (Pattern(item).entry_transitions, Pattern(item).exit_transitions),
+     'beats', None),
+    ('Siteswap.to_JSON', lambda item: Siteswap(item).to_JSON(), 'notation', None),
+]
+
+
+def _prepare(corpus, kind):
+    # type: (list, str) -> list
+    if kind == 'notation_jugglers':
+        return corpus
+    if kind == 'notation':
+        return [notation for notation, _ in corpus]
+    return [parse_siteswap(notation) for notation, _ in corpus]
+
+
+def time_operation(func, items, repeat, number):
+    # type: (Callable, list, int, int) -> dict
+    """ Returns the best and median time per item, in microseconds, of `func` over every item """
+    def run():
+        for item in items:
+            func(item)
+    timings = sorted(timeit.repeat(run, repeat=repeat, number=number))
+    scale = 1e6 / (number * len(items))
+    return {'best_us': min(timings) * scale, 'median_us': timings[len(timings) // 2] * scale}
+
+
+def measure_memory(corpus):
+    # type: (list) -> dict
+    """ Returns the bytes kept per pattern after parsing each siteswap in `corpus`, and after analysing it """
+    notations = [notation for notation, _ in corpus]
+    result = {}
+    for stage in ('parsed', 'analysed'):
+        gc.collect()
+        tracemalloc.start()
+        siteswaps = [Siteswap(_) for _ in notations]
+        for siteswap in siteswaps:
+            siteswap.pattern
+            if stage == 'analysed':
+                siteswap.pattern.is_valid
+                siteswap.pattern.states
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result[stage] = float(current) / len(siteswaps)
+        del siteswaps
+    return result
+
+
+def run_suite(quick=False):
+    # type: (bool) -> dict
+    repeat, number = (3, 5) if quick else (7, 50)
+    timings = []
+    for name, func, kind, corpora in OPERATIONS:
+        for corpus_name in corpora or [_ for _, corpus in sorted(CORPORA.items()) if corpus[0][1] == 1]:
+            items = _prepare(CORPORA[corpus_name], kind)
+            result = {'operation': name, 'corpus': corpus_name, 'patterns': len(items)}
+            result.update(time_operation(func, items, repeat, number))
+            timings.append(result)
+
+    memory = []
+    for corpus_name, corpus in sorted(CORPORA.items()):
+        if corpus[0][1] == 1 and tracemalloc is not None:
+            for stage, size in sorted(measure_memory(corpus).items()):
+                memory.append({'corpus': corpus_name, 'stage': stage, 'bytes_per_pattern': size})
+
+    return {
+        'juggling_version': juggling.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timings': timings,
+        'memory': memory,
+    }
+
+
+def compare(results, baseline, tolerance):
+    # type: (dict, dict, float) -> list
+    """ Returns a message for every timing or memory result that is worse than `baseline` by more than `tolerance` """
+    regressions = []
+    for section, key, value in (('timings', ('operation', 'corpus'), 'best_us'),
+                                ('memory', ('corpus', 'stage'), 'bytes_per_pattern')):
+        previous = dict((tuple(_[k] for k in key), _[value]) for _ in baseline.get(section, []))
+        for result in results[section]:
+            before = previous.get(tuple(result[k] for k in key))
+            if before and result[value] > before * (1 + tolerance):
+                regressions.append('{} {}: {:.2f} -> {:.2f} {}'.format(
+                    section, '/'.join(str(result[k]) for k in key), before, result[value], value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark parsing, validation, states and serialisation')
+    parser.add_argument('--quick', action='store_true', help='fewer repetitions, for a rough check')
+    parser.add_argument('--output', help='write the JSON results to this file instead of stdout')
+    parser.add_argument('--compare', help='JSON results of an earlier run to check for regressions against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown, as a fraction')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.quick)
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+            f.write('\n')
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            sys.stderr.write('regression: {}\n'.format(regression))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
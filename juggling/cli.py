@@ -0,0 +1,135 @@
+"""
+Command line validator and analyser for siteswaps.
+
+Siteswaps are read one per line from the given files, or stdin, and a line is written for each one with the fields
+of its :class:`Siteswap` (see :attr:`JugglingNotation.json_fields`) as tab separated values or newline delimited
+JSON. Blank lines and lines starting with '#' are skipped.
+
+    $ printf '441\\n443\\n' | python -m juggling --fields notation_pattern,is_valid,num_objects
+    notation_pattern	is_valid	num_objects
+    441	true	3
+    443	false	3
+
+With ``--jobs`` the siteswaps are analysed in batches by a pool of worker processes. Only a few batches are in
+flight at a time and their results are written in the same order as the input, so any amount of input can be piped
+through in bounded memory.
+"""
+import argparse
+import errno
+import json
+import sys
+from collections import deque
+from multiprocessing import Pool
+
+from .notation.siteswap import Siteswap
+
+
+__all__ = ['main', 'analyse_lines']
+
+
+DEFAULT_FIELDS = ('notation_pattern', 'is_valid_syntax', 'is_valid', 'period', 'num_objects', 'max_throw',
+                  'is_excited', 'states')
+
+
+def _read_lines(paths):
+    # type: (list) -> Iterator
+    """ Yields every siteswap in the given files, where '-' is stdin """
+    for path in paths:
+        f = sys.stdin if path == '-' else open(path)
+        try:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def _batches(lines, size):
+    # type: (Iterable, int) -> Iterator
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def analyse_lines(lines, num_jugglers=1, fields=DEFAULT_FIELDS, output_format='tsv'):
+    # type: (list, int, Iterable, str) -> str
+    """ Analyses every siteswap in `lines` and returns the output for all of them, one line each """
+    output = []
+    for line in lines:
+        data = Siteswap(line, num_jugglers=num_jugglers).to_dict(fields)
+        if output_format == 'ndjson':
+            output.append(json.dumps(data, sort_keys=True, separators=(',', ':')))
+        else:
+            output.append('\t'.join(data[_] if _ == 'notation_pattern' else json.dumps(data[_], separators=(',', ':'))
+                                    for _ in fields))
+    output.append('')
+    return '\n'.join(output)
+
+
+def _analyse_batch(args):
+    # type: (tuple) -> str
+    return analyse_lines(*args)
+
+
+def _run(batches, jobs, options):
+    # type: (Iterator, int, tuple) -> Iterator
+    """ Yields the output of every batch in order, analysing them in `jobs` worker processes if there is more than
+    one. At most two batches per worker are queued up at once. """
+    if jobs <= 1:
+        for batch in batches:
+            yield analyse_lines(batch, *options)
+        return
+
+    pool = Pool(jobs)
+    try:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.apply_async(_analyse_batch, ((batch, ) + options, )))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+
+
+def main(argv=None):
+    # type: (list) -> int
+    parser = argparse.ArgumentParser(prog='juggling', description='Validate and analyse siteswaps, one per line')
+    parser.add_argument('files', nargs='*', default=['-'], help="files to read, '-' or nothing for stdin")
+    parser.add_argument('-j', '--jugglers', type=int, default=1, help='number of jugglers in the siteswaps')
+    parser.add_argument('-f', '--format', choices=('tsv', 'ndjson'), default='tsv', help='output format')
+    parser.add_argument('--fields', default=','.join(DEFAULT_FIELDS),
+                        help='comma separated fields to output, from: {}'.format(', '.join(Siteswap.json_fields)))
+    parser.add_argument('--no-header', action='store_true', help="don't write the header line of the TSV output")
+    parser.add_argument('--jobs', type=int, default=1, help='number of worker processes')
+    parser.add_argument('--batch-size', type=int, default=1000, help='number of siteswaps given to a worker at once')
+    args = parser.parse_args(argv)
+
+    fields = tuple(_ for _ in args.fields.split(',') if _)
+    unknown = [_ for _ in fields if _ not in Siteswap.json_fields]
+    if unknown:
+        parser.error('unknown fields: {}'.format(', '.join(unknown)))
+    if args.jugglers < 1 or args.jobs < 1 or args.batch_size < 1:
+        parser.error('--jugglers, --jobs and --batch-size must be at least 1')
+
+    out = sys.stdout
+    options = (args.jugglers, fields, args.format)
+    try:
+        if args.format == 'tsv' and not args.no_header:
+            out.write('\t'.join(fields) + '\n')
+        for output in _run(_batches(_read_lines(args.files), args.batch_size), args.jobs, options):
+            out.write(output)
+        out.flush()
+    except IOError as e:  # BrokenPipeError is py3 only
+        if e.errno != errno.EPIPE:
+            raise
+        sys.stderr.close()  # the output was closed early, e.g. by head
+    return 0
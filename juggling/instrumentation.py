@@ -0,0 +1,158 @@
+"""
+Opt-in instrumentation of the parsing and analysis hot paths.
+
+While instrumentation is enabled every instrumented function records how many times it was called and the time
+spent in it, and every :class:`juggling.utils.cached_property` records its cache hits and misses along with the time
+spent computing the misses, keyed by class and property name such as ``Pattern.states``. While it is disabled the
+only cost is a single flag check per call of an instrumented function, cached properties switch to their recording
+lookup only while it is enabled.
+
+>>> with recording():
+...     Siteswap('441').pattern.states
+>>> stats()['Pattern.states'] == Stats(calls=1, total_time=..., hits=0, misses=1)
+
+The recorded stats can also be written to :data:`juggling.logger` with :func:`log_stats`.
+"""
+import logging
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import wraps
+from timeit import default_timer as timer  # time.perf_counter where there is one, it is new in Python 3.3
+
+from juggling import logger
+
+
+__all__ = ['Stats', 'enable', 'disable', 'is_enabled', 'reset', 'stats', 'log_stats', 'recording', 'instrumented',
+           'on_toggle']
+
+
+Stats = namedtuple('Stats', ['calls', 'total_time', 'hits', 'misses'])
+Stats.__doc__ = """
+The stats recorded for a function or cached property. `total_time` is in seconds. For functions `hits` and `misses`
+are always 0, for cached properties `calls` is the number of lookups and `total_time` the time spent on misses.
+"""
+
+#: Whether instrumentation is recording, only change this with :func:`enable` and :func:`disable`
+enabled = False
+
+_records = {}  # name -> [calls, total time, hits, misses]
+_lock = threading.Lock()
+_local = threading.local()  # the depth of each instrumented function in the current thread
+_toggle_callbacks = []
+
+
+def on_toggle(callback):
+    # type: (Callable) -> None
+    """ Registers `callback` to be called with the new value of :data:`enabled` whenever recording is enabled or
+    disabled, and once straight away with its current value """
+    _toggle_callbacks.append(callback)
+    callback(enabled)
+
+
+def _set_enabled(value):
+    # type: (bool) -> None
+    global enabled
+    enabled = value
+    for callback in _toggle_callbacks:
+        callback(value)
+
+
+def enable():
+    """ Starts recording stats """
+    _set_enabled(True)
+
+
+def disable():
+    """ Stops recording stats, any stats already recorded are kept """
+    _set_enabled(False)
+
+
+def is_enabled():
+    # type: () -> bool
+    return enabled
+
+
+def reset():
+    """ Forgets every recorded stat """
+    with _lock:
+        _records.clear()
+
+
+def stats():
+    # type: () -> dict
+    """ Returns a dict of name -> :class:`Stats` for everything recorded since the last :func:`reset` """
+    with _lock:
+        return dict((name, Stats(*record)) for name, record in _records.items())
+
+
+def record_call(name, elapsed):
+    # type: (str, float) -> None
+    """ Records a call to the function `name` that took `elapsed` seconds """
+    with _lock:
+        record = _records.setdefault(name, [0, 0., 0, 0])
+        record[0] += 1
+        record[1] += elapsed
+
+
+def record_lookup(name, hit, elapsed=0.):
+    # type: (str, bool, float) -> None
+    """ Records a cache lookup of the property `name`, where a miss took `elapsed` seconds to compute """
+    with _lock:
+        record = _records.setdefault(name, [0, 0., 0, 0])
+        record[0] += 1
+        record[1] += elapsed
+        record[2 if hit else 3] += 1
+
+
+def log_stats(level=logging.INFO):
+    # type: (int) -> None
+    """ Logs every recorded stat to :data:`juggling.logger`, one line each, slowest first """
+    for name, stat in sorted(stats().items(), key=lambda item: -item[1].total_time):
+        message = '{}: {} calls, {:.3f} ms'.format(name, stat.calls, stat.total_time * 1000)
+        if stat.hits or stat.misses:
+            message += ', {} hits, {} misses ({:.1%} hit rate)'.format(
+                stat.hits, stat.misses, float(stat.hits) / stat.calls)
+        logger.log(level, message)
+
+
+@contextmanager
+def recording(log_level=None):
+    # type: (int) -> None
+    """
+    Context manager that resets the stats and records them for the duration of the block. Recording is left
+    enabled afterwards only if it was enabled before.
+
+    :param log_level: Log the stats at this level at the end of the block, see :func:`log_stats`
+    """
+    was_enabled = enabled
+    reset()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+        if log_level is not None:
+            log_stats(log_level)
+
+
+def instrumented(func):
+    """ Decorates a function so that its calls are recorded while instrumentation is enabled. Only the outermost
+    call of a recursive function is timed, but every call is counted. """
+    name = '{}.{}'.format(func.__module__, getattr(func, '__qualname__', func.__name__))
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not enabled:
+            return func(*args, **kwargs)
+        depths = _local.__dict__
+        depth = depths.get(name, 0)
+        depths[name] = depth + 1
+        start = timer()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            depths[name] = depth
+            record_call(name, 0. if depth else timer() - start)
+    return wrapper
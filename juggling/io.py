@@ -0,0 +1,245 @@
+"""
+Reading and writing pattern catalogues.
+
+Text catalogues have one siteswap per line and are read lazily with :func:`read_siteswaps`. Binary catalogues store
+patterns already parsed, so they can be loaded without parsing any notation, in a compact format made of a header
+followed by one record per pattern:
+
+* header: the magic bytes ``PJPF``, a format version byte, three reserved bytes and the number of patterns as an
+  unsigned 64 bit integer
+* record: the number of beats, number of throws and length of the notation as unsigned 16 bit integers, followed by
+  the throws (signed 16 bit integers), the offset of the first throw of each beat (unsigned 16 bit integers) and the
+  flags of each throw (bytes) of a :class:`FrozenPattern`, and the UTF-8 notation of the :class:`Siteswap` the
+  pattern was written from, if any
+
+All integers are little endian. Binary catalogues are written with :class:`PatternWriter` and read, memory-mapped,
+with :class:`PatternReader`.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from .notation.siteswap import Siteswap, format_siteswap
+from .pattern import Pattern, FrozenPattern
+from .utils import array_to_bytes
+
+
+__all__ = ['read_siteswaps', 'PatternWriter', 'PatternReader', 'write_patterns']
+
+
+MAGIC = b'PJPF'
+VERSION = 1
+HEADER = struct.Struct('<4sB3xQ')
+RECORD = struct.Struct('<HHH')
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+def read_siteswaps(source, skip_invalid=False):
+    # type: (str or file, bool) -> Iterator
+    """
+    Lazily yields a :class:`Siteswap` for every line of a text catalogue. Blank lines and lines starting with '#' are
+    skipped.
+
+    :param source: A path, or a file object opened in text mode
+    :param skip_invalid: Skip siteswaps that are not valid instead of yielding them
+    """
+    if isinstance(source, str):
+        with open(source) as f:
+            for siteswap in read_siteswaps(f, skip_invalid):
+                yield siteswap
+        return
+
+    for line in source:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        siteswap = Siteswap(line)
+        if skip_invalid and not siteswap.is_valid:
+            continue
+        yield siteswap
+
+
+def _to_frozen(pattern):
+    # type: (Any) -> (FrozenPattern, bytes)
+    """ Converts a :class:`Siteswap`, :class:`Pattern` or beat list into a :class:`FrozenPattern`, along with the
+    encoded notation of a :class:`Siteswap` or an empty notation """
+    notation = b''
+    if isinstance(pattern, FrozenPattern):
+        return pattern, notation
+    if isinstance(pattern, Siteswap):
+        if pattern.pattern is None or pattern.num_jugglers > 1:
+            raise ValueError("Siteswap is not valid solo syntax: '{}'".format(pattern.notation_pattern))
+        notation = pattern.notation_pattern.encode('utf-8')
+        pattern = pattern.pattern
+    if isinstance(pattern, Pattern):
+        pattern = pattern.data
+    return FrozenPattern(pattern), notation
+
+
+def _little_endian(values):
+    # type: (array) -> bytes
+    if _BIG_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return array_to_bytes(values)
+
+
+class PatternWriter(object):
+    """
+    Streams patterns into a binary catalogue. Patterns can be given as a :class:`Siteswap`, :class:`Pattern`,
+    :class:`FrozenPattern` or beat list. The notation of a :class:`Siteswap` is kept along with its pattern.
+
+    >>> with PatternWriter('catalogue.pjp') as writer:
+    ...     writer.write(Siteswap('441'))
+    ...     writer.write(Pattern([5, 3, 1]))
+
+    :param destination: A path, or a file object opened in binary mode. The number of patterns is only recorded in
+        the header if the file is seekable.
+    """
+    def __init__(self, destination):
+        self._owns_file = isinstance(destination, str)
+        self._file = open(destination, 'wb') if self._owns_file else destination
+        self.count = 0
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, pattern):
+        # type: (Any) -> None
+        """ Appends a single pattern to the catalogue """
+        frozen, notation = _to_frozen(pattern)
+        if len(frozen.throws) > 0xffff or len(notation) > 0xffff:
+            raise ValueError("Patterns with more than 65535 throws, or notation bytes, cannot be stored")
+        write = self._file.write
+        write(RECORD.pack(len(frozen.offsets), len(frozen.throws), len(notation)))
+        write(_little_endian(frozen.throws))
+        write(_little_endian(array('H', frozen.offsets)))
+        write(array_to_bytes(frozen.flags))
+        write(notation)
+        self.count += 1
+
+    def close(self):
+        """ Records the number of patterns in the header, if possible, and closes the file if it was opened here """
+        if self._file.closed:
+            return
+        try:
+            # file objects have no seekable() on py2, seeking fails instead
+            position = self._file.tell()
+            self._file.seek(0)
+        except (AttributeError, IOError, OSError, ValueError):
+            pass
+        else:
+            self._file.write(HEADER.pack(MAGIC, VERSION, self.count))
+            self._file.seek(position)
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+def write_patterns(destination, patterns):
+    # type: (str or file, Iterable) -> int
+    """ Writes every pattern in `patterns` to a binary catalogue, see :class:`PatternWriter`. Returns the number of
+    patterns written. """
+    with PatternWriter(destination) as writer:
+        for pattern in patterns:
+            writer.write(pattern)
+    return writer.count
+
+
+class PatternReader(object):
+    """
+    Reads a binary catalogue written by :class:`PatternWriter`. The file is memory-mapped and iterating over the
+    reader yields a :class:`FrozenPattern` for each record, so any size of catalogue is read in constant memory
+    without parsing notation. :meth:`siteswaps` yields each record as a :class:`Siteswap` instead.
+
+    >>> with PatternReader('catalogue.pjp') as reader:
+    ...     patterns = [pattern.to_pattern() for pattern in reader]
+
+    :param path: Path to the catalogue
+    :param stop_on_truncated: Stop quietly at a truncated record, such as one left by a writer that was
+        interrupted, instead of raising a :class:`ValueError`. Nothing after it is read.
+    """
+    def __init__(self, path, stop_on_truncated=False):
+        # type: (str, bool) -> None
+        self.path = path
+        self.stop_on_truncated = stop_on_truncated
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError("Not a pattern catalogue: '{}'".format(path))
+        magic, self.version, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or self.version != VERSION:
+            self.close()
+            raise ValueError("Not a pattern catalogue, or an unsupported version: '{}'".format(path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for pattern, _ in self._records():
+            yield pattern
+
+    def siteswaps(self):
+        # type: () -> Iterator
+        """ Yields a :class:`Siteswap` for each record, with the notation it was written from, or the pattern in
+        siteswap notation if it wasn't written from a :class:`Siteswap`. The notation is not parsed again. """
+        for frozen, notation in self._records():
+            pattern = frozen.to_pattern()
+            siteswap = Siteswap(notation.decode('utf-8') if notation else format_siteswap(pattern.data))
+            siteswap.pattern = pattern
+            yield siteswap
+
+    def _records(self):
+        # type: () -> Iterator
+        """ Yields (pattern, encoded notation) for every record """
+        data = self._map
+        position, end = HEADER.size, len(data)
+        while position < end:
+            if position + RECORD.size > end:
+                if self.stop_on_truncated:
+                    return
+                raise ValueError("Truncated record at byte {} of '{}'".format(position, self.path))
+            num_beats, num_throws, notation_length = RECORD.unpack_from(data, position)
+            position += RECORD.size
+            if position + 3 * num_throws + 2 * num_beats + notation_length > end:
+                if self.stop_on_truncated:
+                    return
+                raise ValueError("Truncated record at byte {} of '{}'".format(position - RECORD.size, self.path))
+            throws = self._read_array('h', data, position, num_throws)
+            position += 2 * num_throws
+            offsets = array('I', self._read_array('H', data, position, num_beats))
+            position += 2 * num_beats
+            flags = self._read_array('B', data, position, num_throws)
+            position += num_throws
+            notation = data[position:position + notation_length]
+            position += notation_length
+            yield FrozenPattern._from_arrays(throws, offsets, flags), notation
+
+    @staticmethod
+    def _read_array(typecode, data, position, length):
+        # type: (str, mmap, int, int) -> array
+        values = array(typecode)
+        try:
+            values.frombytes(data[position:position + values.itemsize * length])
+        except AttributeError:
+            values.fromstring(data[position:position + values.itemsize * length])  # py2 has no frombytes
+        if _BIG_ENDIAN:
+            values.byteswap()
+        return values
+
+    def close(self):
+        """ Unmaps the catalogue """
+        self._map.close()
@@ -1,3 +1,5 @@
+from .base import dump_many
 from .siteswap import Siteswap
+from .cache import SiteswapCache
 
-__all__ = ['Siteswap']
+__all__ = ['Siteswap', 'SiteswapCache', 'dump_many']
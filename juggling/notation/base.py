@@ -1,9 +1,34 @@
 import json
+from collections import OrderedDict
 
-from juggling.utils import JugglingJSONEncoder
+from juggling.instrumentation import instrumented
+
+
+def _pattern_field(name):
+    # type: (str) -> Callable
+    """ Returns a JSON field getter for a property of the notation's :class:`Pattern`, None if there isn't one """
+    def get(notation):
+        return None if notation.pattern is None else getattr(notation.pattern, name)
+    return get
 
 
 class JugglingNotation(object):
+    #: The fields that :meth:`to_JSON` can serialise, each one a function returning a JSON serialisable value
+    json_fields = OrderedDict([
+        ('notation_pattern', lambda notation: notation.notation_pattern),
+        ('is_valid_syntax', lambda notation: notation.is_valid_syntax),
+        ('is_valid', lambda notation: notation.is_valid),
+        ('pattern', _pattern_field('data')),
+        ('period', _pattern_field('period')),
+        ('num_objects', _pattern_field('num_objects')),
+        ('max_throw', _pattern_field('max_throw')),
+        ('type', _pattern_field('type')),
+        ('is_excited', _pattern_field('is_excited')),
+        ('states', _pattern_field('states')),
+    ])
+    #: The fields that :meth:`to_JSON` serialises when none are given
+    default_json_fields = ('is_valid', 'is_valid_syntax', 'notation_pattern', 'pattern', 'period')
+
     def __init__(self, notation_pattern, raise_invalid=False):
         # type: (Any, int, bool)
         """
@@ -16,12 +41,32 @@ class JugglingNotation(object):
         """
         # keep the provided raw pattern in case we cannot change it to a Pattern
         self.notation_pattern = notation_pattern
-        # it is up to the implemented notation to create a Pattern our of the given input
-        self.pattern = None
+        # the Pattern is only created by the implemented notation, in _parse, the first time it is used
+        self._pattern = None
+        self._parsed = False
 
         if raise_invalid and not self.is_valid:
             raise ValueError("Pattern is not valid: '{}'".format(self.notation_pattern))
 
+    @property
+    def pattern(self):
+        """ The :class:`Pattern` of the notation, or None if the notation could not be converted to one. The
+        notation is only converted the first time this is used. """
+        if not self._parsed:
+            self._pattern = self._parse()
+            self._parsed = True
+        return self._pattern
+
+    @pattern.setter
+    def pattern(self, pattern):
+        self._pattern = pattern
+        self._parsed = True
+
+    def _parse(self):
+        # type: () -> Pattern or None
+        """ Converts `notation_pattern` into a :class:`Pattern`, returning None if it can't be converted """
+        return None
+
     @property
     def period(self):
         """ Property that will return the 'period', or length of beats, of the pattern before it repeats """
@@ -41,8 +86,60 @@ class JugglingNotation(object):
     def pretty_print(self):
         print(str(self.notation_pattern))
 
-    def to_JSON(self):
-        """ Return a JSON serialized version of the :class:`Notation` """
-        # We build up this data dict so that we capture the @properties as well as the attributes as well as get all
-        # inherited properties and values
-        return json.dumps(self, sort_keys=True, indent=4, cls=JugglingJSONEncoder)
+    @instrumented
+    def to_dict(self, fields=None):
+        # type: (Iterable) -> dict
+        """
+        Return a dict of the given fields of the :class:`Notation`, see :attr:`json_fields`. Only the properties that
+        are asked for are worked out.
+
+        :param fields: Names of the fields to include, defaults to :attr:`default_json_fields`
+        """
+        if fields is None:
+            fields = self.default_json_fields
+        data = {}
+        for field in fields:
+            get = self.json_fields.get(field)
+            if get is None:
+                raise ValueError("Unknown JSON field: '{}'".format(field))
+            data[field] = get(self)
+        return data
+
+    def to_JSON(self, fields=None, compact=False):
+        # type: (Iterable, bool) -> str
+        """
+        Return a JSON serialized version of the :class:`Notation`
+
+        :param fields: Names of the fields to include, see :meth:`to_dict`
+        :param compact: Leave out all indentation and whitespace
+        """
+        if compact:
+            return json.dumps(self.to_dict(fields), sort_keys=True, separators=(',', ':'))
+        return json.dumps(self.to_dict(fields), sort_keys=True, indent=4)
+
+    @classmethod
+    def from_JSON(cls, data):
+        # type: (str or dict) -> JugglingNotation
+        """ Return the :class:`Notation` serialized by :meth:`to_JSON`, as a JSON string or an already loaded dict.
+        It is rebuilt from its `notation_pattern`, which must be one of the serialized fields. """
+        if not isinstance(data, dict):
+            data = json.loads(data)
+        if 'notation_pattern' not in data:
+            raise ValueError("JSON has no 'notation_pattern' to load the notation from")
+        return cls(data['notation_pattern'])
+
+
+def dump_many(notations, stream, fields=None):
+    # type: (Iterable, file, Iterable) -> int
+    """
+    Write every notation to `stream` as newline delimited JSON, one compact object per line, without holding them
+    all in memory. Returns the number of notations written.
+
+    :param fields: Names of the fields to include, see :meth:`JugglingNotation.to_dict`
+    """
+    count = 0
+    for notation in notations:
+        stream.write(json.dumps(notation.to_dict(fields), sort_keys=True, separators=(',', ':')))
+        stream.write('\n')
+        count += 1
+    return count
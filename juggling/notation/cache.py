@@ -0,0 +1,118 @@
+from collections import namedtuple, OrderedDict
+from threading import Lock
+
+from .siteswap import Siteswap
+
+
+__all__ = ['SiteswapCache', 'SiteswapAnalysis', 'CacheInfo']
+
+
+SiteswapAnalysis = namedtuple('SiteswapAnalysis', [
+    'notation', 'num_jugglers', 'is_valid_syntax', 'is_valid', 'pattern', 'period', 'num_objects', 'max_throw', 'type',
+    'states', 'is_excited', 'targets',
+])
+SiteswapAnalysis.__doc__ = """
+An immutable analysis of a siteswap, as returned by :meth:`SiteswapCache.get`. `pattern` is a
+:class:`FrozenPattern` and `states` is a tuple of state tuples. If the siteswap is not valid syntax every field
+after `is_valid` is None, and if the pattern is not valid `states` is empty.
+
+For passing siteswaps `pattern` is a tuple with a :class:`FrozenPattern` for each juggler, `targets` a tuple of the
+targets of each juggler and `states` a tuple of the states of each juggler, see :class:`PassingPattern`. `targets`
+is None for solo siteswaps.
+"""
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def analyse_siteswap(notation, num_jugglers=1):
+    # type: (str, int) -> SiteswapAnalysis
+    """ Builds a :class:`SiteswapAnalysis` for a whitespace normalised siteswap """
+    siteswap = Siteswap(notation, num_jugglers=num_jugglers)
+    pattern = siteswap.pattern
+    if pattern is None:
+        return SiteswapAnalysis(notation, num_jugglers, False, False, *([None] * 8))
+    if num_jugglers > 1:
+        frozen = tuple(_.freeze() for _ in pattern.jugglers)
+        states = tuple(tuple(tuple(state) for state in _) for _ in pattern.states)
+        targets = tuple(tuple(_) for _ in pattern.targets)
+    else:
+        frozen = pattern.freeze()
+        states = tuple(tuple(state) for state in pattern.states)
+        targets = None
+    return SiteswapAnalysis(
+        notation=notation,
+        num_jugglers=num_jugglers,
+        is_valid_syntax=True,
+        is_valid=pattern.is_valid,
+        pattern=frozen,
+        period=pattern.period,
+        num_objects=pattern.num_objects,
+        max_throw=pattern.max_throw,
+        type=pattern.type,
+        states=states,
+        is_excited=pattern.is_excited,
+        targets=targets,
+    )
+
+
+class SiteswapCache(object):
+    """
+    An opt-in interning cache of siteswap analyses. Siteswaps are keyed by their notation, with all whitespace
+    removed, and number of jugglers, so asking for a siteswap that has been seen before is a dict lookup returning the
+    same shared :class:`SiteswapAnalysis`. The least recently used analyses are evicted once there are more than
+    `maxsize` of them.
+
+    >>> cache = SiteswapCache(maxsize=1000)
+    >>> cache.get('441') is cache.get('4 4 1')
+    >>> cache.info() == CacheInfo(hits=1, misses=1, maxsize=1000, currsize=1)
+
+    :param maxsize: Number of analyses to keep, or None to never evict any
+    """
+    def __init__(self, maxsize=1024):
+        # type: (int) -> None
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("Invalid cache size: {}".format(maxsize))
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, notation):
+        """ Whether the solo siteswap `notation` is cached, use :meth:`get` for passing siteswaps """
+        return (''.join(notation.split()), 1) in self._entries
+
+    def get(self, notation, num_jugglers=1):
+        # type: (str, int) -> SiteswapAnalysis
+        """ Returns the :class:`SiteswapAnalysis` of `notation`, analysing it only if it is not already cached """
+        key = (''.join(notation.split()), num_jugglers)
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self.hits += 1
+                self._entries[key] = self._entries.pop(key)  # most recently used, move_to_end is py3 only
+                return analysis
+            self.misses += 1
+
+        analysis = analyse_siteswap(*key)
+
+        with self._lock:
+            analysis = self._entries.setdefault(key, analysis)  # another thread may have analysed it too
+            if self.maxsize is not None:
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return analysis
+
+    def info(self):
+        # type: () -> CacheInfo
+        """ Returns the hits, misses, max size and current size of the cache """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self):
+        """ Removes every analysis from the cache and resets the counters """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
@@ -1,11 +1,18 @@
+import json
 import re
+from array import array
+from collections import OrderedDict
 
 from .base import JugglingNotation
-from ..pattern import Pattern
+from ..instrumentation import instrumented
+from ..pattern import Pattern, analyse_pattern
+from ..pattern.passing import PassingPattern, analyse_passing
 
 
-__all__ = ['Siteswap', 'siteswap_char_to_int', 'siteswap_int_to_char', 'is_valid_siteswap_syntax',
-           'convert_str_to_beat_list', 'convert_char_to_beat']
+__all__ = ['Siteswap', 'SiteswapSyntaxError', 'siteswap_char_to_int', 'siteswap_int_to_char',
+           'is_valid_siteswap_syntax', 'convert_str_to_beat_list', 'convert_char_to_beat', 'parse_siteswap',
+           'parse_many', 'SiteswapBatch', 'passing_grammar', 'parse_passing_siteswap', 'format_siteswap',
+           'format_many']
 
 
 def siteswap_char_to_int(char):
@@ -32,18 +39,56 @@ def siteswap_int_to_char(digit):
 
 
 TOSS_RE = r'([0-9a-z]x?)'
-PASS_TOSS_RE = r'([0-9a-z]x?(p{num_jugglers})?)'
+PASS_THROW_RE = r'([0-9a-oq-z]x?)'  # in passing siteswaps a 'p' always marks a pass, it is never a throw of 25
+PASS_TOSS_RE = r'({}(p{{num_jugglers}})?)'.format(PASS_THROW_RE)
 MULTIPLEX_RE = r'\[{}+\]'.format(TOSS_RE)
 PASS_MULTIPLEX_RE = r'\[{}+\]'.format(PASS_TOSS_RE)
 SYNC_BASE_RE = r'(\(({toss}|{multi}),({toss}|{multi})\))\*?'
 SYNC_RE = SYNC_BASE_RE.format(toss=TOSS_RE, multi=MULTIPLEX_RE)
-PASS_SYNC_RE = SYNC_BASE_RE.format(toss=PASS_TOSS_RE, multi=MULTIPLEX_RE)
+PASS_SYNC_RE = SYNC_BASE_RE.format(toss=PASS_TOSS_RE, multi=r'\[{}+\]'.format(PASS_THROW_RE))
 BEAT_RE = r'({}|{}|{})'.format(TOSS_RE, MULTIPLEX_RE, SYNC_RE)
 PASS_BEAT_RE = r'({}|{}|{})'.format(PASS_TOSS_RE, PASS_MULTIPLEX_RE, PASS_SYNC_RE)
 SOLO_SITESWAP_RE = re.compile(r'^{}+$'.format(BEAT_RE), re.IGNORECASE | re.VERBOSE)
 PASS_RE = r'<({beat})(\|{beat})+>'.format(beat=PASS_BEAT_RE)
 
 
+_PASSING_GRAMMARS = {}
+
+
+def _juggler_numbers(num_jugglers):
+    # type: (int) -> list
+    """
+    The regex of each juggler number, which can't be followed by a digit that would make a longer number in range.
+    This stops the grammar backtracking to a shorter number, so that it reads juggler numbers like the scanner does.
+    """
+    numbers = []
+    for number in range(1, num_jugglers + 1):
+        longer = ''.join(_ for _ in '0123456789' if int(str(number) + _) <= num_jugglers)
+        numbers.append('{}(?![{}])'.format(number, longer) if longer else str(number))
+    return numbers
+
+
+def passing_grammar(num_jugglers):
+    # type: (int) -> re.Pattern
+    """
+    Returns the compiled regex of passing siteswaps for `num_jugglers`, which is only built the first time it is
+    asked for. Every beat, between '<' and '>', has exactly one section for each juggler. With 2 jugglers a pass is
+    marked with a 'p', with more jugglers the 'p' must be followed by the number of the juggler being passed to.
+    That number is the longest one in range, so with 12 jugglers 'p12' is a pass to juggler 12 and 'p13' a pass to
+    juggler 1 followed by a throw of 3. A 'p' is never a throw of its own.
+    """
+    grammar = _PASSING_GRAMMARS.get(num_jugglers)
+    if grammar is None:
+        if num_jugglers < 2:
+            raise ValueError("Invalid number of jugglers for passing: {}".format(num_jugglers))
+        target = '' if num_jugglers == 2 else '({})'.format('|'.join(_juggler_numbers(num_jugglers)))
+        beat = PASS_BEAT_RE.format(num_jugglers=target)
+        grammar = re.compile(r'^(<' + beat + r'(\|' + beat + '){' + str(num_jugglers - 1) + '}>)+$', re.IGNORECASE)
+        _PASSING_GRAMMARS[num_jugglers] = grammar
+    return grammar
+
+
+@instrumented
 def is_valid_siteswap_syntax(pattern, num_jugglers=1, return_match=False):
     # type: (str, int) -> bool or (bool, match)
     """
@@ -65,17 +110,12 @@ def is_valid_siteswap_syntax(pattern, num_jugglers=1, return_match=False):
     :return: A bool whether or not the syntax is valid.
     """
     pattern = str(pattern)
-    pattern = re.sub('\s', '', pattern)  # ignore all whitespace by stripping it out
+    pattern = re.sub(r'\s', '', pattern)  # ignore all whitespace by stripping it out
 
     if num_jugglers < 1:
         raise ValueError("Invalid number of jugglers: {}".format(num_jugglers))
     elif num_jugglers > 1:
-        if num_jugglers > 2:
-            pass_re = "^({})+$".format(PASS_RE.format(
-                num_jugglers="[1-{}]".format(num_jugglers)))
-        else:
-            pass_re = "^({})+$".format(PASS_RE.format(num_jugglers=""))
-        m = re.match(pass_re, pattern, re.IGNORECASE | re.VERBOSE)
+        m = passing_grammar(num_jugglers).match(pattern)
     else:
         m = SOLO_SITESWAP_RE.match(pattern)
 
@@ -99,6 +139,7 @@ def convert_char_to_beat(beat_str, is_sync=False):
         return siteswap_char_to_int(beat_str)
 
 
+@instrumented
 def convert_str_to_beat_list(siteswap, is_sync=False):
     # type: (str) -> list
     """ Converts a siteswap string to a :class:`Pattern` beat list
@@ -106,7 +147,7 @@ def convert_str_to_beat_list(siteswap, is_sync=False):
     """
     # print('convert', siteswap, is_sync)
     siteswap = str(siteswap)
-    siteswap = re.sub('\s', '', siteswap)  # ignore all whitespace by stripping it out
+    siteswap = re.sub(r'\s', '', siteswap)  # ignore all whitespace by stripping it out
     raw_beats = list(_.group() for _ in re.finditer(BEAT_RE, siteswap, re.IGNORECASE))
     beats = []
     for beat in raw_beats:
@@ -121,16 +162,484 @@ def convert_str_to_beat_list(siteswap, is_sync=False):
     return beats
 
 
+class SiteswapSyntaxError(ValueError):
+    """
+    Raised by :func:`parse_siteswap` when a siteswap is not in valid syntax.
+
+    :ivar notation: The siteswap string that failed to parse, as it was given.
+    :ivar position: Index into `notation` of the character that could not be parsed. If the siteswap ended early
+        this is `len(notation)`.
+    """
+    def __init__(self, message, notation, position):
+        super(SiteswapSyntaxError, self).__init__("{} at position {}: '{}'".format(message, position, notation))
+        self.notation = notation
+        self.position = position
+
+
+# lookup table used by the scanner, maps every siteswap character (either case) to its throw value
+_THROW_VALUES = dict((char, int(char, 36)) for char in '0123456789abcdefghijklmnopqrstuvwxyz')
+_THROW_VALUES.update([(char.upper(), value) for char, value in list(_THROW_VALUES.items())])
+
+
+class _ScanError(Exception):
+    """ Internal error carrying the offset into the whitespace-stripped siteswap """
+    def __init__(self, message, index):
+        super(_ScanError, self).__init__(message)
+        self.message = message
+        self.index = index
+
+
+def _scan_toss(siteswap, i, passing=False):
+    # type: (str, int, bool) -> (int or float, int)
+    """
+    Scans a single toss, with an optional crossing 'x', starting at `i`. Returns (throw, next index)
+
+    :param passing: Whether this is a passing siteswap, where a 'p' is not a throw
+    """
+    if passing and siteswap[i:i + 1] in ('p', 'P'):
+        raise _ScanError("Unexpected character '{}'".format(siteswap[i]), i)
+    try:
+        throw = _THROW_VALUES[siteswap[i]]
+    except IndexError:
+        raise _ScanError('Unexpected end of siteswap', i)
+    except KeyError:
+        raise _ScanError("Unexpected character '{}'".format(siteswap[i]), i)
+    i += 1
+    if siteswap[i:i + 1] in ('x', 'X'):
+        return throw + 0.5, i + 1
+    return throw, i
+
+
+def _scan_multiplex(siteswap, i, passing=False):
+    # type: (str, int, bool) -> (list, int)
+    """ Scans the tosses of a multiplex beat, `i` is the index right after the opening '[' """
+    throws = []
+    while siteswap[i:i + 1] != ']':
+        throw, i = _scan_toss(siteswap, i, passing)
+        throws.append(throw)
+    if not throws:
+        raise _ScanError('Empty multiplex', i)
+    return throws, i + 1
+
+
+def _scan_hand(siteswap, i, terminator):
+    # type: (str, int, str) -> (int or float or list, int)
+    """ Scans one hand of a synchronous beat, which must be followed by `terminator` """
+    if siteswap[i:i + 1] == '[':
+        throw, i = _scan_multiplex(siteswap, i + 1)
+    else:
+        throw, i = _scan_toss(siteswap, i)
+    if siteswap[i:i + 1] != terminator:
+        if i == len(siteswap):
+            raise _ScanError('Unexpected end of siteswap', i)
+        raise _ScanError("Expected '{}' but found '{}'".format(terminator, siteswap[i]), i)
+    return throw, i + 1
+
+
+@instrumented
+def parse_siteswap(siteswap):
+    # type: (str) -> list
+    """
+    Validates and converts a solo siteswap into a :class:`Pattern` beat list in a single pass. This is equivalent to
+    checking :func:`is_valid_siteswap_syntax` and then calling :func:`convert_str_to_beat_list`, without matching
+    the siteswap more than once.
+
+    >>> parse_siteswap('441') == [4, 4, 1]
+    >>> parse_siteswap('[64]020') == [[6, 4], 0, 2, 0]
+    >>> parse_siteswap('(6x,4)*') == [(6.5, 4), (4, 6.5)]
+
+    Note: This ignores ALL whitespace in the given `siteswap`
+
+    :param siteswap: A string of the siteswap to parse
+    :return: The list of beats for a :class:`Pattern`
+    :raises SiteswapSyntaxError: If the siteswap is not valid syntax. The error carries the position of the
+        offending character in the given string.
+    """
+    siteswap = str(siteswap)
+    stripped = ''.join(siteswap.split())  # ignore all whitespace by stripping it out
+
+    beats = []
+    i, length = 0, len(stripped)
+    try:
+        if not length:
+            raise _ScanError('Empty siteswap', 0)
+        while i < length:
+            char = stripped[i]
+            if char == '(':
+                left, i = _scan_hand(stripped, i + 1, ',')
+                right, i = _scan_hand(stripped, i, ')')
+                beats.append((left, right))
+                if stripped[i:i + 1] == '*':
+                    beats.append((right, left))
+                    i += 1
+            elif char == '[':
+                throws, i = _scan_multiplex(stripped, i + 1)
+                beats.append(throws)
+            else:
+                throw, i = _scan_toss(stripped, i)
+                beats.append(throw)
+    except _ScanError as e:
+        raise SiteswapSyntaxError(e.message, siteswap, _original_position(siteswap, e.index))
+    return beats
+
+
+def _expect(siteswap, i, char):
+    # type: (str, int, str) -> int
+    """ Checks that `char` is at index `i` and returns the index after it """
+    if siteswap[i:i + 1] != char:
+        if i >= len(siteswap):
+            raise _ScanError('Unexpected end of siteswap', i)
+        raise _ScanError("Expected '{}' but found '{}'".format(char, siteswap[i]), i)
+    return i + 1
+
+
+def _scan_pass_toss(siteswap, i, num_jugglers, juggler):
+    # type: (str, int, int, int) -> (int or float, int, int)
+    """ Scans a toss that may be a pass, returns (throw, juggler catching it, next index) """
+    throw, i = _scan_toss(siteswap, i, passing=True)
+    if siteswap[i:i + 1] not in ('p', 'P'):
+        return throw, juggler, i
+    i += 1
+    if num_jugglers == 2:
+        return throw, 1 - juggler, i
+
+    # the longest juggler number that is in range, see passing_grammar
+    end = i
+    while end < len(siteswap) and siteswap[end].isdigit() and 0 < int(siteswap[i:end + 1]) <= num_jugglers:
+        end += 1
+    if end == i:
+        raise _ScanError('Expected a juggler number from 1 to {}'.format(num_jugglers), i)
+    return throw, int(siteswap[i:end]) - 1, end
+
+
+def _scan_pass_hand(siteswap, i, terminator, num_jugglers, juggler):
+    # type: (str, int, str, int, int) -> (int or float or list, list, int)
+    """ Scans one hand of a synchronous passing beat, returns (throws, jugglers catching them, next index) """
+    if siteswap[i:i + 1] == '[':
+        throws, i = _scan_multiplex(siteswap, i + 1, passing=True)  # multiplexes in a synchronous beat can't be passes
+        targets = [juggler] * len(throws)
+    else:
+        throws, target, i = _scan_pass_toss(siteswap, i, num_jugglers, juggler)
+        targets = [target]
+    return throws, targets, _expect(siteswap, i, terminator)
+
+
+def _scan_pass_beat(siteswap, i, num_jugglers, juggler, beats, targets):
+    # type: (str, int, int, int, list, list) -> int
+    """ Scans the section of a passing beat for one juggler, appending to their `beats` and `targets` """
+    char = siteswap[i:i + 1]
+    if char == '(':
+        left, left_targets, i = _scan_pass_hand(siteswap, i + 1, ',', num_jugglers, juggler)
+        right, right_targets, i = _scan_pass_hand(siteswap, i, ')', num_jugglers, juggler)
+        beats.append((left, right))
+        targets.extend(left_targets + right_targets)
+        if siteswap[i:i + 1] == '*':
+            beats.append((right, left))
+            targets.extend(right_targets + left_targets)
+            i += 1
+    elif char == '[':
+        i += 1
+        throws = []
+        while siteswap[i:i + 1] != ']':
+            throw, target, i = _scan_pass_toss(siteswap, i, num_jugglers, juggler)
+            throws.append(throw)
+            targets.append(target)
+        if not throws:
+            raise _ScanError('Empty multiplex', i)
+        beats.append(throws)
+        i += 1
+    else:
+        throw, target, i = _scan_pass_toss(siteswap, i, num_jugglers, juggler)
+        beats.append(throw)
+        targets.append(target)
+    return i
+
+
+@instrumented
+def parse_passing_siteswap(siteswap, num_jugglers):
+    # type: (str, int) -> (list, list)
+    """
+    Validates and converts a passing siteswap in a single pass, see :func:`passing_grammar` for the syntax. Each
+    juggler's section of every beat is converted like a solo siteswap, and every throw is given the (0-based) index
+    of the juggler that catches it.
+
+    >>> parse_passing_siteswap('<4p|3><2|3p>', 2) == ([[4, 2], [3, 3]], [[1, 0], [1, 0]])
+
+    Note: This ignores ALL whitespace in the given `siteswap`
+
+    :return: A tuple of (beat lists, targets). There is a :class:`Pattern` beat list for each juggler, and a list of
+        targets for each juggler with one entry for every throw, in the same order as
+        :attr:`Pattern.throws_with_beats`
+    :raises SiteswapSyntaxError: If the siteswap is not valid syntax for `num_jugglers`
+    """
+    if num_jugglers < 2:
+        raise ValueError("Invalid number of jugglers for passing: {}".format(num_jugglers))
+    siteswap = str(siteswap)
+    stripped = ''.join(siteswap.split())  # ignore all whitespace by stripping it out
+
+    beats = [[] for _ in range(num_jugglers)]
+    targets = [[] for _ in range(num_jugglers)]
+    i, length = 0, len(stripped)
+    try:
+        if not length:
+            raise _ScanError('Empty siteswap', 0)
+        while i < length:
+            i = _expect(stripped, i, '<')
+            for juggler in range(num_jugglers):
+                if juggler:
+                    i = _expect(stripped, i, '|')
+                i = _scan_pass_beat(stripped, i, num_jugglers, juggler, beats[juggler], targets[juggler])
+            i = _expect(stripped, i, '>')
+    except _ScanError as e:
+        raise SiteswapSyntaxError(e.message, siteswap, _original_position(siteswap, e.index))
+    return beats, targets
+
+
+def _original_position(siteswap, index):
+    # type: (str, int) -> int
+    """ Maps an index into the whitespace-stripped `siteswap` back to an index into `siteswap` """
+    for position, char in enumerate(siteswap):
+        if not char.isspace():
+            if not index:
+                return position
+            index -= 1
+    return len(siteswap)
+
+
+# lookup table used by the formatter, maps every throw that can be written in siteswap notation to its text, with
+# crossing throws stored as `n + 0.5` written with an 'x'
+_THROW_CHARS = dict((value, char) for char, value in _THROW_VALUES.items() if char.islower() or char.isdigit())
+_THROW_CHARS.update([(value + 0.5, char + 'x') for value, char in list(_THROW_CHARS.items())])
+
+
+def _format_throws(throws):
+    # type: (int or float or list) -> str
+    """ Formats a single throw, or the throws of a multiplex beat """
+    if isinstance(throws, list):
+        return '[' + ''.join([_THROW_CHARS[_] for _ in throws]) + ']'
+    return _THROW_CHARS[throws]
+
+
+def format_siteswap(pattern):
+    # type: (Iterable) -> str
+    """
+    Formats a :class:`Pattern`, or any other sequence of beats, as siteswap notation. This is the inverse of
+    :func:`parse_siteswap`. A synchronous beat followed by its mirror image, `(a,b)(b,a)` where `a` and `b` differ,
+    is written with the `(a,b)*` shorthand.
+
+    >>> format_siteswap([4, 4, 1]) == '441'
+    >>> format_siteswap([[6, 4], 0, 2, 0]) == '[64]020'
+    >>> format_siteswap([(6.5, 4), (4, 6.5)]) == '(6x,4)*'
+
+    :raises ValueError: If a throw can't be written in siteswap notation
+    """
+    try:
+        # most patterns are vanilla, all of their beats can be looked up directly
+        return ''.join([_THROW_CHARS[_] for _ in pattern])
+    except (KeyError, TypeError):
+        pass
+
+    beats = list(pattern)
+    output = []
+    i = 0
+    try:
+        while i < len(beats):
+            beat = beats[i]
+            if isinstance(beat, tuple):
+                left, right = beat
+                output.append('(' + _format_throws(left) + ',' + _format_throws(right) + ')')
+                if left != right and i + 1 < len(beats) and beats[i + 1] == (right, left):
+                    output.append('*')
+                    i += 1
+            else:
+                output.append(_format_throws(beat))
+            i += 1
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Beat cannot be written in siteswap notation: {!r}".format(beats[i]))
+    return ''.join(output)
+
+
+def format_many(patterns):
+    # type: (Iterable) -> list
+    """ Formats every pattern in `patterns` with :func:`format_siteswap`, returning a list of siteswap strings. The
+    tuples of throws yielded by :func:`generate_siteswaps` can be given directly. """
+    return [format_siteswap(_) for _ in patterns]
+
+
 class Siteswap(JugglingNotation):
-    """ Siteswap notation """
-    def __init__(self, notation_pattern, raise_invalid=False):
-        notation_pattern = re.sub('\s', '', notation_pattern)  # removes all whitespace characters
+    """
+    Siteswap notation
+
+    :param num_jugglers: Number of jugglers involved in the siteswap. Passing siteswaps, for more than one juggler,
+        are converted to a :class:`PassingPattern` instead of a :class:`Pattern`.
+    """
+    json_fields = OrderedDict(JugglingNotation.json_fields, num_jugglers=lambda notation: notation.num_jugglers,
+                              targets=lambda notation: notation._targets())
+    default_json_fields = JugglingNotation.default_json_fields + ('num_jugglers', 'targets')
+
+    def __init__(self, notation_pattern, raise_invalid=False, num_jugglers=1):
+        if num_jugglers < 1:
+            raise ValueError("Invalid number of jugglers: {}".format(num_jugglers))
+        notation_pattern = ''.join(notation_pattern.split())  # removes all whitespace characters
+        self.num_jugglers = num_jugglers
+        self._syntax_error = None
         super(Siteswap, self).__init__(notation_pattern=notation_pattern, raise_invalid=raise_invalid)
 
-        if self.is_valid_syntax:
-            self.pattern = Pattern(convert_str_to_beat_list(self.notation_pattern))
+    def _parse(self):
+        try:
+            if self.num_jugglers > 1:
+                return PassingPattern(*parse_passing_siteswap(self.notation_pattern, self.num_jugglers))
+            return Pattern(parse_siteswap(self.notation_pattern))
+        except SiteswapSyntaxError as e:
+            self._syntax_error = e
+            return None
+
+    def _targets(self):
+        # type: () -> list or None
+        """ The juggler catching every throw of a passing pattern, see :class:`PassingPattern`, None otherwise """
+        if self.num_jugglers == 1 or self.pattern is None:
+            return None
+        return [list(_) for _ in self.pattern.targets]
+
+    @classmethod
+    def from_JSON(cls, data):
+        # type: (str or dict) -> Siteswap
+        if not isinstance(data, dict):
+            data = json.loads(data)
+        if 'notation_pattern' not in data:
+            raise ValueError("JSON has no 'notation_pattern' to load the notation from")
+        return cls(data['notation_pattern'], num_jugglers=data.get('num_jugglers', 1))
 
     @property
     def is_valid_syntax(self):
-        # return cached value if we have it
-        return is_valid_siteswap_syntax(self.notation_pattern)
+        return self.pattern is not None
+
+
+class SiteswapBatch(object):
+    """
+    Columnar results of :func:`parse_many`. Every column is an :class:`array.array` with one entry per given siteswap,
+    except for `throws` and `beats` which hold the flattened throws of every pattern back to back. The throws of the
+    siteswap at index `i` are `throws[offsets[i]:offsets[i + 1]]`, in the same order as
+    :attr:`Pattern.throws_with_beats` with the beat each throw belongs to in `beats`.
+
+    Passing siteswaps also fill the `jugglers` and `targets` columns with the juggler making and the juggler catching
+    each throw, which are left empty for solo siteswaps. The throws of each juggler are given in turn, over the
+    period of the whole pattern, see :func:`analyse_passing`.
+
+    Siteswaps that are not valid syntax have no throws, a period of 0 and 0 objects.
+
+    >>> batch = parse_many(['441', '443', '(4,4)'])
+    >>> list(batch.valid) == [1, 0, 1]
+    >>> list(batch.periods) == [3, 3, 2]
+    >>> batch.throws_with_beats(2) == [(0, 4), (1, 4)]
+    """
+    __slots__ = ('valid_syntax', 'valid', 'periods', 'num_objects', 'offsets', 'throws', 'beats', 'jugglers',
+                 'targets')
+
+    def __init__(self):
+        self.valid_syntax = array('b')
+        self.valid = array('b')
+        self.periods = array('l')
+        self.num_objects = array('l')
+        self.offsets = array('l', [0])
+        self.throws = array('h')
+        self.beats = array('l')
+        self.jugglers = array('H')
+        self.targets = array('H')
+
+    def __len__(self):
+        return len(self.valid)
+
+    def throws_with_beats(self, index):
+        # type: (int) -> list
+        """ Returns the (beat, throw) tuples of the siteswap at `index`, like :attr:`Pattern.throws_with_beats` """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return list(zip(self.beats[start:end], self.throws[start:end]))
+
+    def throws_with_targets(self, index):
+        # type: (int) -> list
+        """ Returns the (juggler, beat, throw, target) tuples of the passing siteswap at `index` """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return list(zip(self.jugglers[start:end], self.beats[start:end], self.throws[start:end],
+                        self.targets[start:end]))
+
+    def _append_invalid(self):
+        self.valid_syntax.append(0)
+        self.valid.append(0)
+        self.periods.append(0)
+        self.num_objects.append(0)
+        self.offsets.append(len(self.throws))
+
+    def _append(self, beats):
+        # type: (list) -> None
+        """ Appends the analysis of a parsed beat list, or an invalid entry when `beats` is None """
+        if beats is None:
+            self._append_invalid()
+            return
+
+        analysis = analyse_pattern(beats)
+        for beat, throw in analysis.throws_with_beats:
+            self.beats.append(beat)
+            self.throws.append(int(throw))  # crossing throws outside of a synchronous beat land on the same beat
+
+        self.valid_syntax.append(1)
+        self.valid.append(analysis.is_valid)
+        self.periods.append(analysis.period)
+        self.num_objects.append(int(analysis.num_objects))
+        self.offsets.append(len(self.throws))
+
+    def _append_passing(self, parsed):
+        # type: ((list, list)) -> None
+        """ Appends the analysis of a parsed passing siteswap, or an invalid entry when `parsed` is None """
+        if parsed is None:
+            self._append_invalid()
+            return
+
+        analysis = analyse_passing(*parsed)
+        for juggler, throws in enumerate(analysis.throws_with_targets):
+            for beat, throw, target in throws:
+                self.jugglers.append(juggler)
+                self.beats.append(beat)
+                self.throws.append(throw)
+                self.targets.append(target)
+
+        self.valid_syntax.append(1)
+        self.valid.append(analysis.is_valid)
+        self.periods.append(analysis.period)
+        self.num_objects.append(int(analysis.num_objects))
+        self.offsets.append(len(self.throws))
+
+
+def parse_many(siteswaps, num_jugglers=1):
+    # type: (Iterable, int) -> SiteswapBatch
+    """
+    Validates and converts a batch of siteswaps without building a :class:`Siteswap` or :class:`Pattern` for each
+    one. The results are returned as a columnar :class:`SiteswapBatch`, which holds the validity, period and number
+    of objects of every siteswap along with all of their throws.
+
+    Note: This ignores ALL whitespace in the given siteswaps
+
+    :param siteswaps: An iterable of siteswap strings
+    :param num_jugglers: Number of jugglers involved in the siteswaps
+    :return: A :class:`SiteswapBatch` with one entry for each of the given siteswaps, in order
+    """
+    if num_jugglers < 1:
+        raise ValueError("Invalid number of jugglers: {}".format(num_jugglers))
+
+    batch = SiteswapBatch()
+    if num_jugglers > 1:
+        for siteswap in siteswaps:
+            try:
+                parsed = parse_passing_siteswap(siteswap, num_jugglers)
+            except SiteswapSyntaxError:
+                parsed = None
+            batch._append_passing(parsed)
+        return batch
+
+    for siteswap in siteswaps:
+        try:
+            beats = parse_siteswap(siteswap)
+        except SiteswapSyntaxError:
+            beats = None
+        batch._append(beats)
+    return batch
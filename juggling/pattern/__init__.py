@@ -1,6 +1,14 @@
-from collections import Iterable
+from array import array
+from functools import total_ordering
 from math import floor
 
+try:
+    # Python3
+    from collections.abc import Iterable  # noqa
+except ImportError:
+    # Python2
+    from collections import Iterable  # noqa
+
 try:
     # Python3
     from collections import UserList  # noqa
@@ -8,10 +16,12 @@ except ImportError:
     # Python2
     from UserList import UserList  # noqa
 
-from juggling.utils import CacheProperties
+from juggling.instrumentation import instrumented
+from juggling.utils import CacheProperties, array_to_bytes, clears_cache
+from .state import first_state, iter_states, multiplex_state_to_list
 
 
-__all__ = ['Pattern']
+__all__ = ['Pattern', 'FrozenPattern']
 
 
 VANILLA_PATTERN = 'VSS'
@@ -31,7 +41,7 @@ def flatten_pattern_list(l):
     # type: list -> list
     flattened = []
     for beat, el in enumerate(l):
-        if isinstance(el, Iterable):
+        if isinstance(el, (list, tuple)):
             for sub in flatten_pattern_list(el):
                 flattened.append((beat, sub[1]))
         else:
@@ -39,6 +49,65 @@ def flatten_pattern_list(l):
     return flattened
 
 
+def beat_key(beat):
+    # type: (int or float or list or tuple) -> tuple
+    """ Returns a comparable, hashable key for any kind of beat, keeping vanilla, multiplex and sync beats apart """
+    if isinstance(beat, tuple):
+        return (2, ) + tuple(beat_key(_) for _ in beat)
+    if isinstance(beat, list):
+        return (1, ) + tuple(beat)
+    return (0, beat)
+
+
+def _beat_keys(pattern_list):
+    # type: (list) -> list
+    """ Returns the beats themselves if they are all plain throws, which compare directly, otherwise their keys """
+    for beat in pattern_list:
+        if isinstance(beat, (list, tuple)):
+            return [beat_key(_) for _ in pattern_list]
+    return pattern_list
+
+
+def canonical_offset(pattern_list):
+    # type: (list) -> int
+    """
+    Returns the offset of the lexicographically greatest rotation of a pattern list, using Booth's algorithm in time
+    linear in the number of beats. The first such offset is returned if the pattern repeats within itself.
+    Multiplex and synchronous beats are compared by kind first, then by their throws.
+
+    >>> canonical_offset([1, 4, 4]) == 1
+    """
+    keys = _beat_keys(pattern_list)
+    doubled = list(keys) * 2
+    failure = [-1] * len(doubled)
+    k = 0
+    for j in range(1, len(doubled)):
+        key = doubled[j]
+        i = failure[j - k - 1]
+        while i != -1 and key != doubled[k + i + 1]:
+            if key > doubled[k + i + 1]:
+                k = j - i - 1
+            i = failure[i]
+        if key != doubled[k + i + 1]:  # i is -1 here
+            if key > doubled[k]:
+                k = j
+            failure[j - k] = -1
+        else:
+            failure[j - k] = i + 1
+    return k
+
+
+def canonical_rotation(pattern_list):
+    # type: (list) -> list
+    """ Returns the lexicographically greatest rotation of a pattern list, see :func:`canonical_offset`. Every
+    rotation of a pattern has the same canonical rotation.
+
+    >>> canonical_rotation([1, 4, 4]) == [4, 4, 1]
+    """
+    offset = canonical_offset(pattern_list)
+    return pattern_list[offset:] + pattern_list[:offset]
+
+
 def convert_sss_to_mss(pattern_list):
     """ Flattens a SSS to a MSS, returns a Pattern list """
     data = []
@@ -66,51 +135,168 @@ def convert_sss_to_mss(pattern_list):
     return data
 
 
+class PatternAnalysis(object):
+    """
+    Everything :func:`analyse_pattern` works out about a pattern list. The attributes have the same meaning as the
+    :class:`Pattern` properties of the same name, and `integer_throws` is whether every throw is an integer, which a
+    vanilla pattern with crossing throws such as `43x1` is not.
+    """
+    __slots__ = ('type', 'period', 'throws_with_beats', 'throw_destinations', 'incoming', 'outgoing', 'num_objects',
+                 'max_throw', 'is_valid', 'total', 'mismatches', 'state_counts', 'throw_counts', 'integer_throws')
+
+    def set_throw(self, beat, throw):
+        # type: (int, int) -> None
+        """
+        Updates the analysis of a vanilla pattern, where every beat is a single integer throw, after the throw on
+        `beat` is replaced with `throw`. Only the beats that the old and new throws are made from and land on are
+        looked at, along with the states they are in the air for, so this takes time linear in the size of the
+        throws rather than in the period.
+        """
+        period = self.period
+        old = self.throws_with_beats[beat][1]
+        old_destination = self.throw_destinations[beat]
+        destination = (beat + throw) % period if throw else beat
+
+        touched = set((beat, old_destination, destination))
+        self.mismatches -= sum(1 for _ in touched if self.incoming[_] != self.outgoing[_])
+        if old:
+            self.outgoing[beat] -= 1
+            self.incoming[old_destination] -= 1
+        if throw:
+            self.outgoing[beat] += 1
+            self.incoming[destination] += 1
+        self.mismatches += sum(1 for _ in touched if self.incoming[_] != self.outgoing[_])
+
+        self.throws_with_beats[beat] = (beat, throw)
+        self.throw_destinations[beat] = destination
+        self.total += throw - old
+        self.num_objects = floor(self.total / period)
+        if self.throw_counts is None and throw < old == self.max_throw:
+            # the highest throw may be going down, keep how many of each throw there are to find the next highest
+            self.throw_counts = [0] * (self.max_throw + 1)
+            for _, counted in self.throws_with_beats:
+                self.throw_counts[counted] += 1
+            self.throw_counts[throw] -= 1  # counted from before this throw was replaced
+            self.throw_counts[old] += 1
+        if self.throw_counts is not None:
+            if throw >= len(self.throw_counts):
+                self.throw_counts.extend([0] * (throw + 1 - len(self.throw_counts)))
+            self.throw_counts[old] -= 1
+            self.throw_counts[throw] += 1
+            while not self.throw_counts[self.max_throw]:
+                self.max_throw -= 1
+        self.max_throw = max(self.max_throw, throw)
+        self.is_valid = not self.mismatches
+
+        if self.state_counts is not None:
+            _add_to_states(self.state_counts, beat, old, -1)
+            _add_to_states(self.state_counts, beat, throw, 1)
+
+
+def _add_to_states(states, beat, throw, amount):
+    # type: (list, int, int, int) -> None
+    """ Adds `amount` objects thrown as `throw` on `beat` to every state list of a vanilla pattern they are in the
+    air for, the state of beat `beat + d` has them landing `throw - d` beats later. The changed state lists are
+    replaced by updated copies, so that the ones already handed out by :attr:`Pattern.states` never change. """
+    period = len(states)
+    for d in range(1, throw + 1):
+        state = list(states[(beat + d) % period])
+        position = throw - d
+        if position >= len(state):
+            state.extend([0] * (position + 1 - len(state)))
+        state[position] += amount
+        while state and not state[-1]:
+            state.pop()
+        states[(beat + d) % period] = state
+
+
+@instrumented
+def analyse_pattern(pattern_list):
+    # type: (list) -> PatternAnalysis
+    """
+    Analyses a pattern list in a single pass over its throws, working out the period, the flattened throws, where
+    they land, the incoming and outgoing throws of each beat, the number of objects, the highest throw and whether
+    the pattern is valid. Synchronous beats are converted to MSS beats as :func:`convert_sss_to_mss` does.
+
+    >>> analyse_pattern([4, 4, 1]).is_valid == True
+    >>> analyse_pattern([(6.5, 4), (4, 6.5)]).throws_with_beats == [(0, 7), (1, 4), (2, 4), (3, 5)]
+    """
+    throws_with_beats = []
+    total = highest = 0
+    is_multiplex = False
+    integer_throws = True
+    beat = 0
+    for el in pattern_list:
+        if isinstance(el, tuple):
+            # synchronous beats take two MSS beats, crossing throws move one beat later from the left hand and one
+            # beat earlier from the right hand
+            for hand, mod in ((el[0], 1), (el[1], -1)):
+                for throw in (hand if isinstance(hand, list) else (hand,)):
+                    total += throw
+                    if throw > highest:
+                        highest = throw
+                    if isinstance(throw, float):
+                        throw = int(floor(throw)) + mod
+                    throws_with_beats.append((beat, throw))
+                beat += 1
+            continue
+        elif isinstance(el, list):
+            is_multiplex = True
+            throws = el
+        else:
+            throws = (el,)
+        for throw in throws:
+            total += throw
+            if throw > highest:
+                highest = throw
+            if type(throw) is not int:
+                integer_throws = False  # crossing throws outside of a sync beat, like the 3x of 43x1
+            throws_with_beats.append((beat, throw))
+        beat += 1
+
+    period = beat
+    destinations = []
+    incoming = [0] * period
+    outgoing = [0] * period
+    for beat, throw in throws_with_beats:
+        if throw == 0:
+            destinations.append(beat)
+        else:
+            destination = (beat + int(throw)) % period  # crossing throws outside of a sync beat land on the same beat
+            destinations.append(destination)
+            incoming[destination] += 1
+            outgoing[beat] += 1
+
+    analysis = PatternAnalysis()
+    if pattern_list and isinstance(pattern_list[0], tuple):
+        analysis.type = SYNCHRONOUS_PATTERN
+    else:
+        analysis.type = MULTIPLEX_PATTERN if is_multiplex else VANILLA_PATTERN
+    analysis.period = period
+    analysis.throws_with_beats = throws_with_beats
+    analysis.throw_destinations = destinations
+    analysis.incoming = incoming
+    analysis.outgoing = outgoing
+    analysis.num_objects = floor(total / period) if period else 0
+    analysis.max_throw = floor(highest)  # floor in case of sync crossing throws with .5
+    analysis.is_valid = incoming == outgoing
+    analysis.total = total
+    analysis.mismatches = sum(1 for _ in range(period) if incoming[_] != outgoing[_])
+    analysis.state_counts = analysis.throw_counts = None
+    analysis.integer_throws = integer_throws
+    return analysis
+
+
+@instrumented
 def generate_state(pattern, starting_throw=0):
     # type: (Pattern, int) -> list
     """ Generates a state for a given :class:`Pattern` starting at `starting_throw` which is an
-    offset into the :class:`Pattern` """
-
-    state = [None] * (pattern.max_throw * 2)  # principal that the highest throw can go through the pattern twice
-    # offset the pattern to the `starting_throw`
-    starting_throw %= len(pattern.converted_to_mss)
-    converted_pattern = pattern.converted_to_mss[starting_throw:] + pattern.converted_to_mss[:starting_throw]
-
-    i = current_beat = current_prop = 0
-    flattened = flatten_pattern_list(converted_pattern)
-    while current_prop < pattern.num_objects:
-        if flattened[i][1] == 0:
-            state[current_beat] = 1
-        else:
-            if state[current_beat] is None:
-                state[current_beat] = 1
-            else:
-                state[current_beat] += 1
-
-            if state[current_beat] > 0:
-                current_prop += 1
-
-            d = current_beat + flattened[i][1]
-            if state[d] is None:
-                state[d] = -1
-            else:
-                state[d] -= 1
-
-            i += 1
-            if i == len(flattened):
-                i = 0
-                current_beat += 1
-            elif flattened[i][0] != flattened[i-1][0]:
-                current_beat += 1
-
-    # remove trailing info
-    while state and state[-1] is None or state[-1] < 0:
-        del state[-1]
-
-    if -1 in state or None in state:
+    offset into the :class:`Pattern`. Index `i` of the state is the number of objects landing `i` beats
+    after `starting_throw`. Returns an empty list if the pattern is not valid. """
+    if not pattern.is_valid:
         return []
-
-    return state
+    starting_throw %= pattern.period
+    return multiplex_state_to_list(first_state(pattern.throws_with_beats, pattern.period, starting_throw))
 
 
 class Pattern(CacheProperties, UserList):
@@ -134,19 +320,60 @@ class Pattern(CacheProperties, UserList):
         super(Pattern, self).__setattr__(key, value)
 
     def __setitem__(self, key, value):
-        self._clear_cache()
+        if isinstance(key, slice):
+            value = list(value)
+        if not self._set_throws(key, value):
+            self._clear_cache()
         super(Pattern, self).__setitem__(key, value)
 
-    @property
-    def type(self):
-        if isinstance(self[0], tuple):
-            return SYNCHRONOUS_PATTERN
+    def _set_throws(self, key, value):
+        # type: (int or slice, Any) -> bool
+        """
+        Updates the cached analysis in place when single throws of a vanilla pattern are replaced by other single
+        throws, see :meth:`PatternAnalysis.set_throw`, and clears every other cached property. Returns False if the
+        edit can't be done in place, because nothing is cached yet or because it changes the period or the structure
+        of the pattern, in which case everything has to be worked out again.
+        """
+        analysis = self._cache.get('_analysis')
+        if analysis is None or analysis.type != VANILLA_PATTERN or analysis.period != len(self.data) or \
+                not analysis.integer_throws:
+            return False
+        if isinstance(key, slice):
+            beats, throws = range(*key.indices(len(self.data))), value
+            if len(beats) != len(throws):
+                return False
+        elif -len(self.data) <= key < len(self.data):
+            beats, throws = [key % len(self.data)], [value]
+        else:
+            return False
+        if not all(type(_) is int and _ >= 0 for _ in throws) or not all(type(self.data[_]) is int for _ in beats):
+            return False
+
+        for beat, throw in zip(beats, throws):
+            analysis.set_throw(beat, throw)
+        self._cache.clear()
+        self._cache.update(_analysis=analysis, period=analysis.period)
+        return True
+
+    # every other way of mutating the list changes the period or the order of the beats, and clears the cache
+    __delitem__ = clears_cache(UserList.__delitem__)
+    __iadd__ = clears_cache(UserList.__iadd__)
+    __imul__ = clears_cache(UserList.__imul__)
+    append = clears_cache(UserList.append)
+    extend = clears_cache(UserList.extend)
+    insert = clears_cache(UserList.insert)
+    pop = clears_cache(UserList.pop)
+    remove = clears_cache(UserList.remove)
+    reverse = clears_cache(UserList.reverse)
+    sort = clears_cache(UserList.sort)
 
-        for throw in self:
-            if isinstance(throw, list):
-                return MULTIPLEX_PATTERN
+    @property
+    def _analysis(self):
+        return analyse_pattern(self.data)
 
-        return VANILLA_PATTERN
+    @property
+    def type(self):
+        return self._analysis.type
 
     @property
     def converted_to_mss(self):
@@ -154,76 +381,93 @@ class Pattern(CacheProperties, UserList):
 
     @property
     def throws_with_beats(self):
-        return flatten_pattern_list(self.converted_to_mss)
+        return self._analysis.throws_with_beats
 
     @property
     def throw_destinations(self):
-        total = 0
-        destination = []
-        for throw in self.throws_with_beats:
-            if throw[1] == 0:
-                destination.append(throw[0])
-            else:
-                destination.append((throw[0] + throw[1]) % self.period)
-                total += throw[1]
-        return destination
+        return self._analysis.throw_destinations
 
     @property
     def incoming(self):
-        incoming = [0] * self.period
-        for beat, dest in enumerate(self.throw_destinations):
-            if self.throws_with_beats[beat][1] != 0:
-                incoming[dest] += 1
-        return incoming
+        return self._analysis.incoming
 
     @property
     def outgoing(self):
-        outgoing = [0] * self.period
-        for beat in range(len(self.throw_destinations)):
-            if self.throws_with_beats[beat][1] != 0:
-                outgoing[self.throws_with_beats[beat][0]] += 1
-        return outgoing
+        return self._analysis.outgoing
 
     @property
     def is_valid(self):
-        return self.incoming == self.outgoing
+        return self._analysis.is_valid
 
     def starting_with(self, throw):
         """ return the pattern if started with throw at index `throw` """
         throw %= (self.period//2) if self.type == SYNCHRONOUS_PATTERN else self.period
         return self.data[throw:] + self.data[:throw]
 
+    def freeze(self):
+        """ return an immutable, hashable :class:`FrozenPattern` of this pattern """
+        return FrozenPattern(self.data)
+
+    def to_siteswap(self):
+        """ return the pattern in siteswap notation, see :func:`juggling.notation.siteswap.format_siteswap` """
+        from juggling.notation.siteswap import format_siteswap  # the notation module imports this one
+        return format_siteswap(self.data)
+
+    @property
+    def canonical_rotation(self):
+        """ The lexicographically greatest rotation of the pattern, the same for every rotation of it. Synchronous
+        patterns are rotated by whole beats, like :meth:`starting_with`. """
+        return canonical_rotation(self.data)
+
+    @property
+    def canonical_key(self):
+        """ A hashable key that is equal for two patterns if and only if one is a rotation of the other, for
+        deduplicating patterns regardless of where they start """
+        keys = _beat_keys(self.data)
+        offset = canonical_offset(self.data)
+        return tuple(keys[offset:]) + tuple(keys[:offset])
+
+    @property
+    def rotation_hash(self):
+        """ A hash of the pattern that doesn't depend on its rotation, see :attr:`canonical_key` """
+        return hash(self.canonical_key)
+
+    def is_rotation_of(self, other):
+        # type: (Pattern or list) -> bool
+        """ return True if this pattern is a rotation of `other` """
+        if not isinstance(other, Pattern):
+            other = Pattern(other)
+        return len(self.data) == len(other.data) and self.canonical_key == other.canonical_key
+
     @property
     def states(self):
         if self.is_valid:
+            analysis = self._analysis
+            if analysis.type == VANILLA_PATTERN and analysis.period == len(self.data):
+                # the states of vanilla patterns are kept with the analysis, later edits only replace the states
+                # of the beats they change
+                if analysis.state_counts is None:
+                    states = iter_states(self.throws_with_beats, self.period)
+                    analysis.state_counts = [multiplex_state_to_list(state) for state in states]
+                return tuple(analysis.state_counts)
             period = (self.period//2) if self.type == SYNCHRONOUS_PATTERN else self.period
-            return tuple(generate_state(self, i) for i in range(0, period))
+            # every state after the first is a single transition from the one before it
+            states = iter_states(self.throws_with_beats, self.period, period)
+            return tuple(multiplex_state_to_list(state) for state in states)
         return []
 
     @property
     def num_objects(self):
-        def get_sum(_):
-            s = 0
-            for i in _:
-                if isinstance(i, (tuple, list)):
-                    i = get_sum(i)
-                s += i
-            return s
-        return floor(get_sum(self.data) / self.period)
+        return self._analysis.num_objects
 
     @property
     def period(self):
-        return len(self.converted_to_mss)
+        # counted from the beats rather than taken from the analysis, so that the period alone is cheap
+        return sum(2 if isinstance(el, tuple) else 1 for el in self.data)
 
     @property
     def max_throw(self):
-        def get_max(_, highest=0):
-            for i in _:
-                if isinstance(i, (tuple, list)):
-                    i = get_max(i, highest)
-                highest = max(i, highest)
-            return highest
-        return floor(get_max(self.data))  # floor in case of sync crossing throws with .5
+        return self._analysis.max_throw
 
     @property
     def ground_states(self):
@@ -292,3 +536,146 @@ class Pattern(CacheProperties, UserList):
     @property
     def is_excited(self):
         return len(set(self.current_state)) != 1
+
+
+# flags stored by FrozenPattern for each throw
+CROSSING_FLAG = 0x1  # the throw is a crossing sync throw, stored as `n + 0.5` in a Pattern
+MULTIPLEX_FLAG = 0x2  # the throw is part of a multiplex list
+SYNC_FLAG = 0x4  # the throw is part of a synchronous beat tuple
+RIGHT_HAND_FLAG = 0x8  # the throw is the second element of a synchronous beat tuple
+
+
+@total_ordering
+class FrozenPattern(object):
+    """
+    A compact, immutable and hashable version of a :class:`Pattern`. The throws of every beat are stored back to back
+    in a flat `array('h')`, along with the offset of the first throw of each beat and a set of flags for every throw
+    which record how the beat was structured (multiplex, synchronous, crossing). This makes it lossless, converting
+    a :class:`Pattern` to a :class:`FrozenPattern` and back results in the same beat list.
+
+    The `throws`, `offsets` and `flags` arrays are exposed for fast, read only access and must not be modified.
+
+    >>> p = FrozenPattern([4, 4, 1])
+    >>> p == Pattern([4, 4, 1]).freeze()
+    >>> p.to_pattern() == [4, 4, 1]
+    >>> {p: '441'}[FrozenPattern([4, 4, 1])] == '441'
+
+    """
+    __slots__ = ('throws', 'offsets', 'flags', '_hash')
+
+    def __init__(self, pattern):
+        # type: (Iterable) -> None
+        throws, offsets, flags = array('h'), array('I'), array('B')
+        for beat in pattern:
+            offsets.append(len(throws))
+            if isinstance(beat, tuple):
+                if len(beat) != 2:
+                    raise ValueError("Synchronous beats must have exactly two hands: {}".format(beat))
+                _freeze_hand(beat[0], SYNC_FLAG, throws, flags)
+                _freeze_hand(beat[1], SYNC_FLAG | RIGHT_HAND_FLAG, throws, flags)
+            else:
+                _freeze_hand(beat, 0, throws, flags)
+        self._set(throws, offsets, flags)
+
+    @classmethod
+    def _from_arrays(cls, throws, offsets, flags):
+        # type: (array, array, array) -> FrozenPattern
+        """ Creates a :class:`FrozenPattern` directly from its arrays, which are not validated """
+        frozen = cls.__new__(cls)
+        frozen._set(throws, offsets, flags)
+        return frozen
+
+    def _set(self, throws, offsets, flags):
+        object.__setattr__(self, 'throws', throws)
+        object.__setattr__(self, 'offsets', offsets)
+        object.__setattr__(self, 'flags', flags)
+        object.__setattr__(self, '_hash', hash(tuple(array_to_bytes(_) for _ in (throws, offsets, flags))))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("FrozenPattern is immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError("FrozenPattern is immutable")
+
+    def __reduce__(self):
+        return self.__class__._from_arrays, (self.throws, self.offsets, self.flags)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenPattern):
+            return NotImplemented
+        return (self._hash == other._hash and self.throws == other.throws and self.offsets == other.offsets and
+                self.flags == other.flags)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __lt__(self, other):
+        if not isinstance(other, FrozenPattern):
+            return NotImplemented
+        return (self.throws, self.offsets, self.flags) < (other.throws, other.offsets, other.flags)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __iter__(self):
+        for i in range(len(self.offsets)):
+            yield self._beat(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._beat(i) for i in range(*index.indices(len(self.offsets)))]
+        if index < 0:
+            index += len(self.offsets)
+        if not 0 <= index < len(self.offsets):
+            raise IndexError("FrozenPattern index out of range")
+        return self._beat(index)
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, list(self))
+
+    def _beat(self, index):
+        # type: (int) -> int or float or list or tuple
+        """ Rebuilds the :class:`Pattern` beat at `index` """
+        start = self.offsets[index]
+        end = self.offsets[index + 1] if index + 1 < len(self.offsets) else len(self.throws)
+        if self.flags[start] & SYNC_FLAG:
+            split = start
+            while not self.flags[split] & RIGHT_HAND_FLAG:
+                split += 1
+            return self._thaw_hand(start, split), self._thaw_hand(split, end)
+        return self._thaw_hand(start, end)
+
+    def _thaw_hand(self, start, end):
+        # type: (int, int) -> int or float or list
+        throws = [t + 0.5 if f & CROSSING_FLAG else t for t, f in zip(self.throws[start:end], self.flags[start:end])]
+        if self.flags[start] & MULTIPLEX_FLAG:
+            return throws
+        return throws[0]
+
+    def to_pattern(self):
+        """ return a :class:`Pattern` with the same beats as this :class:`FrozenPattern` """
+        return Pattern(list(self))
+
+
+def _freeze_hand(hand, flags, throws, throw_flags):
+    """ Appends the throws, and their flags, of a single hand of a beat to the given arrays """
+    if isinstance(hand, list):
+        if not hand:
+            raise ValueError("Multiplex throws must not be empty")
+        flags |= MULTIPLEX_FLAG
+    else:
+        hand = (hand,)
+
+    for throw in hand:
+        value = int(floor(throw))
+        if throw == value:
+            throw_flags.append(flags)
+        elif throw - value == 0.5:
+            throw_flags.append(flags | CROSSING_FLAG)
+        else:
+            raise ValueError("Invalid throw: {}".format(throw))
+        throws.append(value)
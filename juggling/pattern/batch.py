@@ -0,0 +1,123 @@
+"""
+Analysis of large batches of vanilla siteswaps at once.
+
+The siteswaps are given as a 2-D array of throws, one row per siteswap, where rows shorter than the widest one are
+padded out and their real length is given in `periods`. When NumPy is installed every check is a handful of
+vectorised operations over the whole batch, otherwise the same results are worked out in pure Python.
+
+The results match the :class:`Pattern` properties of the same name: a siteswap is valid when the beats its throws
+land on, `(i + t_i) mod period`, are a permutation of its beats, and it is excited unless it is valid and starts from
+the ground state. A vanilla siteswap starts from the ground state when no throw lands later than `num_objects` beats
+into the next period, that is when every `i + t_i < period + num_objects`.
+"""
+from collections import namedtuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from juggling.utils import numpy_enabled
+
+
+__all__ = ['BatchAnalysis', 'analyse_batch', 'pad_throws']
+
+
+BatchAnalysis = namedtuple('BatchAnalysis', ['is_valid', 'num_objects', 'max_throw', 'is_excited'])
+
+
+def pad_throws(siteswaps, use_numpy=None):
+    # type: (Iterable, bool) -> (Any, Any)
+    """
+    Turns a sequence of vanilla siteswaps, each a sequence of throws, into the (throws, periods) arrays taken by
+    :func:`analyse_batch`. Shorter siteswaps are padded with 0.
+
+    :param use_numpy: Return NumPy arrays, defaults to whether NumPy is installed. Otherwise lists are returned.
+    """
+    siteswaps = [list(_) for _ in siteswaps]
+    periods = [len(_) for _ in siteswaps]
+    width = max(periods) if periods else 0
+    throws = [_ + [0] * (width - len(_)) for _ in siteswaps]
+    if numpy_enabled(use_numpy):
+        throws = numpy.array(throws, dtype=numpy.int64).reshape(len(throws), width)
+        return throws, numpy.array(periods, dtype=numpy.int64)
+    return throws, periods
+
+
+def analyse_batch(throws, periods=None, use_numpy=None):
+    # type: (Any, Any, bool) -> BatchAnalysis
+    """
+    Works out whether each vanilla siteswap in a batch is valid, along with its number of objects, highest throw and
+    whether it is excited.
+
+    >>> result = analyse_batch([[4, 4, 1], [4, 4, 2], [5, 1, 0]], periods=[3, 3, 2])
+    >>> list(result.is_valid) == [True, False, True]
+    >>> list(result.is_excited) == [False, True, True]
+
+    :param throws: A 2-D array (or list of lists) of throws, one row per siteswap
+    :param periods: The period of each siteswap, any throws past it are ignored. Defaults to the full width of
+        `throws` for every row.
+    :param use_numpy: Use NumPy, defaults to whether NumPy is installed
+    :return: A :class:`BatchAnalysis` of arrays, or lists when NumPy is not used, with one entry per siteswap
+    """
+    if numpy_enabled(use_numpy):
+        return _analyse_numpy(throws, periods)
+    return _analyse_python(throws, periods)
+
+
+def _analyse_numpy(throws, periods):
+    throws = numpy.asarray(throws, dtype=numpy.int64)
+    if throws.ndim != 2:
+        raise ValueError("Throws must be a 2-D array")
+    rows, width = throws.shape
+    periods = numpy.full(rows, width, dtype=numpy.int64) if periods is None else numpy.asarray(periods, numpy.int64)
+    if periods.shape != (rows,) or (periods < 1).any() or (periods > width).any():
+        raise ValueError("Periods must be between 1 and the width of the throws for every row")
+
+    beats = numpy.arange(width, dtype=numpy.int64)
+    in_period = beats < periods[:, None]
+    throws = numpy.where(in_period, throws, 0)
+    if (throws < 0).any():
+        raise ValueError("Throws must not be negative")
+
+    num_objects = throws.sum(axis=1) // periods
+    max_throw = throws.max(axis=1)
+
+    # count how many throws land on each beat of each row, padding lands nowhere
+    landing = (beats + throws) % periods[:, None] + (numpy.arange(rows, dtype=numpy.int64) * width)[:, None]
+    counts = numpy.bincount(landing[in_period], minlength=rows * width).reshape(rows, width)
+    is_valid = ((counts == 1) | ~in_period).all(axis=1)
+
+    latest = numpy.where(in_period, beats + throws, 0).max(axis=1)
+    is_ground = is_valid & (num_objects > 0) & (latest < periods + num_objects)
+    return BatchAnalysis(is_valid, num_objects, max_throw, ~is_ground)
+
+
+def _analyse_python(throws, periods):
+    throws = [list(_) for _ in throws]
+    if periods is None:
+        periods = [len(_) for _ in throws]
+    if len(periods) != len(throws):
+        raise ValueError("Periods must be given for every row")
+
+    result = BatchAnalysis([], [], [], [])
+    for row, period in zip(throws, periods):
+        if not 1 <= period <= len(row):
+            raise ValueError("Periods must be between 1 and the width of the throws for every row")
+        row = row[:period]
+        if min(row) < 0:
+            raise ValueError("Throws must not be negative")
+
+        num_objects = sum(row) // period
+        landed = [False] * period
+        latest = 0
+        for beat, throw in enumerate(row):
+            landed[(beat + throw) % period] = True
+            latest = max(latest, beat + throw)
+        is_valid = all(landed)
+
+        result.is_valid.append(is_valid)
+        result.num_objects.append(num_objects)
+        result.max_throw.append(max(row))
+        result.is_excited.append(not (is_valid and num_objects > 0 and latest < period + num_objects))
+    return result
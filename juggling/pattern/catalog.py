@@ -0,0 +1,177 @@
+"""
+An in-memory catalogue of patterns that can be searched by their properties.
+
+Every pattern added to a :class:`PatternCatalog` is analysed once, kept as a :class:`FrozenPattern` and given an id,
+its position in the catalogue. The ids are then added to an index for each searchable property, a dict of value to
+the set of ids with that value, so a query only looks at the sets for the values it asks for. Filters are combined
+by intersecting their sets, smallest first, and no pattern is looked at again unless a query asks for a throw
+sequence longer than the indexed n-grams.
+"""
+from . import Pattern, FrozenPattern, beat_key
+
+
+__all__ = ['PatternCatalog']
+
+
+#: The pattern properties that can be searched for by value
+INDEXED_FIELDS = ('num_objects', 'period', 'max_throw', 'type', 'is_valid', 'is_excited')
+
+# the kinds of value of a field that match any of the values in them, range is a function returning a list on py2
+_VALUE_SETS = (list, tuple, set, frozenset, type(range(0)))
+
+
+def _throw_key(beat):
+    # type: (int or float or list or tuple) -> Any
+    """ Returns a hashable key for a beat, plain throws are their own key """
+    return beat_key(beat) if isinstance(beat, (list, tuple)) else beat
+
+
+def _state_key(state):
+    # type: (Iterable) -> tuple
+    """ Returns a state as a tuple without trailing zeros, as :attr:`Pattern.states` has them """
+    state = list(state)
+    while state and not state[-1]:
+        state.pop()
+    return tuple(state)
+
+
+def _contains(keys, sequence):
+    # type: (list, list) -> bool
+    """ Returns True if the throw keys of a pattern, repeated forever, contain `sequence` """
+    repeated = keys * (len(sequence) // len(keys) + 2)
+    return any(repeated[start:start + len(sequence)] == sequence for start in range(len(keys)))
+
+
+class PatternCatalog(object):
+    """
+    An in-memory catalogue of patterns with an index on each of :data:`INDEXED_FIELDS`, on the entry and exit
+    states of each pattern, on the state it starts in and on every sequence of up to `ngram_size` throws it
+    contains. Patterns wrap around, so a sequence may run past the end of a pattern back into its start.
+
+    A pattern can be entered or left on any of its beats, so its entry and exit states are every state of
+    :attr:`Pattern.states`, the states it passes through. They are the same for every rotation of a pattern, unlike
+    the state it starts in.
+
+    >>> catalog = PatternCatalog([[4, 4, 1], [5, 3, 1], [9, 7, 5, 3, 1], [5, 5, 5, 0, 0]])
+    >>> catalog.query(num_objects=5, contains=[9, 7, 5]) == [2]
+    >>> catalog.query(max_throw=range(6), is_excited=False) == [0, 1, 3]
+    >>> catalog[catalog.query(state=[1, 1, 1])[0]] == FrozenPattern([4, 4, 1])
+
+    :param patterns: Patterns to add, each a :class:`Pattern`, :class:`FrozenPattern` or beat list
+    :param ngram_size: The length of the longest throw sequences indexed
+    """
+    def __init__(self, patterns=(), ngram_size=3):
+        # type: (Iterable, int) -> None
+        if ngram_size < 1:
+            raise ValueError("Invalid n-gram size: {}".format(ngram_size))
+        self.ngram_size = ngram_size
+        self._patterns = []
+        self._indexes = dict((field, {}) for field in INDEXED_FIELDS)
+        self._states = {}
+        self._starting_states = {}
+        self._ngrams = {}
+        self.extend(patterns)
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def __iter__(self):
+        return iter(self._patterns)
+
+    def __getitem__(self, index):
+        # type: (int) -> FrozenPattern
+        return self._patterns[index]
+
+    def add(self, pattern):
+        # type: (Pattern or FrozenPattern or list) -> int
+        """ Analyses a pattern and adds it to every index, returning its id """
+        if isinstance(pattern, FrozenPattern):
+            frozen, pattern = pattern, pattern.to_pattern()
+        else:
+            if not isinstance(pattern, Pattern):
+                pattern = Pattern(pattern)
+            frozen = pattern.freeze()
+        if not pattern.data:
+            raise ValueError("Empty patterns cannot be catalogued")
+
+        index = len(self._patterns)
+        self._patterns.append(frozen)
+        for field, values in self._indexes.items():
+            values.setdefault(getattr(pattern, field), set()).add(index)
+
+        states = [tuple(_) for _ in pattern.states]
+        if states:
+            self._starting_states.setdefault(states[0], set()).add(index)
+        for state in set(states):
+            self._states.setdefault(state, set()).add(index)
+
+        keys = [_throw_key(_) for _ in pattern.data]
+        ngrams = set()
+        for start in range(len(keys)):
+            ngram = ()
+            for offset in range(self.ngram_size):
+                ngram += (keys[(start + offset) % len(keys)], )
+                ngrams.add(ngram)
+        for ngram in ngrams:
+            self._ngrams.setdefault(ngram, set()).add(index)
+        return index
+
+    def extend(self, patterns):
+        # type: (Iterable) -> list
+        """ Adds every pattern in `patterns`, returning their ids """
+        return [self.add(_) for _ in patterns]
+
+    def query(self, contains=None, state=None, starting_state=None, **fields):
+        # type: (list, list, list, Any) -> list
+        """
+        Returns the sorted ids of the patterns matching every filter given, or of every pattern if none are.
+
+        :param contains: A sequence of beats the pattern must contain, such as `[9, 7, 5]`
+        :param state: An entry or exit state of the pattern, any state it passes through, see :attr:`Pattern.states`
+        :param starting_state: The state the pattern must start in, see :attr:`Pattern.current_state`
+        :param fields: The value of any of :data:`INDEXED_FIELDS`, or a list, set or range of values any of which
+            match
+        :raises ValueError: If an unknown field is given
+        """
+        candidates = []
+        for field, value in fields.items():
+            if field not in self._indexes:
+                raise ValueError("Unknown field: {}".format(field))
+            index = self._indexes[field]
+            if isinstance(value, _VALUE_SETS):
+                candidates.append(set().union(*[index.get(_, ()) for _ in value]))
+            else:
+                candidates.append(index.get(value, set()))
+        if state is not None:
+            candidates.append(self._states.get(_state_key(state), set()))
+        if starting_state is not None:
+            candidates.append(self._starting_states.get(_state_key(starting_state), set()))
+
+        sequence = [_throw_key(_) for _ in contains] if contains else []
+        size = self.ngram_size
+        if sequence:
+            # n-grams covering the whole sequence, the last one overlapping the one before if needed
+            starts = list(range(0, max(len(sequence) - size, 0) + 1, size))
+            if starts[-1] + size < len(sequence):
+                starts.append(len(sequence) - size)
+            for start in starts:
+                candidates.append(self._ngrams.get(tuple(sequence[start:start + size]), set()))
+
+        if not candidates:
+            return list(range(len(self._patterns)))
+        candidates.sort(key=len)
+        matches = set(candidates[0])
+        for ids in candidates[1:]:
+            if not matches:
+                break
+            matches &= ids
+
+        if len(sequence) > size:
+            # the n-grams only narrow down the patterns that can contain longer sequences
+            matches = [_ for _ in matches if _contains([_throw_key(beat) for beat in self._patterns[_]], sequence)]
+        return sorted(matches)
+
+    def count(self, **filters):
+        # type: (Any) -> int
+        """ Returns the number of patterns matching the filters, see :meth:`query` """
+        return len(self.query(**filters))
@@ -0,0 +1,142 @@
+"""
+Counting vanilla siteswaps without generating them.
+
+Every valid vanilla siteswap of period `p` is a closed walk of `p` throws around the state graph used by
+:func:`generate_siteswaps`, so the number of siteswap sequences is the trace of the `p`-th power of its transfer
+matrix. Rather than multiplying matrices the closed walks are counted by dynamic programming, grouped by the lowest
+state they go through as :func:`generate_siteswaps` does:
+
+* the walks from each state `s` back to itself through states no lower than `s` are counted for every length up to
+  `p`, one step at a time, only keeping the states that can still get back to `s` in the throws left
+* the number of those walks with any beat as their start, the trace of the lowest state `s`, follows from the
+  power series identity `T(x) = x W'(x) / W(x)`, where `W` counts the walks that start on `s`
+* siteswaps of an exact period, counted once however they are rotated, then follow from the traces by Moebius
+  inversion over the divisors of `p`
+
+Every count is an exact integer, and the traces are kept for each number of objects and max throw so that counting
+again, for the same or a shorter period, does no more work.
+"""
+from collections import namedtuple
+
+from .generator import _distances_to, _state_graph
+from .state import state_to_list
+
+
+__all__ = ['count_siteswaps', 'count_sequences', 'count_by_state', 'StateCount']
+
+
+StateCount = namedtuple('StateCount', ['state', 'siteswaps', 'sequences'])
+StateCount.__doc__ = """
+The number of siteswaps whose lowest state is `state`, a state list, counted once however they are rotated as
+:func:`generate_siteswaps` yields them, and the number of them counting every rotation separately.
+"""
+
+_TRACES = {}  # (num_objects, max_throw) -> list of (state, [trace of each length from 0])
+
+
+def _mobius(n):
+    # type: (int) -> int
+    result = 1
+    factor = 2
+    while factor * factor <= n:
+        if not n % factor:
+            n //= factor
+            if not n % factor:
+                return 0
+            result = -result
+        factor += 1
+    return -result if n > 1 else result
+
+
+def _returning_walks(start, graph, period):
+    # type: (int, dict, int) -> list
+    """ Counts the walks from `start` back to itself of every length up to `period`, only through states no lower
+    than `start` """
+    distances = _distances_to(start, graph)
+    walks = [1] + [0] * period
+    current = {start: 1}
+    for length in range(1, period + 1):
+        remaining = period - length
+        following = {}
+        for state, ways in current.items():
+            for _, target in graph[state]:
+                if target >= start and distances.get(target, period + 1) <= remaining:
+                    following[target] = following.get(target, 0) + ways
+        current = following
+        walks[length] = current.get(start, 0)
+    return walks
+
+
+def _traces(num_objects, max_throw, period):
+    # type: (int, int, int) -> list
+    """
+    Returns a list of (state, traces) for every state, where `traces[m]` is the number of siteswap sequences of `m`
+    throws, counting every rotation, whose lowest state is `state`.
+    """
+    if period < 1:
+        raise ValueError("Invalid period: {}".format(period))
+    key = (num_objects, max_throw)
+    cached = _TRACES.get(key)
+    if cached is not None and len(cached[0][1]) > period:
+        return cached
+
+    graph = _state_graph(num_objects, max_throw)
+    result = []
+    for start in sorted(graph):
+        walks = _returning_walks(start, graph, period)
+        # T(x) W(x) = x W'(x), and W starts with a 1
+        traces = [0] * (period + 1)
+        for length in range(1, period + 1):
+            traces[length] = length * walks[length] - sum(traces[k] * walks[length - k] for k in range(1, length))
+        result.append((start, traces))
+    _TRACES[key] = result
+    return result
+
+
+def _exact_period(traces, period):
+    # type: (list, int) -> int
+    """ The number of sequences of exactly `period` throws, that don't repeat within it, counting every rotation """
+    return sum(_mobius(period // d) * traces[d] for d in range(1, period + 1) if not period % d)
+
+
+def count_siteswaps(num_objects, max_throw, period, rotations=False):
+    # type: (int, int, int, bool) -> int
+    """
+    Returns the number of valid vanilla siteswaps for `num_objects` with throws no higher than `max_throw` and an
+    exact period of `period`, the number :func:`generate_siteswaps` yields.
+
+    >>> count_siteswaps(3, 5, 3) == 5
+    >>> count_siteswaps(3, 5, 3, rotations=True) == 15
+
+    :param rotations: Count every rotation of a siteswap separately
+    """
+    total = sum(_exact_period(traces, period) for _, traces in _traces(num_objects, max_throw, period))
+    return total if rotations else total // period
+
+
+def count_sequences(num_objects, max_throw, period):
+    # type: (int, int, int) -> int
+    """
+    Returns the number of valid sequences of `period` throws for `num_objects` with throws no higher than
+    `max_throw`, the trace of the `period`-th power of the transfer matrix of the state graph. Every rotation is
+    counted, and so are sequences that repeat within `period` such as `333`.
+
+    >>> count_sequences(3, 5, 3) == 16
+    """
+    return sum(traces[period] for _, traces in _traces(num_objects, max_throw, period))
+
+
+def count_by_state(num_objects, max_throw, period):
+    # type: (int, int, int) -> list
+    """
+    Breaks the counts of :func:`count_siteswaps` down by the lowest state of the siteswaps, the state
+    :func:`generate_siteswaps` starts them from. Returns a :class:`StateCount` for every state in ascending order,
+    which can be used to size the shards of :func:`generate_siteswaps_parallel`.
+
+    >>> count_by_state(3, 4, 2)[0] == StateCount([1, 1, 1], 1, 2)
+    """
+    result = []
+    for state, traces in _traces(num_objects, max_throw, period):
+        sequences = _exact_period(traces, period)
+        result.append(StateCount(state_to_list(state), sequences // period, sequences))
+    return result
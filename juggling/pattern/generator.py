@@ -0,0 +1,242 @@
+"""
+Generation of vanilla siteswaps by walking the juggling state graph.
+
+A state is stored as an integer bitmask, bit `i` is set when an object is due to land `i` beats from now. Throwing
+a `t` moves every object one beat closer (a right shift) and lands the object in hand, if any, `t` beats from now.
+
+Searches can be split into shards, each one a starting state and a prefix of throws, which can be run in parallel
+with :func:`generate_siteswaps_parallel`. Shards describe their starting state the same way
+:func:`juggling.pattern.generate_state` does, so they line up with :attr:`Pattern.states`.
+"""
+import os
+from collections import deque
+from multiprocessing import Pool
+
+from .state import state_from_list, state_to_list, states_for, transitions
+
+
+__all__ = ['generate_siteswaps', 'generate_siteswaps_parallel', 'shards_for', 'states_for', 'state_to_list',
+           'state_from_list']
+
+_SITESWAP_CHARS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def _distances_to(start, graph):
+    # type: (int, dict) -> dict
+    """ Returns the least number of throws from each state to `start`, only going through states >= `start` """
+    reverse = {}
+    for state, edges in graph.items():
+        if state >= start:
+            for _, target in edges:
+                reverse.setdefault(target, []).append(state)
+
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        for source in reverse.get(state, ()):
+            if source not in distances:
+                distances[source] = distances[state] + 1
+                queue.append(source)
+    return distances
+
+
+def _walk(start, graph, period, prefix=()):
+    # type: (int, dict, int, tuple) -> Iterator
+    """
+    Yields every siteswap of exactly `period` throws whose lowest state is `start`, starting from `start`. The
+    search never visits a state lower than `start` or one that cannot get back to `start` in the throws that are
+    left. Of the rotations that start from `start` only the lexicographically greatest one is yielded, and patterns
+    that repeat within `period` are skipped.
+
+    :param prefix: Only yield siteswaps starting with these throws
+    """
+    distances = _distances_to(start, graph)
+    throws, path = [], [start]
+    for t in prefix:
+        state = dict(graph[path[-1]]).get(t)
+        if state is None or state < start or distances.get(state, period) > period - len(path):
+            return
+        throws.append(t)
+        path.append(state)
+    depth = len(prefix)
+
+    stack = [iter(graph[path[-1]])]
+    while stack:
+        remaining = period - len(path)
+        for t, state in stack[-1]:
+            if state < start or distances.get(state, period) > remaining:
+                continue
+            if not remaining:
+                siteswap = throws + [t]
+                if _is_canonical(siteswap, path, start):
+                    yield tuple(siteswap)
+                continue
+            throws.append(t)
+            path.append(state)
+            stack.append(iter(graph[state]))
+            break
+        else:
+            stack.pop()
+            if len(throws) > depth:
+                throws.pop()
+                path.pop()
+
+
+def _is_canonical(siteswap, path, start):
+    # type: (list, list, int) -> bool
+    """
+    Checks that `siteswap` is greater than every other rotation of itself that also starts from `start`. Rotations
+    equal to `siteswap` mean that it repeats within its period.
+    """
+    for i in range(1, len(siteswap)):
+        if path[i] == start and siteswap[i:] + siteswap[:i] >= siteswap:
+            return False
+    return True
+
+
+def generate_siteswaps(num_objects, max_throw, period, limit=None):
+    # type: (int, int, int, int) -> Iterator
+    """
+    Lazily yields every valid vanilla siteswap for `num_objects` with throws no higher than `max_throw` and an
+    exact period of `period`. Each siteswap is yielded once, as a tuple of throws, regardless of how it is rotated.
+    The rotation that is yielded starts from the lowest state the siteswap goes through.
+
+    Siteswaps are yielded in a deterministic order, sorted by their starting state and then by their throws.
+
+    >>> list(generate_siteswaps(3, 5, 3)) == [(4, 2, 3), (4, 4, 1), (5, 2, 2), (5, 3, 1), (4, 5, 0)]
+    >>> Pattern(list(next(generate_siteswaps(3, 5, 3)))).is_valid == True
+
+    :param num_objects: Number of objects being juggled
+    :param max_throw: Highest throw allowed in the siteswaps
+    :param period: Number of throws before the siteswap repeats
+    :param limit: Stop after yielding this many siteswaps
+    """
+    for start, siteswap in _generate(num_objects, max_throw, period, limit):
+        yield siteswap
+
+
+def _state_graph(num_objects, max_throw):
+    # type: (int, int) -> dict
+    """ Returns a dict of state -> transitions for every state """
+    if num_objects < 0 or max_throw < num_objects:
+        raise ValueError("Invalid number of objects or max throw: {}, {}".format(num_objects, max_throw))
+    return dict((state, transitions(state, max_throw)) for state in states_for(num_objects, max_throw))
+
+
+def _generate(num_objects, max_throw, period, limit=None, shards=None):
+    # type: (int, int, int, int, Iterable) -> Iterator
+    """ Yields (starting state, siteswap), only from the given (starting state, prefix) `shards` if any """
+    graph = _state_graph(num_objects, max_throw)
+    if period < 1:
+        raise ValueError("Invalid period: {}".format(period))
+
+    if shards is None:
+        shards = ((start, ()) for start in sorted(graph))
+
+    count = 0
+    for start, prefix in shards:
+        for siteswap in _walk(start, graph, period, prefix):
+            if limit is not None and count >= limit:
+                return
+            count += 1
+            yield start, siteswap
+
+
+def shards_for(num_objects, max_throw, period, prefix_length=1):
+    # type: (int, int, int, int) -> list
+    """
+    Splits the search for siteswaps into shards. A shard is a tuple of (starting state, prefix), where the starting
+    state is a state list as returned by :func:`generate_state` and the prefix is a tuple of the first throws. Every
+    siteswap that :func:`generate_siteswaps` yields belongs to exactly one shard, and running the shards in the
+    order they are returned yields the siteswaps in the same order as :func:`generate_siteswaps`.
+
+    :param prefix_length: How many throws to put in each prefix, more throws make more and smaller shards. This is
+        capped at `period - 1`.
+    """
+    graph = _state_graph(num_objects, max_throw)
+    if period < 1:
+        raise ValueError("Invalid period: {}".format(period))
+    prefix_length = max(0, min(prefix_length, period - 1))
+
+    shards = []
+    for start in sorted(graph):
+        distances = _distances_to(start, graph)
+        prefixes = [((), start)]
+        for depth in range(prefix_length):
+            prefixes = [(prefix + (t, ), target)
+                        for prefix, state in prefixes
+                        for t, target in graph[state]
+                        if target >= start and distances.get(target, period) <= period - depth - 1]
+        shards.extend((state_to_list(start), prefix) for prefix, _ in prefixes)
+    return shards
+
+
+def _run_shard(args):
+    # type: (tuple) -> list or tuple
+    """
+    Runs a single shard in a worker process. Returns the list of siteswaps found, or if an output path is given
+    writes them to the file, one siteswap per line, and returns (path, number of siteswaps).
+    """
+    num_objects, max_throw, period, (state, prefix), path = args
+    shard = [(state_from_list(state), prefix)]
+    siteswaps = (siteswap for _, siteswap in _generate(num_objects, max_throw, period, shards=shard))
+    if path is None:
+        return list(siteswaps)
+
+    count = 0
+    with open(path, 'w') as f:
+        for siteswap in siteswaps:
+            f.write(''.join(_SITESWAP_CHARS[t] for t in siteswap))
+            f.write('\n')
+            count += 1
+    return path, count
+
+
+def generate_siteswaps_parallel(num_objects, max_throw, period, processes=None, prefix_length=1, output_dir=None):
+    # type: (int, int, int, int, int, str) -> Iterator or list
+    """
+    Generates the same siteswaps as :func:`generate_siteswaps`, in the same order, with a pool of worker processes.
+    The search is split up with :func:`shards_for` and the results of the shards are merged back in order.
+
+    When `output_dir` is given each worker writes its shard straight to a file in that directory, one siteswap per
+    line, instead of sending the siteswaps back. The siteswaps in order are then the contents of the files in
+    the order they are returned.
+
+    >>> list(generate_siteswaps_parallel(3, 5, 3)) == list(generate_siteswaps(3, 5, 3))
+
+    :param processes: Number of worker processes, defaults to the number of CPUs
+    :param prefix_length: Passed to :func:`shards_for`
+    :param output_dir: Directory to write the shard files to
+    :return: An iterator of siteswaps, or when `output_dir` is given a list of (shard, path, number of siteswaps)
+        for every shard
+    """
+    shards = shards_for(num_objects, max_throw, period, prefix_length)
+    paths = [None] * len(shards)
+    if output_dir is not None:
+        paths = [os.path.join(output_dir, 'shard-{:06d}.txt'.format(i)) for i in range(len(shards))]
+    tasks = [(num_objects, max_throw, period, shard, path) for shard, path in zip(shards, paths)]
+
+    if output_dir is not None:
+        pool = Pool(processes)
+        try:
+            results = pool.map(_run_shard, tasks, chunksize=1)
+        finally:
+            pool.terminate()
+            pool.join()
+        return [(shard, path, count) for shard, (path, count) in zip(shards, results)]
+    return _merge_shards(tasks, processes)
+
+
+def _merge_shards(tasks, processes):
+    # type: (list, int) -> Iterator
+    """ Yields the siteswaps of every shard in order, as the worker processes finish them """
+    pool = Pool(processes)
+    try:
+        for siteswaps in pool.imap(_run_shard, tasks, chunksize=1):
+            for siteswap in siteswaps:
+                yield siteswap
+    finally:
+        # stops the shards still being worked on when the iterator is closed early, rather than waiting for them
+        pool.terminate()
+        pool.join()
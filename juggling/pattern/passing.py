@@ -0,0 +1,214 @@
+"""
+Patterns juggled by several jugglers passing objects between them.
+
+A passing pattern is analysed the same way as a solo :class:`Pattern`, by counting the throws into and out of every
+beat, except that every juggler has their own beats. A throw of `t` made by any juggler on beat `b` lands on beat
+`(b + t) mod period` of the juggler it is thrown to, and the pattern is valid when every beat of every juggler has
+as many throws landing on it as are thrown from it. Every juggler's throws are looked at once, so the analysis takes
+time linear in the total number of throws.
+"""
+from array import array
+from math import floor
+
+from juggling.utils import CacheProperties, lcm
+from . import Pattern, analyse_pattern, flatten_pattern_list
+from .state import COUNT_BITS, first_state, multiplex_state_to_list
+
+
+__all__ = ['PassingPattern', 'PassingAnalysis', 'analyse_passing']
+
+
+PASSING_PATTERN = 'PSS'
+
+
+class PassingAnalysis(object):
+    """ The results of :func:`analyse_passing`, `incoming` and `outgoing` have a list of counts for each juggler """
+    __slots__ = ('period', 'throws_with_targets', 'incoming', 'outgoing', 'num_objects', 'max_throw', 'is_valid')
+
+
+def analyse_passing(jugglers, targets):
+    # type: (list, list) -> PassingAnalysis
+    """
+    Analyses a passing pattern in a single pass over the throws of every juggler, working out the period, the throws
+    of every juggler over that period along with who catches them, the incoming and outgoing throws of each beat of
+    each juggler, the number of objects, the highest throw and whether the pattern is valid.
+
+    Jugglers whose own period is shorter than the period of the whole pattern repeat their throws until it is
+    reached.
+
+    >>> analyse_passing([[4, 2], [3, 3]], [[1, 0], [1, 0]]).is_valid == True
+
+    :param jugglers: A beat list for each juggler
+    :param targets: A list of targets for each juggler, see :class:`PassingPattern`
+    """
+    solo = [analyse_pattern(_) for _ in jugglers]
+    period = 1
+    for juggler in solo:
+        period = lcm(period, juggler.period)
+
+    analysis = PassingAnalysis()
+    analysis.period = period
+    analysis.throws_with_targets = []
+    analysis.incoming = [[0] * period for _ in jugglers]
+    analysis.outgoing = [[0] * period for _ in jugglers]
+    total = 0
+    for juggler, juggler_targets in enumerate(targets):
+        throws_with_beats = solo[juggler].throws_with_beats
+        if len(juggler_targets) != len(throws_with_beats):
+            raise ValueError("Juggler {} needs a target for each of their throws".format(juggler))
+        outgoing = analysis.outgoing[juggler]
+        throws = []
+        for repeat in range(0, period, solo[juggler].period or 1):
+            for (beat, throw), target in zip(throws_with_beats, juggler_targets):
+                beat += repeat
+                throw = int(throw)  # crossing throws outside of a synchronous beat land on the same beat
+                throws.append((beat, throw, target))
+                if throw:
+                    total += throw
+                    outgoing[beat] += 1
+                    analysis.incoming[target][(beat + throw) % period] += 1
+        analysis.throws_with_targets.append(throws)
+
+    analysis.num_objects = floor(total / period) if period else 0
+    analysis.max_throw = max(_.max_throw for _ in solo)
+    analysis.is_valid = bool(period) and analysis.incoming == analysis.outgoing
+    return analysis
+
+
+class PassingPattern(CacheProperties):
+    """
+    A pattern juggled by several jugglers. The throws of each juggler are kept in a :class:`Pattern` of their own,
+    as if they were juggling alone, along with a target for every throw, the index of the juggler that catches it.
+    The targets of a juggler are in the same order as :attr:`Pattern.throws_with_beats`.
+
+    >>> p = PassingPattern([[4, 2], [3, 3]], [[1, 0], [1, 0]])
+    >>> p.num_jugglers == 2
+    >>> p.throws_with_targets(0) == [(0, 4, 1), (1, 2, 0)]
+    >>> p.is_valid == True
+    >>> p.current_state == [[1, 1, 1], [1, 1, 1]]
+
+    :param jugglers: A :class:`Pattern`, or beat list, for each juggler
+    :param targets: A list of targets for each juggler
+    """
+    def __init__(self, jugglers, targets):
+        # type: (list, list) -> None
+        super(PassingPattern, self).__init__()
+        if len(jugglers) < 2 or len(targets) != len(jugglers):
+            raise ValueError("A passing pattern needs a pattern and targets for at least 2 jugglers")
+        self.jugglers = [_ if isinstance(_, Pattern) else Pattern(_) for _ in jugglers]
+        self.targets = [array('H', _) for _ in targets]
+        for juggler, (pattern, juggler_targets) in enumerate(zip(self.jugglers, self.targets)):
+            if len(juggler_targets) != len(flatten_pattern_list(pattern.data)):
+                raise ValueError("Juggler {} needs a target for each of their throws".format(juggler))
+            if juggler_targets and max(juggler_targets) >= len(self.jugglers):
+                raise ValueError("Juggler {} passes to a juggler that doesn't exist".format(juggler))
+
+    def __eq__(self, other):
+        if not isinstance(other, PassingPattern):
+            return NotImplemented
+        return self.jugglers == other.jugglers and self.targets == other.targets
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'PassingPattern({!r}, {!r})'.format([_.data for _ in self.jugglers], [list(_) for _ in self.targets])
+
+    @property
+    def _analysis(self):
+        return analyse_passing([_.data for _ in self.jugglers], self.targets)
+
+    @property
+    def type(self):
+        return PASSING_PATTERN
+
+    @property
+    def num_jugglers(self):
+        return len(self.jugglers)
+
+    @property
+    def data(self):
+        """ The beat list of each juggler """
+        return [_.data for _ in self.jugglers]
+
+    @property
+    def period(self):
+        """ The number of beats before the whole pattern repeats, the lowest common multiple of the periods of the
+        jugglers """
+        period = 1
+        for pattern in self.jugglers:
+            period = lcm(period, pattern.period)
+        return period
+
+    def throws_with_targets(self, juggler):
+        # type: (int) -> list
+        """ Returns a list of (beat, throw, target) for every throw of `juggler`, see
+        :attr:`Pattern.throws_with_beats` """
+        return [(beat, throw, target) for (beat, throw), target in zip(self.jugglers[juggler].throws_with_beats,
+                                                                       self.targets[juggler])]
+
+    @property
+    def incoming(self):
+        return self._analysis.incoming
+
+    @property
+    def outgoing(self):
+        return self._analysis.outgoing
+
+    @property
+    def is_valid(self):
+        return self._analysis.is_valid
+
+    @property
+    def num_objects(self):
+        return self._analysis.num_objects
+
+    @property
+    def max_throw(self):
+        return self._analysis.max_throw
+
+    @property
+    def states(self):
+        """ For each juggler, a tuple of their state on every beat of the period. The state of a juggler only counts
+        the objects that land in their own hands. Empty if the pattern is not valid. """
+        if not self.is_valid:
+            return []
+        analysis = self._analysis
+        period = analysis.period
+
+        # the throws made on each beat, as (target, amount to add to the target's state)
+        thrown = [[] for _ in range(period)]
+        landing = [[] for _ in range(self.num_jugglers)]
+        for throws in analysis.throws_with_targets:
+            for beat, throw, target in throws:
+                if throw:
+                    thrown[beat].append((target, 1 << (COUNT_BITS * (throw - 1))))
+                    landing[target].append((beat, throw))
+
+        current = [first_state(_, period) for _ in landing]
+        states = [[] for _ in range(self.num_jugglers)]
+        for beat in range(period):
+            for juggler, state in enumerate(current):
+                states[juggler].append(multiplex_state_to_list(state))
+                current[juggler] = state >> COUNT_BITS
+            for target, added in thrown[beat]:
+                current[target] += added
+        return [tuple(_) for _ in states]
+
+    @property
+    def current_state(self):
+        """ The state of each juggler on the first beat """
+        return [_[0] for _ in self.states]
+
+    @property
+    def is_ground_state(self):
+        """ True if every juggler starts in their ground state, with no gaps between the objects they are due to
+        catch """
+        return self.is_valid and all(len(set(_)) == 1 for _ in self.current_state)
+
+    @property
+    def is_excited(self):
+        return not self.is_ground_state
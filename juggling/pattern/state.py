@@ -0,0 +1,258 @@
+"""
+Integer representations of juggling states and the transitions between them.
+
+A vanilla state is a bitmask, bit `i` is set when an object is due to land `i` beats from now. A multiplex state is
+a count vector packed into an integer, with `COUNT_BITS` bits for every beat holding how many objects land on that
+beat. Both can be converted to and from the state lists returned by :func:`juggling.pattern.generate_state`, where
+index `i` is the number of objects landing `i` beats from now and trailing empty beats are removed.
+
+>>> throw(0b111, 4) == 0b1011
+>>> state_to_list(0b1011) == [1, 1, 0, 1]
+>>> multiplex_state_to_list(multiplex_throw(multiplex_state_from_list([2, 1]), [3, 2])) == [1, 1, 1]
+
+A :class:`StateGraph` holds every vanilla state for a number of objects and max throw, along with the throws between
+them, and answers shortest transition queries between states and patterns.
+"""
+from collections import deque
+from itertools import combinations
+
+
+__all__ = ['COUNT_BITS', 'throw', 'multiplex_throw', 'state_to_list', 'state_from_list', 'multiplex_state_to_list',
+           'multiplex_state_from_list', 'first_state', 'iter_states', 'states_for', 'transitions', 'StateGraph']
+
+
+COUNT_BITS = 8  # bits used for each beat of a multiplex state, allowing up to 255 objects to land together
+COUNT_MASK = (1 << COUNT_BITS) - 1
+
+
+def throw(state, t):
+    # type: (int, int) -> int
+    """ Returns the vanilla state after throwing a `t` from `state`. Raises a :class:`ValueError` if `t` can't be
+    thrown, because it would land with another object or because there is no object (or one) to throw. """
+    shifted = state >> 1
+    if not state & 1:
+        if t:
+            raise ValueError("Cannot throw a {} from an empty hand".format(t))
+        return shifted
+    if t < 1:
+        raise ValueError("Cannot throw a {} when holding an object".format(t))
+    landing = 1 << (t - 1)
+    if shifted & landing:
+        raise ValueError("Throwing a {} collides with another object".format(t))
+    return shifted | landing
+
+
+def transitions(state, max_throw):
+    # type: (int, int) -> list
+    """ Returns a list of (throw, next state) for every throw up to `max_throw` that can be made from the vanilla
+    `state`, in ascending order of throws """
+    shifted = state >> 1
+    if not state & 1:
+        return [(0, shifted)]
+    return [(t, shifted | (1 << (t - 1))) for t in range(1, max_throw + 1) if not shifted & (1 << (t - 1))]
+
+
+def states_for(num_objects, max_throw):
+    # type: (int, int) -> list
+    """ Returns every vanilla state for `num_objects` with throws up to `max_throw`, in ascending order """
+    return sorted(sum(1 << i for i in bits) for bits in combinations(range(max_throw), num_objects))
+
+
+def multiplex_throw(state, throws):
+    # type: (int, Iterable) -> int
+    """ Returns the multiplex state after throwing all of `throws` together from `state`. Every object in hand has
+    to be thrown, so `throws` must have one non-zero throw for each of them. """
+    in_hand = state & COUNT_MASK
+    state >>= COUNT_BITS
+    for t in throws:
+        if t:
+            state += 1 << (COUNT_BITS * (t - 1))
+            in_hand -= 1
+    if in_hand:
+        raise ValueError("Throws {} do not match the objects in hand".format(list(throws)))
+    return state
+
+
+def state_to_list(state):
+    # type: (int) -> list
+    """ Converts a state bitmask into a state list like the ones returned by :func:`generate_state` """
+    return [(state >> i) & 1 for i in range(state.bit_length())]
+
+
+def state_from_list(state):
+    # type: (list) -> int
+    """ Converts a vanilla state list, like the ones returned by :func:`generate_state`, into a state bitmask """
+    mask = 0
+    for i, count in enumerate(state):
+        if count > 1:
+            raise ValueError("Multiplex states cannot be stored as a bitmask: {}".format(state))
+        if count:
+            mask |= 1 << i
+    return mask
+
+
+def multiplex_state_to_list(state):
+    # type: (int) -> list
+    """ Converts a multiplex state into a state list like the ones returned by :func:`generate_state` """
+    counts = []
+    while state:
+        counts.append(state & COUNT_MASK)
+        state >>= COUNT_BITS
+    return counts
+
+
+def multiplex_state_from_list(state):
+    # type: (list) -> int
+    """ Converts a state list, like the ones returned by :func:`generate_state`, into a multiplex state """
+    packed = 0
+    for count in reversed(state):
+        if not 0 <= count <= COUNT_MASK:
+            raise ValueError("Invalid number of objects in state: {}".format(count))
+        packed = (packed << COUNT_BITS) | count
+    return packed
+
+
+def first_state(throws_with_beats, period, offset=0):
+    # type: (list, int, int) -> int
+    """
+    Returns the multiplex state of a valid pattern at beat `offset`, from the objects that were thrown before it.
+
+    :param throws_with_beats: The (beat, throw) tuples of the pattern, see :attr:`Pattern.throws_with_beats`
+    :param period: The period of the pattern
+    """
+    state = 0
+    for beat, t in throws_with_beats:
+        if not t:
+            continue
+        # the most recent time this throw was made before `offset`, then every period before that while it is
+        # still in the air at `offset`
+        thrown = beat - period * ((beat - offset) // period + 1)
+        while thrown + t >= offset:
+            state += 1 << (COUNT_BITS * (thrown + t - offset))
+            thrown -= period
+    return state
+
+
+def iter_states(throws_with_beats, period, count=None):
+    # type: (list, int, int) -> Iterator
+    """
+    Yields the multiplex state of a valid pattern at each of its first `count` beats. Only the first state is worked
+    out from the throws, every other one is a single transition from the one before it.
+
+    :param throws_with_beats: The (beat, throw) tuples of the pattern, see :attr:`Pattern.throws_with_beats`
+    :param period: The period of the pattern
+    :param count: Number of states to yield, defaults to `period`
+    """
+    beats = [[] for _ in range(period)]
+    for beat, t in throws_with_beats:
+        beats[beat].append(t)
+
+    state = first_state(throws_with_beats, period)
+    for beat in range(period if count is None else count):
+        yield state
+        state = multiplex_throw(state, beats[beat % period])
+
+
+class StateGraph(object):
+    """
+    The graph of every vanilla state for `num_objects` with throws up to `max_throw`. It is built once, with an
+    index of the throws that can be made from each state, and then answers shortest transition queries with a
+    breadth first search from each state that is asked about, which is kept for any later queries.
+
+    States can be given either as bitmasks or as state lists like the ones in :attr:`Pattern.states`.
+
+    >>> graph = StateGraph(3, 5)
+    >>> graph.shortest_transition([1, 1, 1], [1, 1, 0, 1]) == [4]
+    >>> graph.pattern_transition(Pattern([3]), Pattern([5, 1])) == ([4], 0, 0)
+    """
+    def __init__(self, num_objects, max_throw):
+        # type: (int, int) -> None
+        if num_objects < 0 or max_throw < num_objects:
+            raise ValueError("Invalid number of objects or max throw: {}, {}".format(num_objects, max_throw))
+        self.num_objects = num_objects
+        self.max_throw = max_throw
+        #: every state, in ascending order
+        self.states = states_for(num_objects, max_throw)
+        #: index of every state in `states`
+        self.index = dict((state, i) for i, state in enumerate(self.states))
+        #: for each state index, a list of (throw, index of the next state)
+        self.adjacency = [[(t, self.index[target]) for t, target in transitions(state, max_throw)]
+                          for state in self.states]
+        self._searches = {}
+
+    def __len__(self):
+        return len(self.states)
+
+    def __contains__(self, state):
+        return self._state_index(state, False) is not None
+
+    def _state_index(self, state, required=True):
+        # type: (int or list, bool) -> int
+        """ Returns the index of a state given as a bitmask or a state list """
+        if not isinstance(state, int):
+            state = state_from_list(state)
+        index = self.index.get(state)
+        if index is None and required:
+            raise ValueError("State {} is not in the graph for {} objects with a max throw of {}".format(
+                state_to_list(state), self.num_objects, self.max_throw))
+        return index
+
+    def _search(self, source):
+        # type: (int) -> list
+        """ Returns the breadth first search tree from the state index `source`, as a list of (parent, throw) """
+        tree = self._searches.get(source)
+        if tree is None:
+            tree = [None] * len(self.states)
+            tree[source] = (source, None)
+            queue = deque([source])
+            while queue:
+                current = queue.popleft()
+                for t, target in self.adjacency[current]:
+                    if tree[target] is None:
+                        tree[target] = (current, t)
+                        queue.append(target)
+            self._searches[source] = tree
+        return tree
+
+    def _path(self, source, target):
+        # type: (int, int) -> list or None
+        """ Returns the throws of the shortest path between two state indexes, or None if there isn't one """
+        tree = self._search(source)
+        if tree[target] is None:
+            return None
+        throws = []
+        while target != source:
+            target, t = tree[target]
+            throws.append(t)
+        throws.reverse()
+        return throws
+
+    def shortest_transition(self, from_state, to_state):
+        # type: (int or list, int or list) -> list or None
+        """ Returns the shortest list of throws that goes from `from_state` to `to_state`, or None if there is no way
+        of getting there with the throws allowed in this graph """
+        return self._path(self._state_index(from_state), self._state_index(to_state))
+
+    def pattern_transition(self, from_pattern, to_pattern):
+        # type: (Pattern, Pattern) -> (list, int, int) or None
+        """
+        Returns the shortest transition from any beat of `from_pattern` into any beat of `to_pattern`, as a tuple of
+        (throws, beat of `from_pattern` to leave from, beat of `to_pattern` to enter at). The beats refer to
+        :attr:`Pattern.states`, and ties go to the earliest beats. Returns None if there is no transition.
+        """
+        from_indexes = [self._state_index(_) for _ in from_pattern.states]
+        to_indexes = [self._state_index(_) for _ in to_pattern.states]
+        if not from_indexes or not to_indexes:
+            raise ValueError("Transitions are only available between valid patterns")
+
+        best = None
+        for i, source in enumerate(from_indexes):
+            for j, target in enumerate(to_indexes):
+                throws = self._path(source, target)
+                if throws is not None and (best is None or len(throws) < len(best[0])):
+                    best = (throws, i, j)
+        return best
+
+    def clear_cache(self):
+        """ Forgets every search that has been kept for later queries """
+        self._searches.clear()
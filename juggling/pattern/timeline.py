@@ -0,0 +1,216 @@
+"""
+Prop trajectories of a pattern, for animation and simulation.
+
+A :class:`Timeline` follows every prop of a valid pattern through one full cycle, the number of beats after which
+every prop is back in the hand it started in, about to make the same throw. Each prop gets a list of
+:class:`PropEvent`, one per throw it makes, and :meth:`Timeline.sample` looks up where every prop is at any number of
+times at once. When NumPy is installed sampling is a handful of vectorised operations over all the times and props,
+otherwise the same results are worked out in pure Python.
+
+Beats alternate between the two hands, hand 0 throwing on even beats and hand 1 on odd beats. Both throws of a
+synchronous beat are made at the same time, hand 0 being the left of the beat tuple, so synchronous patterns only
+throw on even beats. Props are caught on the beat they are next thrown, there is no dwell time.
+"""
+from bisect import bisect_right
+from collections import namedtuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from juggling.utils import lcm, numpy_enabled
+from . import Pattern, SYNCHRONOUS_PATTERN
+
+
+__all__ = ['Timeline', 'PropEvent', 'TimelineSample']
+
+
+PropEvent = namedtuple('PropEvent', ['hand', 'throw_beat', 'catch_beat', 'height'])
+PropEvent.__doc__ = """
+A throw made by a prop from `hand` on `throw_beat`, landing `height` beats later on `catch_beat`
+"""
+
+TimelineSample = namedtuple('TimelineSample', ['throw_hand', 'catch_hand', 'height', 'progress'])
+TimelineSample.__doc__ = """
+The throw every prop is in the air for at each sampled time, see :meth:`Timeline.sample`. Every field has a row for
+each time and a column for each prop. `progress` is how far through the throw the prop is, from 0 when it is thrown
+to 1 when it is caught.
+"""
+
+
+def _orbits(throws_with_beats, period):
+    # type: (list, int) -> list
+    """
+    Splits the throws of a valid pattern, as (beat, throw), into orbits: the throws that follow each other when a
+    prop is caught and thrown again. Where several props land on the same beat they are thrown again in the order
+    the throws of that beat are listed. Returns a list of orbits, each a list of (beat, throw).
+    """
+    throws = [(beat, int(throw)) for beat, throw in throws_with_beats if throw]
+    thrown_from = [[] for _ in range(period)]
+    for i, (beat, _) in enumerate(throws):
+        thrown_from[beat].append(i)
+
+    landed = [0] * period
+    following = [0] * len(throws)
+    for i, (beat, throw) in enumerate(throws):
+        destination = (beat + throw) % period
+        following[i] = thrown_from[destination][landed[destination]]
+        landed[destination] += 1
+
+    orbits = []
+    seen = [False] * len(throws)
+    for start in range(len(throws)):
+        orbit = []
+        i = start
+        while not seen[i]:
+            seen[i] = True
+            orbit.append(throws[i])
+            i = following[i]
+        if orbit:
+            orbits.append(orbit)
+    return orbits
+
+
+class Timeline(object):
+    """
+    The throws made by every prop of a pattern over one full cycle. The props on the same orbit share its throws,
+    each starting a period after the previous one, and a full cycle is the lowest common multiple of the time each
+    orbit takes to repeat, and of 2 so that each prop is back in the same hand.
+
+    >>> timeline = Timeline([4, 4, 1])
+    >>> timeline.num_props == 3
+    >>> timeline.cycle == 18
+    >>> timeline.events[0][:3] == [PropEvent(0, 0, 4, 4), PropEvent(0, 4, 8, 4), PropEvent(0, 8, 9, 1)]
+    >>> timeline.sample([0.5, 5], use_numpy=False).height == [[4, 4, 4], [4, 4, 1]]
+
+    :param pattern: A valid :class:`Pattern`, or beat list
+    :raises ValueError: If the pattern is not valid
+    """
+    def __init__(self, pattern):
+        # type: (Pattern or list) -> None
+        self.pattern = pattern if isinstance(pattern, Pattern) else Pattern(pattern)
+        if not self.pattern.is_valid:
+            raise ValueError("Only valid patterns have a timeline: {}".format(self.pattern.data))
+        period = self.period = self.pattern.period
+        sync = self.pattern.type == SYNCHRONOUS_PATTERN
+
+        orbits = _orbits(self.pattern.throws_with_beats, period)
+        cycle = 2
+        for orbit in orbits:
+            cycle = lcm(cycle, sum(throw for _, throw in orbit))
+        self.cycle = cycle
+
+        self.events = []
+        for orbit in orbits:
+            length = sum(throw for _, throw in orbit)
+            for prop in range(length // period):
+                throws = []
+                beat = orbit[0][0] + prop * period
+                for repeat in range(cycle // length):
+                    for _, throw in orbit:
+                        throws.append((beat % cycle, throw))
+                        beat += throw
+                throws.sort()
+                events = []
+                for beat, throw in throws:
+                    catch = beat + throw
+                    if sync:
+                        # the right hand of a synchronous beat is one MSS beat later, but throws at the same time
+                        events.append(PropEvent(beat % 2, beat - beat % 2, catch - catch % 2,
+                                                catch - catch % 2 - beat + beat % 2))
+                    else:
+                        events.append(PropEvent(beat % 2, beat, catch, throw))
+                self.events.append(events)
+        self._arrays = None
+
+    @property
+    def num_props(self):
+        # type: () -> int
+        return len(self.events)
+
+    def sample(self, times, use_numpy=None):
+        # type: (Iterable, bool) -> TimelineSample
+        """
+        Finds the throw each prop is in the air for at every time in `times`, in beats from the start of the
+        pattern. Times outside of the first cycle wrap around, and a prop is thrown again on the beat it is caught.
+
+        :param times: The times to sample, any number of them
+        :param use_numpy: Use NumPy, defaults to whether NumPy is installed
+        :return: A :class:`TimelineSample` of arrays, or lists when NumPy is not used, with a row per time
+        """
+        if numpy_enabled(use_numpy):
+            return self._sample_numpy(times)
+        return self._sample_python(times)
+
+    def positions(self, times, use_numpy=None):
+        # type: (Iterable, bool) -> (Any, Any)
+        """
+        Returns the (x, y) position of every prop at every time in `times`, see :meth:`sample`. Hand 0 is at x = 0
+        and hand 1 at x = 1, props move across at a constant speed and follow a parabola with a gravity of 1 height
+        unit per beat squared, so a throw lasting `h` beats peaks at `h ** 2 / 8`.
+        """
+        if numpy_enabled(use_numpy):
+            sample = self._sample_numpy(times)
+            elapsed = sample.progress * sample.height
+            x = sample.throw_hand + (sample.catch_hand - sample.throw_hand) * sample.progress
+            return x, elapsed * (sample.height - elapsed) / 2
+
+        sample = self._sample_python(times)
+        x, y = [], []
+        for row in zip(sample.throw_hand, sample.catch_hand, sample.height, sample.progress):
+            x.append([thrown + (caught - thrown) * progress for thrown, caught, _, progress in zip(*row)])
+            y.append([progress * height * (height - progress * height) / 2 for _, _, height, progress in zip(*row)])
+        return x, y
+
+    def _catch_hands(self, events):
+        # type: (list) -> list
+        """ The hand catching each event, the hand making the prop's next throw """
+        return [_.hand for _ in events[1:]] + [events[0].hand]
+
+    def _sample_python(self, times):
+        sample = TimelineSample([], [], [], [])
+        starts = [[_.throw_beat for _ in events] for events in self.events]
+        catch_hands = [self._catch_hands(_) for _ in self.events]
+        for time in times:
+            time %= self.cycle
+            row = TimelineSample([], [], [], [])
+            for events, throw_beats, catching in zip(self.events, starts, catch_hands):
+                i = bisect_right(throw_beats, time) - 1
+                event = events[i]
+                thrown = event.throw_beat if i >= 0 else event.throw_beat - self.cycle  # still in the last throw
+                row.throw_hand.append(event.hand)
+                row.catch_hand.append(catching[i])
+                row.height.append(event.height)
+                row.progress.append(float(time - thrown) / event.height)
+            for column, values in zip(sample, row):
+                column.append(values)
+        return sample
+
+    def _build_arrays(self):
+        """ Flattens the events of every prop into arrays, sorted by prop then throw beat, with each prop's last
+        throw repeated a cycle earlier so that every time falls within one of the prop's throws """
+        keys, throw_beats, hands, catch_hands, heights = [], [], [], [], []
+        for prop, events in enumerate(self.events):
+            catching = self._catch_hands(events)
+            last = events[-1]
+            for event, caught in [(last._replace(throw_beat=last.throw_beat - self.cycle), catching[-1])] + \
+                    list(zip(events, catching)):
+                # each prop's keys are in their own range of two cycles
+                keys.append((2 * prop + 1) * self.cycle + event.throw_beat)
+                throw_beats.append(event.throw_beat)
+                hands.append(event.hand)
+                catch_hands.append(caught)
+                heights.append(event.height)
+        columns = (keys, throw_beats, hands, catch_hands, heights)
+        self._arrays = tuple(numpy.array(_, dtype=numpy.int64) for _ in columns)
+
+    def _sample_numpy(self, times):
+        if self._arrays is None:
+            self._build_arrays()
+        keys, throw_beats, hands, catch_hands, heights = self._arrays
+        times = numpy.mod(numpy.asarray(times, dtype=numpy.float64), self.cycle)
+        offsets = (2 * numpy.arange(self.num_props, dtype=numpy.int64) + 1) * self.cycle
+        i = numpy.searchsorted(keys, offsets[None, :] + times[:, None], side='right') - 1
+        height = heights[i]
+        return TimelineSample(hands[i], catch_hands[i], height, (times[:, None] - throw_beats[i]) / height)
@@ -1,8 +1,80 @@
-import types
-from json import JSONEncoder
+from abc import ABCMeta
+from functools import wraps
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-class CacheProperties(object):
+from juggling import instrumentation
+
+
+class cached_property(property):
+    """
+    A property that computes its value once and stores it in the instance's `_cache` dict, see
+    :class:`CacheProperties`. Looking up any other attribute of the instance is not affected.
+    """
+    def __init__(self, fget=None, fset=None, fdel=None, doc=None):
+        super(cached_property, self).__init__(fget, fset, fdel, doc)
+        self.name = fget.__name__
+
+    def _get(self, instance, owner=None):
+        if instance is None:
+            return self
+        cache = instance._cache
+        try:
+            return cache[self.name]
+        except KeyError:
+            value = cache[self.name] = self.fget(instance)
+            return value
+
+    def _get_instrumented(self, instance, owner=None):
+        if instance is None:
+            return self
+        cache = instance._cache
+        name = '{}.{}'.format(type(instance).__name__, self.name)
+        try:
+            value = cache[self.name]
+        except KeyError:
+            start = instrumentation.timer()
+            value = cache[self.name] = self.fget(instance)
+            instrumentation.record_lookup(name, False, instrumentation.timer() - start)
+            return value
+        instrumentation.record_lookup(name, True)
+        return value
+
+    # swapped for _get_instrumented while instrumentation is enabled, so cache hits never check for it otherwise
+    __get__ = _get
+
+
+def _instrument_cached_properties(enabled):
+    # type: (bool) -> None
+    cached_property.__get__ = cached_property._get_instrumented if enabled else cached_property._get
+
+
+instrumentation.on_toggle(_instrument_cached_properties)
+
+
+class CachePropertiesMeta(ABCMeta):
+    """ Turns the properties of a :class:`CacheProperties` class into :class:`cached_property` at class creation """
+    def __new__(mcs, name, bases, namespace):
+        cls = super(CachePropertiesMeta, mcs).__new__(mcs, name, bases, namespace)
+        for attr, value in namespace.items():
+            if type(value) is property and attr not in cls._cache_exclude:
+                setattr(cls, attr, cached_property(value.fget, value.fset, value.fdel, value.__doc__))
+        return cls
+
+
+def clears_cache(method):
+    """ Wraps a method that mutates a :class:`CacheProperties` instance so that its cache is cleared first """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._clear_cache()
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+class CacheProperties(CachePropertiesMeta('_CachePropertiesBase', (object,), {'_cache_exclude': []})):
     """ Will automatically cache property attributes of itself. Can clear with self._clear_cache() """
     _cache_exclude = []
 
@@ -21,27 +93,38 @@ class CacheProperties(object):
             del self._cache[key]
         super(CacheProperties, self).__setattr__(key, value)
 
-    def __getattribute__(self, name, *args, **kwargs):
-        exclude_attrs = super(CacheProperties, self).__getattribute__('_cache_exclude')
-        if (not name.startswith('__') and
-                name not in ['_cache', '_cached_attrs', '_clear_cache'] + exclude_attrs and
-                isinstance(getattr(self.__class__, name, None), property)):
-            cache = super(CacheProperties, self).__getattribute__('_cache')
-            if name not in cache:
-                cache[name] = super(CacheProperties, self).__getattribute__(name)
-            return cache[name]
-
-        return super(CacheProperties, self).__getattribute__(name, *args, **kwargs)
-
-
-class JugglingJSONEncoder(JSONEncoder):
-    def default(self, o):
-        data = {}
-        for attr in dir(o):
-            if attr.startswith('_'):
-                continue
-            value = getattr(o, attr)
-            if not (isinstance(value, types.MethodType) or
-                    isinstance(value, types.FunctionType)):
-                data[attr] = value
-        return data
+
+def array_to_bytes(values):
+    # type: (array) -> bytes
+    """ The machine values of an array as bytes, `array.tobytes` is py3 only """
+    try:
+        return values.tobytes()
+    except AttributeError:
+        return values.tostring()
+
+
+def gcd(a, b):
+    # type: (int, int) -> int
+    """ The greatest common divisor of two non-negative integers, `math.gcd` is py3 only """
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def lcm(a, b):
+    # type: (int, int) -> int
+    """ The lowest common multiple of two positive integers """
+    return a * b // gcd(a, b)
+
+
+def numpy_enabled(use_numpy=None):
+    # type: (bool) -> bool
+    """
+    Whether to use NumPy for an operation that can also be done in pure Python
+
+    :param use_numpy: Whether NumPy was asked for, defaults to whether NumPy is installed
+    :raises ImportError: If NumPy is asked for but is not installed
+    """
+    if use_numpy and numpy is None:
+        raise ImportError("NumPy is not installed")
+    return numpy is not None if use_numpy is None else use_numpy
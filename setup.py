@@ -30,6 +30,10 @@ setup(
     url='https://github.com/PacketPerception/pyjuggling',
     packages=find_packages(exclude=["*.tests", "*.tests.*", "tests.*", "tests"]),
     extras_require={
+        'numpy': ['numpy'],
+    },
+    entry_points={
+        'console_scripts': ['juggling = juggling.cli:main'],
     },
     license='MIT',
     classifiers=(
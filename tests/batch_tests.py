@@ -0,0 +1,40 @@
+import itertools
+import unittest
+
+from juggling.pattern import Pattern
+from juggling.pattern import batch
+
+
+SITESWAPS = [list(_) for period in range(1, 5) for _ in itertools.product(range(7), repeat=period)]
+
+
+class BatchTests(unittest.TestCase):
+    use_numpy = False
+
+    def setUp(self):
+        if self.use_numpy and batch.numpy is None:
+            self.skipTest('NumPy is not installed')
+
+    def test_matches_pattern(self):
+        throws, periods = batch.pad_throws(SITESWAPS, use_numpy=self.use_numpy)
+        result = batch.analyse_batch(throws, periods, use_numpy=self.use_numpy)
+        for i, siteswap in enumerate(SITESWAPS):
+            pattern = Pattern(siteswap)
+            self.assertEqual(bool(result.is_valid[i]), pattern.is_valid, siteswap)
+            self.assertEqual(result.num_objects[i], pattern.num_objects, siteswap)
+            self.assertEqual(result.max_throw[i], pattern.max_throw, siteswap)
+            self.assertEqual(bool(result.is_excited[i]), pattern.is_excited, siteswap)
+
+    def test_full_width(self):
+        result = batch.analyse_batch([[4, 4, 1], [4, 4, 2], [5, 0, 1]], use_numpy=self.use_numpy)
+        self.assertEqual([bool(_) for _ in result.is_valid], [True, False, True])
+        self.assertEqual([bool(_) for _ in result.is_excited], [False, True, True])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, batch.analyse_batch, [[4, 4, 1]], [4], use_numpy=self.use_numpy)
+        self.assertRaises(ValueError, batch.analyse_batch, [[4, 4, 1]], [0], use_numpy=self.use_numpy)
+        self.assertRaises(ValueError, batch.analyse_batch, [[4, -4, 1]], use_numpy=self.use_numpy)
+
+
+class NumpyBatchTests(BatchTests):
+    use_numpy = True
@@ -0,0 +1,62 @@
+import unittest
+
+from juggling.notation.cache import SiteswapCache, CacheInfo
+from juggling.pattern import FrozenPattern
+
+
+class SiteswapCacheTests(unittest.TestCase):
+    def test_analysis(self):
+        cache = SiteswapCache()
+        analysis = cache.get('441')
+        self.assertTrue(analysis.is_valid_syntax)
+        self.assertTrue(analysis.is_valid)
+        self.assertEqual(analysis.pattern, FrozenPattern([4, 4, 1]))
+        self.assertEqual(analysis.period, 3)
+        self.assertEqual(analysis.num_objects, 3)
+        self.assertEqual(analysis.max_throw, 4)
+        self.assertEqual(analysis.type, 'VSS')
+        self.assertEqual(analysis.states, ((1, 1, 1), (1, 1, 0, 1), (1, 0, 1, 1)))
+        self.assertFalse(analysis.is_excited)
+
+        invalid = cache.get('443')
+        self.assertTrue(invalid.is_valid_syntax)
+        self.assertFalse(invalid.is_valid)
+        self.assertEqual(invalid.states, ())
+
+        bad_syntax = cache.get('44$')
+        self.assertFalse(bad_syntax.is_valid_syntax)
+        self.assertIsNone(bad_syntax.pattern)
+
+        passing = cache.get('<4p|3><2|3p>', 2)
+        self.assertTrue(passing.is_valid)
+        self.assertEqual(passing.num_objects, 6)
+        self.assertEqual(passing.targets, ((1, 0), (1, 0)))
+        self.assertEqual(passing.states[1], ((1, 1, 1), (1, 1, 1, 1)))
+        self.assertIsNot(passing, cache.get('<4p|3><2|3p>'))
+        self.assertRaises(ValueError, cache.get, '441', 0)
+
+    def test_interning(self):
+        cache = SiteswapCache()
+        self.assertIs(cache.get('441'), cache.get(' 4 4 1 '))
+        self.assertIn('441', cache)
+        self.assertEqual(cache.info(), CacheInfo(hits=1, misses=1, maxsize=1024, currsize=1))
+        cache.clear()
+        self.assertEqual(cache.info(), CacheInfo(hits=0, misses=0, maxsize=1024, currsize=0))
+
+    def test_eviction(self):
+        cache = SiteswapCache(maxsize=2)
+        cache.get('3')
+        cache.get('441')
+        cache.get('3')  # makes 441 the least recently used
+        cache.get('531')
+        self.assertEqual(len(cache), 2)
+        self.assertIn('3', cache)
+        self.assertNotIn('441', cache)
+        self.assertIn('531', cache)
+        self.assertEqual(cache.info(), CacheInfo(hits=1, misses=3, maxsize=2, currsize=2))
+
+        unbounded = SiteswapCache(maxsize=None)
+        for siteswap in ('3', '441', '531', '51'):
+            unbounded.get(siteswap)
+        self.assertEqual(len(unbounded), 4)
+        self.assertRaises(ValueError, SiteswapCache, -1)
@@ -0,0 +1,72 @@
+import unittest
+
+from juggling.notation.siteswap import parse_siteswap
+from juggling.pattern import Pattern, FrozenPattern
+from juggling.pattern.catalog import PatternCatalog
+from juggling.pattern.generator import generate_siteswaps
+
+
+class PatternCatalogTests(unittest.TestCase):
+    def setUp(self):
+        self.catalog = PatternCatalog([[4, 4, 1], Pattern([5, 3, 1]), FrozenPattern([9, 7, 5, 3, 1]), [5, 5, 5, 0, 0],
+                                       parse_siteswap('[54]24'), parse_siteswap('(6x,4)*'), [4, 4, 2]])
+
+    def test_add(self):
+        self.assertEqual(len(self.catalog), 7)
+        self.assertEqual(self.catalog[1], FrozenPattern([5, 3, 1]))
+        self.assertEqual(self.catalog.add([3]), 7)
+        self.assertEqual(list(self.catalog)[-1], FrozenPattern([3]))
+        self.assertRaises(ValueError, self.catalog.add, [])
+        self.assertRaises(ValueError, PatternCatalog, ngram_size=0)
+
+    def test_query_fields(self):
+        self.assertEqual(self.catalog.query(), list(range(7)))
+        self.assertEqual(self.catalog.query(num_objects=5), [2, 4, 5])
+        self.assertEqual(self.catalog.query(num_objects=[3, 5], is_valid=True), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(self.catalog.query(max_throw=range(6), is_excited=False), [0, 1, 3])
+        self.assertEqual(self.catalog.query(type='MSS'), [4])
+        self.assertEqual(self.catalog.query(type='SSS', period=4), [5])
+        self.assertEqual(self.catalog.query(is_valid=False), [6])
+        self.assertEqual(self.catalog.query(num_objects=3, type='SSS'), [])
+        self.assertEqual(self.catalog.count(num_objects=3), 4)
+        self.assertRaises(ValueError, self.catalog.query, colour='red')
+
+    def test_query_states(self):
+        self.assertEqual(self.catalog.query(state=[1, 1, 1]), [0, 1, 3])
+        self.assertEqual(self.catalog.query(state=[1, 1, 0, 1, 0]), [0])
+        self.assertEqual(self.catalog.query(state=[1, 1, 0, 0, 1]), [1, 3])
+        self.assertEqual(self.catalog.query(starting_state=[1, 1, 1, 0, 0]), [0, 1, 3])
+        self.assertEqual(self.catalog.query(starting_state=[1, 1, 0, 1]), [])
+
+    def test_query_states_rotations(self):
+        # entry and exit states are every state a pattern passes through, whichever beat it starts on
+        catalog = PatternCatalog([[4, 4, 1], [4, 1, 4], [1, 4, 4]])
+        self.assertEqual(catalog.query(state=[1, 1, 0, 1]), [0, 1, 2])
+        self.assertEqual(catalog.query(starting_state=[1, 1, 0, 1]), [1])
+        self.assertEqual(catalog.query(state=[1, 1, 0, 1, 0, 0]), [0, 1, 2])
+
+    def test_query_contains(self):
+        self.assertEqual(self.catalog.query(contains=[9, 7, 5]), [2])
+        self.assertEqual(self.catalog.query(contains=[1, 4]), [0])
+        self.assertEqual(self.catalog.query(contains=[1, 9, 7, 5, 3, 1, 9]), [2])
+        self.assertEqual(self.catalog.query(contains=[0, 5, 5, 5, 0, 0, 5]), [3])
+        self.assertEqual(self.catalog.query(contains=[3, 1, 5]), [1])
+        self.assertEqual(self.catalog.query(contains=[1, 5, 5]), [])
+        self.assertEqual(self.catalog.query(contains=[4, [5, 4]]), [4])
+        self.assertEqual(self.catalog.query(contains=[(4, 6.5)]), [5])
+        self.assertEqual(self.catalog.query(contains=[5], num_objects=3), [1, 3])
+
+    def test_matches_scan(self):
+        patterns = [Pattern(list(_)) for n in range(1, 5) for _ in generate_siteswaps(n, 7, 4)]
+        catalog = PatternCatalog(patterns, ngram_size=2)
+        for contains in ([6], [6, 4], [5, 5, 1], [4, 4, 1, 4], [7, 0, 0, 7, 0]):
+            for is_excited in (True, False):
+                expected = [i for i, p in enumerate(patterns) if p.is_excited == is_excited and any(
+                    (p.data * 3)[start:start + len(contains)] == contains for start in range(len(p.data)))]
+                self.assertEqual(catalog.query(contains=contains, is_excited=is_excited), expected)
+        for state in ([1, 1, 1], [1, 1, 0, 1], [1, 0, 1, 0, 1], [1, 1, 1, 0, 0, 0, 1]):
+            expected = [i for i, p in enumerate(patterns) if state in p.states]
+            self.assertTrue(expected)
+            self.assertEqual(catalog.query(state=state), expected)
+            starting = [i for i in expected if patterns[i].states[0] == state]
+            self.assertEqual(catalog.query(starting_state=state), starting)
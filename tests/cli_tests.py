@@ -0,0 +1,78 @@
+import errno
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+try:
+    # Python2, where io.StringIO only takes unicode
+    from StringIO import StringIO
+except ImportError:
+    # Python3
+    from io import StringIO
+
+from juggling import cli
+
+
+class CLITests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'siteswaps.txt')
+        with open(self.path, 'w') as f:
+            f.write('# siteswaps\n441\n443\n\n(6x,4)*\n$$\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_cli(self, *argv):
+        out, sys.stdout = sys.stdout, StringIO()
+        try:
+            self.assertEqual(cli.main(list(argv)), 0)
+            return sys.stdout.getvalue().splitlines()
+        finally:
+            sys.stdout = out
+
+    def test_tsv(self):
+        lines = self.run_cli('--fields', 'notation_pattern,is_valid,num_objects,states', self.path)
+        self.assertEqual(lines, [
+            'notation_pattern\tis_valid\tnum_objects\tstates',
+            '441\ttrue\t3\t[[1,1,1],[1,1,0,1],[1,0,1,1]]',
+            '443\tfalse\t3\t[]',
+            '(6x,4)*\ttrue\t5\t[[1,1,1,1,1],[1,1,1,1,0,0,1]]',
+            '$$\tfalse\tnull\tnull',
+        ])
+
+    def test_ndjson(self):
+        lines = self.run_cli('--format', 'ndjson', self.path)
+        records = [json.loads(_) for _ in lines]
+        self.assertEqual([_['notation_pattern'] for _ in records], ['441', '443', '(6x,4)*', '$$'])
+        self.assertEqual(set(records[0]), set(cli.DEFAULT_FIELDS))
+        self.assertFalse(records[0]['is_excited'])
+
+    def test_passing(self):
+        with open(self.path, 'w') as f:
+            f.write('<4p|3><2|3p>\n<4p|3>\n')
+        lines = self.run_cli('--jugglers', '2', '--fields', 'is_valid,num_objects', '--no-header', self.path)
+        self.assertEqual(lines, ['true\t6', 'false\t7'])
+
+    def test_broken_pipe(self):
+        class ClosedOutput(StringIO):
+            def write(self, text):
+                raise IOError(errno.EPIPE, 'Broken pipe')
+
+        out, err = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = ClosedOutput(), StringIO()
+        try:
+            self.assertEqual(cli.main([self.path]), 0)
+            self.assertTrue(sys.stderr.closed)
+        finally:
+            sys.stdout, sys.stderr = out, err
+
+    def test_jobs(self):
+        with open(self.path, 'w') as f:
+            f.write('\n'.join(['441', '531', '443', '(4,4)', '[54]24'] * 20))
+        serial = self.run_cli(self.path)
+        self.assertEqual(self.run_cli('--jobs', '2', '--batch-size', '3', self.path), serial)
+        self.assertEqual(len(serial), 101)
@@ -0,0 +1,60 @@
+import itertools
+import unittest
+from collections import Counter
+
+from juggling.pattern import Pattern
+from juggling.pattern import counting
+from juggling.pattern.generator import generate_siteswaps
+
+
+def brute_force(num_objects, max_throw, period):
+    return sum(1 for siteswap in itertools.product(range(max_throw + 1), repeat=period)
+               if sum(siteswap) == num_objects * period and Pattern(list(siteswap)).is_valid)
+
+
+class CountingTests(unittest.TestCase):
+    def test_mobius(self):
+        self.assertEqual([counting._mobius(_) for _ in range(1, 13)], [1, -1, -1, 0, -1, 1, -1, 0, 0, 1, -1, 0])
+
+    def test_count(self):
+        self.assertEqual(counting.count_siteswaps(3, 5, 3), 5)
+        self.assertEqual(counting.count_siteswaps(3, 5, 3, rotations=True), 15)
+        self.assertEqual(counting.count_sequences(3, 5, 3), 16)
+        self.assertEqual(counting.count_siteswaps(3, 3, 1), 1)
+        self.assertEqual(counting.count_siteswaps(3, 3, 2), 0)
+        self.assertEqual(counting.count_siteswaps(0, 3, 1), 1)
+        self.assertEqual(counting.count_siteswaps(5, 10, 20), 652169449474)
+
+    def test_matches_generator(self):
+        for num_objects, max_throw, period in [(1, 4, 4), (2, 5, 4), (3, 6, 4), (3, 5, 5), (4, 6, 3), (3, 7, 6),
+                                               (2, 6, 6)]:
+            siteswaps = list(generate_siteswaps(num_objects, max_throw, period))
+            self.assertEqual(counting.count_siteswaps(num_objects, max_throw, period), len(siteswaps))
+            self.assertEqual(counting.count_siteswaps(num_objects, max_throw, period, rotations=True),
+                             period * len(siteswaps))
+
+            starting_states = Counter(tuple(Pattern(list(_)).current_state) for _ in siteswaps)
+            by_state = counting.count_by_state(num_objects, max_throw, period)
+            self.assertEqual(sum(_.siteswaps for _ in by_state), len(siteswaps))
+            for state_count in by_state:
+                self.assertEqual(state_count.siteswaps, starting_states[tuple(state_count.state)])
+                self.assertEqual(state_count.sequences, period * state_count.siteswaps)
+
+    def test_matches_brute_force(self):
+        for num_objects, max_throw, period in [(1, 4, 4), (2, 5, 4), (3, 6, 4), (3, 5, 5), (4, 6, 3)]:
+            self.assertEqual(counting.count_sequences(num_objects, max_throw, period),
+                             brute_force(num_objects, max_throw, period))
+
+    def test_cached(self):
+        counting._TRACES.clear()
+        longer = counting.count_siteswaps(3, 6, 8)
+        cached = counting._TRACES[(3, 6)]
+        self.assertEqual(counting.count_siteswaps(3, 6, 5), len(list(generate_siteswaps(3, 6, 5))))
+        self.assertIs(counting._TRACES[(3, 6)], cached)
+        counting._TRACES.clear()
+        self.assertEqual(counting.count_siteswaps(3, 6, 8), longer)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, counting.count_siteswaps, 3, 2, 3)
+        self.assertRaises(ValueError, counting.count_siteswaps, 3, 5, 0)
+        self.assertRaises(ValueError, counting.count_by_state, -1, 5, 3)
@@ -0,0 +1,105 @@
+import itertools
+import time
+import unittest
+
+from juggling.pattern import Pattern
+from juggling.pattern import generator
+
+
+def canonical(siteswap):
+    return max(tuple(siteswap[i:] + siteswap[:i]) for i in range(len(siteswap)))
+
+
+def brute_force(num_objects, max_throw, period):
+    siteswaps = set()
+    for siteswap in itertools.product(range(max_throw + 1), repeat=period):
+        siteswap = list(siteswap)
+        if sum(siteswap) != num_objects * period:
+            continue
+        if any(siteswap == siteswap[i:] + siteswap[:i] for i in range(1, period)):
+            continue  # repeats within the period
+        if Pattern(siteswap).is_valid:
+            siteswaps.add(canonical(siteswap))
+    return siteswaps
+
+
+class GeneratorTests(unittest.TestCase):
+    def test_generate(self):
+        self.assertEqual(list(generator.generate_siteswaps(3, 5, 3)),
+                         [(4, 2, 3), (4, 4, 1), (5, 2, 2), (5, 3, 1), (4, 5, 0)])
+        self.assertEqual(list(generator.generate_siteswaps(3, 3, 1)), [(3,)])
+        self.assertEqual(list(generator.generate_siteswaps(0, 3, 1)), [(0,)])
+        self.assertEqual(list(generator.generate_siteswaps(3, 3, 2)), [])
+
+    def test_matches_brute_force(self):
+        for num_objects, max_throw, period in [(1, 4, 4), (2, 5, 4), (3, 6, 4), (3, 5, 5), (4, 6, 3)]:
+            siteswaps = list(generator.generate_siteswaps(num_objects, max_throw, period))
+            canonical_siteswaps = set(canonical(list(_)) for _ in siteswaps)
+            self.assertEqual(len(siteswaps), len(canonical_siteswaps))
+            self.assertEqual(canonical_siteswaps, brute_force(num_objects, max_throw, period))
+
+    def test_limit(self):
+        everything = list(generator.generate_siteswaps(3, 7, 5))
+        self.assertEqual(list(generator.generate_siteswaps(3, 7, 5, limit=10)), everything[:10])
+        self.assertEqual(list(generator.generate_siteswaps(3, 7, 5, limit=0)), [])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, list, generator.generate_siteswaps(3, 2, 3))
+        self.assertRaises(ValueError, list, generator.generate_siteswaps(3, 5, 0))
+
+
+class ParallelGeneratorTests(unittest.TestCase):
+    def test_shards(self):
+        shards = generator.shards_for(3, 5, 3)
+        self.assertEqual(shards[0], ([1, 1, 1], (3,)))
+        self.assertEqual(generator.shards_for(3, 5, 1)[0], ([1, 1, 1], ()))
+        self.assertEqual(len(generator.shards_for(3, 5, 1)), len(generator.states_for(3, 5)))
+
+        # every siteswap is in exactly one shard, in order
+        siteswaps = []
+        for state, prefix in generator.shards_for(3, 6, 4, prefix_length=2):
+            self.assertEqual(generator.state_to_list(generator.state_from_list(state)), state)
+            shard = generator._run_shard((3, 6, 4, (state, prefix), None))
+            self.assertTrue(all(siteswap[:len(prefix)] == prefix for siteswap in shard))
+            siteswaps += shard
+        self.assertEqual(siteswaps, list(generator.generate_siteswaps(3, 6, 4)))
+
+    def test_shard_states(self):
+        # the state of a shard is the first state of every siteswap in it, including those with zero throws
+        with_zeros = 0
+        for num_objects, max_throw, period in [(3, 6, 4), (2, 5, 5)]:
+            for shard in generator.shards_for(num_objects, max_throw, period):
+                for siteswap in generator._run_shard((num_objects, max_throw, period, shard, None)):
+                    self.assertEqual(Pattern(list(siteswap)).states[0], shard[0])
+                    with_zeros += 0 in siteswap
+        self.assertTrue(with_zeros)
+
+    def test_parallel(self):
+        self.assertEqual(list(generator.generate_siteswaps_parallel(3, 7, 5, processes=2)),
+                         list(generator.generate_siteswaps(3, 7, 5)))
+
+    def test_parallel_closed_early(self):
+        siteswaps = generator.generate_siteswaps_parallel(6, 12, 9, processes=2)
+        self.assertEqual(len(next(siteswaps)), 9)
+        start = time.time()
+        siteswaps.close()  # the shards still running are stopped rather than waited for
+        self.assertLess(time.time() - start, 1)
+
+    def test_parallel_files(self):
+        import os
+        import shutil
+        import tempfile
+
+        directory = tempfile.mkdtemp()
+        try:
+            results = generator.generate_siteswaps_parallel(3, 7, 5, processes=2, output_dir=directory)
+            siteswaps = []
+            for shard, path, count in results:
+                with open(path) as f:
+                    lines = [line.strip() for line in f]
+                self.assertEqual(len(lines), count)
+                siteswaps += [tuple(int(_, 36) for _ in line) for line in lines]
+            self.assertEqual(siteswaps, list(generator.generate_siteswaps(3, 7, 5)))
+            self.assertEqual(len(os.listdir(directory)), len(results))
+        finally:
+            shutil.rmtree(directory)
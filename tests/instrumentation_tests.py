@@ -0,0 +1,54 @@
+import logging
+import unittest
+
+from juggling import instrumentation
+from juggling.notation.siteswap import Siteswap, convert_str_to_beat_list
+from juggling.utils import cached_property
+
+
+class InstrumentationTests(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled(self):
+        Siteswap('441').pattern.states
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertEqual(instrumentation.stats(), {})
+
+    def test_cached_property_lookup(self):
+        # cache hits only go through the recording lookup while instrumentation is enabled
+        self.assertIs(cached_property.__get__, cached_property._get)
+        instrumentation.enable()
+        self.assertIs(cached_property.__get__, cached_property._get_instrumented)
+        instrumentation.disable()
+        self.assertIs(cached_property.__get__, cached_property._get)
+
+    def test_recording(self):
+        with instrumentation.recording():
+            s = Siteswap('441')
+            s.pattern.states
+            s.pattern.states
+            s.to_JSON()
+        self.assertFalse(instrumentation.is_enabled())
+
+        stats = instrumentation.stats()
+        self.assertEqual(stats['juggling.notation.siteswap.parse_siteswap'].calls, 1)
+        self.assertEqual(stats['juggling.notation.base.JugglingNotation.to_dict'].calls, 1)
+        self.assertEqual(stats['Pattern.states'][::2], (2, 1))
+        self.assertEqual(stats['Pattern.states'].misses, 1)
+        self.assertEqual(stats['Pattern._analysis'].misses, 1)
+        self.assertGreater(stats['Pattern.states'].total_time, 0)
+
+    def test_recursive_calls(self):
+        instrumentation.enable()
+        convert_str_to_beat_list('(4,2x)*')
+        stat = instrumentation.stats()['juggling.notation.siteswap.convert_str_to_beat_list']
+        self.assertGreater(stat.calls, 1)
+        self.assertGreater(stat.total_time, 0)
+
+    def test_log_stats(self):
+        with self.assertLogs('juggling', logging.DEBUG) as logs:
+            with instrumentation.recording(log_level=logging.DEBUG):
+                Siteswap('531').is_valid
+        self.assertTrue(any('Pattern.is_valid: 1 calls' in line and '0.0% hit rate' in line for line in logs.output))
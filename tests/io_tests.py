@@ -0,0 +1,97 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from juggling import io as juggling_io
+from juggling.notation.siteswap import Siteswap
+from juggling.pattern import Pattern, FrozenPattern
+
+
+SITESWAPS = ['441', '[54]24', '(6x,4)*', '(4,2)(2x,[44x])', '[33](3,3)123', '97531']
+
+
+class ReadSiteswapsTests(unittest.TestCase):
+    def test_read(self):
+        source = io.StringIO(u'# a catalogue\n441\n\n 5 3 1 \n443\n')
+        self.assertEqual([_.notation_pattern for _ in juggling_io.read_siteswaps(source)], ['441', '531', '443'])
+
+        source = io.StringIO(u'441\n443\n$$\n')
+        self.assertEqual([_.notation_pattern for _ in juggling_io.read_siteswaps(source, skip_invalid=True)],
+                         ['441'])
+
+
+class BinaryCatalogueTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'catalogue.pjp')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        siteswaps = [Siteswap(_) for _ in SITESWAPS]
+        self.assertEqual(juggling_io.write_patterns(self.path, siteswaps), len(siteswaps))
+        with juggling_io.PatternReader(self.path) as reader:
+            self.assertEqual(len(reader), len(siteswaps))
+            patterns = list(reader)
+        self.assertEqual([_.to_pattern() for _ in patterns], [_.pattern for _ in siteswaps])
+        self.assertEqual(patterns, [_.pattern.freeze() for _ in siteswaps])
+
+    def test_mixed_inputs(self):
+        with juggling_io.PatternWriter(self.path) as writer:
+            writer.write(Pattern([4, 4, 1]))
+            writer.write(FrozenPattern([5, 3, 1]))
+            writer.write([(4, 4)])
+            self.assertRaises(ValueError, writer.write, Siteswap('$$'))
+        with juggling_io.PatternReader(self.path) as reader:
+            self.assertEqual([list(_) for _ in reader], [[4, 4, 1], [5, 3, 1], [(4, 4)]])
+
+    def test_stream(self):
+        stream = io.BytesIO()
+        juggling_io.write_patterns(stream, [Pattern([3])])
+        with open(self.path, 'wb') as f:
+            f.write(stream.getvalue())
+        with juggling_io.PatternReader(self.path) as reader:
+            self.assertEqual(list(reader), [FrozenPattern([3])])
+
+    def test_siteswaps(self):
+        juggling_io.write_patterns(self.path, [Siteswap('(6X, 4)*'), Siteswap('531'), Pattern([[5, 4], 2, 4])])
+        with juggling_io.PatternReader(self.path) as reader:
+            siteswaps = list(reader.siteswaps())
+        self.assertEqual([_.notation_pattern for _ in siteswaps], ['(6X,4)*', '531', '[54]24'])
+        self.assertEqual([_.pattern for _ in siteswaps], [Siteswap(_).pattern for _ in ['(6x,4)*', '531', '[54]24']])
+        self.assertTrue(all(_.is_valid for _ in siteswaps))
+
+    def test_truncated(self):
+        juggling_io.write_patterns(self.path, [Siteswap('441'), Siteswap('97531')])
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        for end in (len(data) - 1, len(data) - 10, len(data) - 16):
+            with open(self.path, 'wb') as f:
+                f.write(data[:end])
+            with juggling_io.PatternReader(self.path) as reader:
+                self.assertRaises(ValueError, list, reader)
+            with juggling_io.PatternReader(self.path, stop_on_truncated=True) as reader:
+                self.assertEqual(list(reader), [FrozenPattern([4, 4, 1])])
+
+    def test_unseekable(self):
+        read, write = os.pipe()
+        with os.fdopen(write, 'wb') as f:
+            juggling_io.write_patterns(f, [Pattern([3])])
+        with os.fdopen(read, 'rb') as f:
+            data = f.read()
+        self.assertEqual(juggling_io.HEADER.unpack_from(data, 0), (juggling_io.MAGIC, juggling_io.VERSION, 0))
+        with open(self.path, 'wb') as f:
+            f.write(data)
+        with juggling_io.PatternReader(self.path) as reader:
+            self.assertEqual(list(reader), [FrozenPattern([3])])
+
+    def test_not_a_catalogue(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'441\n531\n97531\n')
+        self.assertRaises(ValueError, juggling_io.PatternReader, self.path)
+        with open(self.path, 'wb') as f:
+            f.write(juggling_io.HEADER.pack(juggling_io.MAGIC, juggling_io.VERSION + 1, 0))
+        self.assertRaises(ValueError, juggling_io.PatternReader, self.path)
@@ -0,0 +1,64 @@
+import unittest
+
+from juggling.notation.siteswap import Siteswap
+from juggling.pattern import Pattern
+from juggling.pattern.passing import PassingPattern, analyse_passing
+
+
+class PassingPatternTests(unittest.TestCase):
+    def test_validity(self):
+        for pattern, num_jugglers, valid in [
+            ('<3p|3p>', 2, True),
+            ('<4p|3><2|3p>', 2, True),
+            ('<4p|3>', 2, False),
+            ('<3p2|3p3|3p1>', 3, True),
+            ('<3p2|3p2|3p1>', 3, False),
+            ('<(4p,4)*|(4p,4)*>', 2, True),
+            ('<5p|3><3|5p><1|1>', 2, False),
+        ]:
+            self.assertEqual(Siteswap(pattern, num_jugglers=num_jugglers).is_valid, valid, pattern)
+
+    def test_analysis(self):
+        p = PassingPattern([[4, 2], [3, 3]], [[1, 0], [1, 0]])
+        self.assertEqual(p.period, 2)
+        self.assertEqual(p.num_objects, 6)
+        self.assertEqual(p.max_throw, 4)
+        self.assertEqual(p.incoming, [[1, 1], [1, 1]])
+        self.assertEqual(p.incoming, p.outgoing)
+        self.assertEqual(p.throws_with_targets(1), [(0, 3, 1), (1, 3, 0)])
+
+    def test_different_periods(self):
+        # a juggler doing a synchronous beat takes two beats for every beat of the other juggler
+        p = PassingPattern([Pattern([(4, 4)]), Pattern([4])], [[0, 0], [1]])
+        self.assertEqual(p.period, 2)
+        self.assertTrue(p.is_valid)
+        self.assertEqual(p.num_objects, 8)
+        self.assertEqual(len(analyse_passing(p.data, p.targets).throws_with_targets[1]), 2)
+
+    def test_states(self):
+        p = Siteswap('<4p|3><2|3p>', num_jugglers=2).pattern
+        self.assertEqual(p.states, [([1, 1, 1], [1, 1]), ([1, 1, 1], [1, 1, 1, 1])])
+        self.assertEqual(p.current_state, [[1, 1, 1], [1, 1, 1]])
+        self.assertFalse(p.is_excited)
+        # every juggler's states add up to the number of objects on every beat
+        for beat in range(p.period):
+            self.assertEqual(sum(sum(_[beat]) for _ in p.states), p.num_objects)
+
+        excited = Siteswap('<5p|5p><1|1>', num_jugglers=2).pattern
+        self.assertTrue(excited.is_valid)
+        self.assertTrue(excited.is_excited)
+        self.assertEqual(excited.current_state, [[1, 1, 0, 1], [1, 1, 0, 1]])
+        self.assertEqual(Siteswap('<4p|3>', num_jugglers=2).pattern.states, [])
+
+    def test_many_jugglers(self):
+        num_jugglers = 20
+        sections = '|'.join('3p{}'.format((_ + 1) % num_jugglers + 1) for _ in range(num_jugglers))
+        p = Siteswap('<{}>'.format(sections) * 10, num_jugglers=num_jugglers).pattern
+        self.assertTrue(p.is_valid)
+        self.assertEqual(p.num_objects, 3 * num_jugglers)
+        self.assertFalse(p.is_excited)
+
+    def test_invalid_targets(self):
+        self.assertRaises(ValueError, PassingPattern, [[3]], [[0]])
+        self.assertRaises(ValueError, PassingPattern, [[3], [3]], [[0], []])
+        self.assertRaises(ValueError, PassingPattern, [[3], [3]], [[0], [2]])
@@ -1,6 +1,7 @@
 import unittest
 
-from juggling.pattern import Pattern
+from juggling.pattern import (Pattern, FrozenPattern, analyse_pattern, canonical_offset, canonical_rotation,
+                              flatten_pattern_list)
 
 
 class PatternTests(unittest.TestCase):
@@ -11,3 +12,206 @@ class PatternTests(unittest.TestCase):
         self.assertFalse(pattern.is_asymmetric)
         self.assertEqual(pattern.period, 3)
         self.assertEqual(pattern.num_objects, 3)
+
+    def test_mutation_clears_cache(self):
+        pattern = Pattern([4, 4, 1])
+        self.assertEqual(pattern.period, 3)
+        self.assertTrue(pattern.is_valid)
+
+        pattern.append(3)
+        self.assertEqual(pattern.period, 4)
+        self.assertTrue(pattern.is_valid)
+
+        pattern[3] = 5
+        self.assertFalse(pattern.is_valid)
+
+        pattern.pop()
+        self.assertEqual(pattern.period, 3)
+        self.assertTrue(pattern.is_valid)
+
+        pattern.insert(0, 5)
+        pattern.extend([3, 1])
+        self.assertEqual(pattern.period, 6)
+        self.assertEqual(pattern.num_objects, 3)
+
+        del pattern[0]
+        self.assertEqual(pattern.period, 5)
+
+
+class FrozenPatternTests(unittest.TestCase):
+    patterns = [
+        [4, 4, 1],
+        [[5, 4], 2, 4],
+        [[4], [4], 1],
+        [(6.5, 4), (4, 6.5)],
+        [(4, 2), (2.5, [4, 4.5])],
+        [[3, 3], (3, 3), 1, 2, 3],
+    ]
+
+    def test_round_trip(self):
+        for data in self.patterns:
+            frozen = Pattern(data).freeze()
+            self.assertEqual(len(frozen), len(data))
+            self.assertEqual(list(frozen), data)
+            self.assertEqual(frozen.to_pattern(), data)
+            self.assertEqual(frozen[-1], data[-1])
+            self.assertEqual(frozen[1:], data[1:])
+
+    def test_hashable(self):
+        frozen = set(FrozenPattern(data) for data in self.patterns + self.patterns)
+        self.assertEqual(len(frozen), len(self.patterns))
+        self.assertIn(FrozenPattern([4, 4, 1]), frozen)
+        self.assertNotEqual(FrozenPattern([[4], [4], 1]), FrozenPattern([4, 4, 1]))
+        self.assertLess(FrozenPattern([4, 4, 1]), FrozenPattern([5, 3, 1]))
+
+    def test_immutable(self):
+        import pickle
+        frozen = FrozenPattern([4, 4, 1])
+        self.assertRaises(AttributeError, setattr, frozen, 'throws', [])
+        self.assertEqual(pickle.loads(pickle.dumps(frozen)), frozen)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, FrozenPattern, [4.25])
+        self.assertRaises(ValueError, FrozenPattern, [(4, 4, 4)])
+        self.assertRaises(ValueError, FrozenPattern, [[]])
+
+
+class PatternAnalysisTests(unittest.TestCase):
+    def test_analysis(self):
+        analysis = analyse_pattern([(6.5, 4), (4, 6.5)])
+        self.assertEqual(analysis.type, 'SSS')
+        self.assertEqual(analysis.period, 4)
+        self.assertEqual(analysis.throws_with_beats, [(0, 7), (1, 4), (2, 4), (3, 5)])
+        self.assertEqual(analysis.throw_destinations, [3, 1, 2, 0])
+        self.assertEqual(analysis.incoming, [1, 1, 1, 1])
+        self.assertEqual(analysis.outgoing, [1, 1, 1, 1])
+        self.assertEqual(analysis.num_objects, 5)
+        self.assertEqual(analysis.max_throw, 6)
+        self.assertTrue(analysis.is_valid)
+
+        analysis = analyse_pattern([[4, 3], 3, 2])
+        self.assertEqual(analysis.type, 'MSS')
+        self.assertEqual(analysis.incoming, [1, 3, 0])
+        self.assertEqual(analysis.outgoing, [2, 1, 1])
+        self.assertFalse(analysis.is_valid)
+
+    def test_docstring_examples(self):
+        # the examples in the docstring are checked so that they can't drift from what analyse_pattern returns
+        examples = [line.strip()[4:] for line in analyse_pattern.__doc__.splitlines() if line.strip().startswith('>>>')]
+        self.assertEqual(len(examples), 2)
+        for example in examples:
+            self.assertTrue(eval(example, {'analyse_pattern': analyse_pattern}), example)
+
+    def test_long_pattern(self):
+        pattern = Pattern([9, 7, 5, 3, 1] * 200)
+        self.assertEqual(pattern.period, 1000)
+        self.assertTrue(pattern.is_valid)
+        self.assertEqual(pattern.num_objects, 5)
+        self.assertEqual(pattern.max_throw, 9)
+        self.assertEqual(pattern.throws_with_beats, flatten_pattern_list(pattern.converted_to_mss))
+
+
+class CanonicalRotationTests(unittest.TestCase):
+    def test_canonical_rotation(self):
+        for rotation in ([4, 4, 1], [4, 1, 4], [1, 4, 4]):
+            self.assertEqual(canonical_rotation(rotation), [4, 4, 1])
+            self.assertEqual(Pattern(rotation).canonical_rotation, [4, 4, 1])
+        self.assertEqual(canonical_rotation([5, 1, 5, 1]), [5, 1, 5, 1])
+        self.assertEqual(canonical_offset([1, 5, 1, 5]), 1)
+        self.assertEqual(canonical_rotation([2, [4, 3], 3]), [[4, 3], 3, 2])
+        self.assertEqual(canonical_rotation([]), [])
+
+    def test_sync_rotation(self):
+        pattern = Pattern([(4, 2.5), (2.5, 4), (4, 4)])
+        self.assertEqual(pattern.canonical_rotation, pattern.starting_with(2))
+        self.assertTrue(pattern.is_rotation_of([(2.5, 4), (4, 4), (4, 2.5)]))
+
+    def test_rotation_hash(self):
+        patterns = [Pattern(_) for _ in ([4, 4, 1], [1, 4, 4], [4, 1, 4], [5, 3, 1], [[4, 4], 1, 4], [4, [4, 4], 1])]
+        self.assertEqual(len(set(_.canonical_key for _ in patterns)), 3)
+        self.assertEqual(patterns[0].rotation_hash, patterns[1].rotation_hash)
+        self.assertTrue(patterns[0].is_rotation_of(patterns[2]))
+        self.assertFalse(patterns[0].is_rotation_of(patterns[3]))
+        self.assertFalse(Pattern([3]).is_rotation_of([3, 3]))
+        self.assertFalse(patterns[0].is_rotation_of(patterns[4]))
+        # multiplex and sync beats never match plain throws
+        self.assertNotEqual(Pattern([[3]]).canonical_key, Pattern([3]).canonical_key)
+        self.assertNotEqual(Pattern([(4, 4)]).canonical_key, Pattern([[4, 4]]).canonical_key)
+
+
+class PatternEditTests(unittest.TestCase):
+    PROPERTIES = ['is_valid', 'incoming', 'outgoing', 'num_objects', 'max_throw', 'states', 'throw_destinations',
+                  'period', 'is_excited']
+
+    def assertMatchesFresh(self, pattern, properties=PROPERTIES):
+        fresh = Pattern(list(pattern.data))
+        for name in properties:
+            self.assertEqual(getattr(pattern, name), getattr(fresh, name), name)
+
+    def test_edit_in_place(self):
+        pattern = Pattern([5, 3, 1])
+        self.assertTrue(pattern.is_valid)
+        analysis = pattern._analysis
+        states = pattern.states
+
+        pattern[0] = 4
+        self.assertIs(pattern._analysis, analysis)
+        self.assertFalse(pattern.is_valid)
+        self.assertEqual(pattern.states, [])
+        self.assertMatchesFresh(pattern)
+
+        pattern[1] = 4
+        self.assertIs(pattern._analysis, analysis)
+        self.assertTrue(pattern.is_valid)
+        self.assertEqual(pattern.states, Pattern([4, 4, 1]).states)
+        self.assertEqual(states, Pattern([5, 3, 1]).states)  # states handed out before are unchanged
+        self.assertMatchesFresh(pattern)
+
+        pattern[-3:] = [9, 7, 5, 3, 1][:3]
+        self.assertIs(pattern._analysis, analysis)
+        self.assertMatchesFresh(pattern)
+
+        pattern[0:2] = [1, 1]
+        self.assertEqual(pattern.max_throw, 5)
+        self.assertMatchesFresh(pattern)
+
+    def test_edit_states(self):
+        pattern = Pattern([3] * 10)
+        states = pattern.states
+        pattern[0:2] = [4, 2]
+        self.assertEqual(pattern.states, Pattern([4, 2] + [3] * 8).states)
+        self.assertEqual(states, Pattern([3] * 10).states)
+        # only the states of the beats the old and new throws are in the air for are replaced
+        self.assertEqual([beat for beat in range(10) if pattern.states[beat] is not states[beat]], [1, 2, 3, 4])
+
+    def test_edit_crossing_throws(self):
+        pattern = Pattern([4, 3.5, 1])
+        analysis = pattern._analysis
+        self.assertFalse(analysis.integer_throws)
+        pattern[0] = 2
+        self.assertIsNot(pattern._analysis, analysis)
+        self.assertEqual(pattern.data, [2, 3.5, 1])
+        # the states of crossing throws outside of a sync beat aren't worked out
+        self.assertMatchesFresh(pattern, [_ for _ in self.PROPERTIES if _ not in ('states', 'is_excited')])
+
+        pattern[1] = 3
+        self.assertTrue(pattern._analysis.integer_throws)
+        self.assertMatchesFresh(pattern)
+
+    def test_edit_recomputes(self):
+        pattern = Pattern([5, 3, 1])
+        analysis = pattern._analysis
+        pattern.append(3)
+        self.assertIsNot(pattern._analysis, analysis)
+        self.assertMatchesFresh(pattern)
+
+        analysis = pattern._analysis
+        pattern[0] = [5, 1]
+        self.assertIsNot(pattern._analysis, analysis)
+        self.assertMatchesFresh(pattern)
+
+        pattern = Pattern([(4, 4)])
+        analysis = pattern._analysis
+        pattern[0] = (6.5, 2)
+        self.assertIsNot(pattern._analysis, analysis)
+        self.assertMatchesFresh(pattern)
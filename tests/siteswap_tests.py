@@ -1,6 +1,12 @@
+import io
+import json
+import random
+import re
 import unittest
 
-from juggling.notation import siteswap
+from juggling.notation import siteswap, dump_many
+from juggling.pattern import Pattern
+from juggling.pattern.generator import generate_siteswaps
 
 
 class SiteswapUtilsTests(unittest.TestCase):
@@ -73,3 +79,252 @@ class SiteSwapSyntaxValidationTests(unittest.TestCase):
         ]
         for pattern in solo_patterns:
             self.assertFalse(siteswap.is_valid_siteswap_syntax(pattern))
+
+
+class SiteswapParseTests(unittest.TestCase):
+    def test_parse_matches_convert(self):
+        patterns = [
+            '441',
+            '(6x,4)(4,6x)',
+            '(6x,4)*',
+            '[64]020',
+            '[33](3,3)123',
+            '(4,2)(2x,[44x])',
+            '9 7 5 3 1',
+            'DB97531',
+        ]
+        for pattern in patterns:
+            self.assertEqual(siteswap.parse_siteswap(pattern), siteswap.convert_str_to_beat_list(pattern))
+
+    def test_parse_multiplex_crossing(self):
+        self.assertEqual(siteswap.parse_siteswap('[44x]4'), [[4, 4.5], 4])
+
+    def test_parse_invalid(self):
+        invalid = [
+            ('', 0),
+            ('#!j', 0),
+            ('((3232,3)', 1),
+            ('(3232,3))', 2),
+            ('[(3232,3)])', 1),
+            ('[]', 1),
+            ('44 1 $', 5),
+            ('(4,4', 4),
+        ]
+        for pattern, position in invalid:
+            self.assertFalse(siteswap.is_valid_siteswap_syntax(pattern))
+            with self.assertRaises(siteswap.SiteswapSyntaxError) as context:
+                siteswap.parse_siteswap(pattern)
+            self.assertEqual(context.exception.position, position)
+            self.assertEqual(context.exception.notation, pattern)
+
+    def test_siteswap_syntax(self):
+        self.assertTrue(siteswap.Siteswap('441').is_valid_syntax)
+        self.assertEqual(siteswap.Siteswap('4 4 1').pattern, [4, 4, 1])
+        invalid = siteswap.Siteswap('44$')
+        self.assertFalse(invalid.is_valid_syntax)
+        self.assertIsNone(invalid.pattern)
+
+    def test_siteswap_lazy(self):
+        s = siteswap.Siteswap('(6x,4)*')
+        self.assertFalse(s._parsed)
+        self.assertEqual(s.period, 4)
+        self.assertTrue(s.is_valid_syntax)
+        self.assertNotIn('_analysis', s.pattern._cache)
+        self.assertTrue(s.is_valid)
+
+    def test_siteswap_raise_invalid(self):
+        self.assertTrue(siteswap.Siteswap('441', raise_invalid=True).is_valid)
+        self.assertRaises(ValueError, siteswap.Siteswap, '443', raise_invalid=True)
+        self.assertRaises(ValueError, siteswap.Siteswap, '44$', raise_invalid=True)
+
+
+class PassingSiteswapParseTests(unittest.TestCase):
+    def test_passing_grammar(self):
+        self.assertIs(siteswap.passing_grammar(3), siteswap.passing_grammar(3))
+        self.assertRaises(ValueError, siteswap.passing_grammar, 1)
+        self.assertTrue(siteswap.is_valid_siteswap_syntax('<3p12|3|3|3|3|3|3|3|3|3|3|3p1>', 12))
+        self.assertFalse(siteswap.is_valid_siteswap_syntax('<3p13|3|3|3|3|3|3|3|3|3|3|3p1>', 12))
+        self.assertFalse(siteswap.is_valid_siteswap_syntax('<3p|3p|3>', 2))
+        self.assertFalse(siteswap.is_valid_siteswap_syntax('<3p|3p>', 3))
+
+    def test_parse_passing(self):
+        self.assertEqual(siteswap.parse_passing_siteswap('<4p|3><2|3p>', 2), ([[4, 2], [3, 3]], [[1, 0], [1, 0]]))
+        self.assertEqual(siteswap.parse_passing_siteswap('<(2p3,4x)|(2xp3,4p1)|(2xp2,4xp2)>', 3),
+                         ([[(2, 4.5)], [(2.5, 4)], [(2.5, 4.5)]], [[2, 0], [2, 0], [1, 1]]))
+        self.assertEqual(siteswap.parse_passing_siteswap('<(4p,4)*|3>', 2),
+                         ([[(4, 4), (4, 4)], [3]], [[1, 0, 0, 1], [1]]))
+        self.assertEqual(siteswap.parse_passing_siteswap('<[3p3]|3>', 2), ([[[3, 3]], [3]], [[1, 0], [1]]))
+        # the longest juggler number in range
+        self.assertEqual(siteswap.parse_passing_siteswap('<3p12|3|3|3|3|3|3|3|3|3|3|[3p13]>', 12)[1][::11],
+                         [[11], [0, 11]])
+
+    def test_parse_passing_invalid(self):
+        for pattern, num_jugglers, position in [('', 2, 0), ('<3|3', 2, 4), ('<3|3|3>', 2, 4), ('3', 2, 0),
+                                                ('<3p|3> <3|$>', 2, 10), ('<[3p4]|3|3>', 3, 4),
+                                                ('<3p|3|3>', 3, 3), ('<3p0|3|3>', 3, 3), ('<p|3>', 2, 1),
+                                                ('<(4,[3p])|3>', 2, 6), ('<3p1x|3|3>', 3, 4)]:
+            self.assertFalse(siteswap.is_valid_siteswap_syntax(pattern, num_jugglers))
+            with self.assertRaises(siteswap.SiteswapSyntaxError) as context:
+                siteswap.parse_passing_siteswap(pattern, num_jugglers)
+            self.assertEqual(context.exception.position, position)
+
+    def test_parse_passing_differential(self):
+        # random siteswaps, mostly malformed, checked against the regex grammar and the old regex-based conversion
+        rng = random.Random(17)
+        pieces = ['3', '4', '1', '2', '0', 'a', 'p', 'P', 'x', '(', ',', ')', '*', '[', ']', '|', '<', '>']
+        for num_jugglers in (2, 3, 12):
+            targets = '|'.join(str(_) for _ in range(num_jugglers, 0, -1))
+            for _ in range(3000):
+                sections = []
+                for juggler in range(num_jugglers):
+                    sections.append(''.join(rng.choice(pieces) for _ in range(rng.randint(1, 5))))
+                pattern = '<' + '|'.join(sections) + '>'
+                if rng.random() < 0.1:
+                    pattern = pattern.replace('|', '', 1)
+                valid = siteswap.is_valid_siteswap_syntax(pattern, num_jugglers)
+                try:
+                    beats, throw_targets = siteswap.parse_passing_siteswap(pattern, num_jugglers)
+                except siteswap.SiteswapSyntaxError:
+                    self.assertFalse(valid, pattern)
+                    continue
+                self.assertTrue(valid, pattern)
+                for juggler, section in enumerate(sections):
+                    if num_jugglers == 2:
+                        passes = [2 - juggler if _ else None for _ in re.findall(r'[0-9a-z]x?(p?)', section, re.I)]
+                        section = re.sub('p', '', section, flags=re.I)
+                    else:
+                        passes = re.findall(r'[0-9a-z]x?(?:p({}))?'.format(targets), section, re.I)
+                        section = re.sub('p({})'.format(targets), '', section, flags=re.I)
+                    self.assertEqual(beats[juggler], siteswap.convert_str_to_beat_list(section), pattern)
+                    if not any(isinstance(_, tuple) for _ in beats[juggler]):
+                        self.assertEqual(throw_targets[juggler], [int(_) - 1 if _ else juggler for _ in passes],
+                                         pattern)
+
+    def test_parse_passing_old_grammar(self):
+        # the grammar before passing siteswaps were scanned, where a 'p' without a juggler number was a throw of 25
+        old_grammar = re.compile(r'^(<({beat})(\|{beat})+>)+$'.format(
+            beat=r'(([0-9a-z]x?(p[1-3])?)|\[([0-9a-z]x?(p[1-3])?)+\]|(\((([0-9a-z]x?(p[1-3])?)|\[([0-9a-z]x?)+\]),'
+                 r'(([0-9a-z]x?(p[1-3])?)|\[([0-9a-z]x?)+\])\))\*?)'), re.IGNORECASE)
+        for pattern in ['<3p2|3p1|3>', '<(4p3,2)*|[33p1]|3>', '<[3p12]|3|3>', '<3xp1|3p3|3>']:
+            self.assertTrue(old_grammar.match(pattern))
+            self.assertTrue(siteswap.is_valid_siteswap_syntax(pattern, 3), pattern)
+            siteswap.parse_passing_siteswap(pattern, 3)
+        for pattern in ['<p|3|3>', '<[3p]|3|3>', '<[3p4]|3|3>', '<(4,[3p])*|3|3>']:
+            self.assertTrue(old_grammar.match(pattern))
+            self.assertFalse(siteswap.is_valid_siteswap_syntax(pattern, 3), pattern)
+            self.assertRaises(siteswap.SiteswapSyntaxError, siteswap.parse_passing_siteswap, pattern, 3)
+
+    def test_siteswap_passing(self):
+        s = siteswap.Siteswap('<4p|3><2|3p>', num_jugglers=2)
+        self.assertTrue(s.is_valid_syntax)
+        self.assertEqual(s.pattern.data, [[4, 2], [3, 3]])
+        self.assertEqual(s.pattern.throws_with_targets(1), [(0, 3, 1), (1, 3, 0)])
+        self.assertEqual(s.period, 2)
+        self.assertTrue(s.is_valid)
+        self.assertEqual(siteswap.Siteswap.from_JSON(s.to_JSON()).pattern, s.pattern)
+
+        self.assertFalse(siteswap.Siteswap('441', num_jugglers=2).is_valid_syntax)
+        self.assertRaises(ValueError, siteswap.Siteswap, '441', num_jugglers=0)
+
+
+class SiteswapParseManyTests(unittest.TestCase):
+    def test_parse_many(self):
+        patterns = ['441', '443', '(4,4)', '$$', '[54]24', '(6x,4)*']
+        batch = siteswap.parse_many(patterns)
+        self.assertEqual(len(batch), len(patterns))
+        self.assertEqual(list(batch.valid_syntax), [1, 1, 1, 0, 1, 1])
+        self.assertEqual(list(batch.offsets), [0, 3, 6, 8, 8, 12, 16])
+
+        for i, pattern in enumerate(patterns):
+            s = siteswap.Siteswap(pattern)
+            self.assertEqual(bool(batch.valid[i]), s.is_valid)
+            if s.is_valid_syntax:
+                self.assertEqual(batch.periods[i], s.period)
+                self.assertEqual(batch.num_objects[i], s.pattern.num_objects)
+                self.assertEqual(batch.throws_with_beats(i), s.pattern.throws_with_beats)
+            else:
+                self.assertEqual(batch.periods[i], 0)
+                self.assertEqual(batch.throws_with_beats(i), [])
+
+    def test_parse_many_jugglers(self):
+        self.assertRaises(ValueError, siteswap.parse_many, ['441'], 0)
+
+        batch = siteswap.parse_many(['<4p|3><2|3p>', '<4p|3>', '441'], 2)
+        self.assertEqual(list(batch.valid_syntax), [1, 1, 0])
+        self.assertEqual(list(batch.valid), [1, 0, 0])
+        self.assertEqual(list(batch.periods), [2, 1, 0])
+        self.assertEqual(list(batch.num_objects), [6, 7, 0])
+        self.assertEqual(batch.throws_with_targets(0), [(0, 0, 4, 1), (0, 1, 2, 0), (1, 0, 3, 1), (1, 1, 3, 0)])
+
+
+class SiteswapFormatTests(unittest.TestCase):
+    def test_format_siteswap(self):
+        self.assertEqual(siteswap.format_siteswap([4, 4, 1]), '441')
+        self.assertEqual(siteswap.format_siteswap([35, 0.5]), 'z0x')
+        self.assertEqual(siteswap.format_siteswap([[6, 4], 0, 2, 0]), '[64]020')
+        self.assertEqual(siteswap.format_siteswap([(4, 4), (4, 4)]), '(4,4)(4,4)')
+        self.assertEqual(siteswap.format_siteswap([(6.5, 4), (4, 6.5)]), '(6x,4)*')
+        self.assertEqual(siteswap.format_siteswap([(4, 2.5), (2.5, 4), ([4, 4.5], 2), (2, [4, 4.5])]),
+                         '(4,2x)*([44x],2)*')
+        self.assertEqual(siteswap.format_siteswap([(6, 4.5), (4.5, 2)]), '(6,4x)(4x,2)')
+        self.assertEqual(siteswap.format_siteswap([]), '')
+        self.assertEqual(Pattern([5, 3, 1]).to_siteswap(), '531')
+        self.assertRaises(ValueError, siteswap.format_siteswap, [36])
+        self.assertRaises(ValueError, siteswap.format_siteswap, [(4, 36)])
+
+    def test_round_trip(self):
+        for notation in ['441', '[54]24', '[64]020', '(4,4)', '(6x,4)*', '(4,2x)*', '(4,2x)(2x,4)(4,4)',
+                         '([44x],2)*', '(4,2)(2x,[44x])', 'b97531', '0']:
+            self.assertEqual(siteswap.parse_siteswap(siteswap.format_siteswap(siteswap.parse_siteswap(notation))),
+                             siteswap.parse_siteswap(notation))
+        self.assertEqual(siteswap.format_siteswap(siteswap.parse_siteswap('(6X,4)*')), '(6x,4)*')
+        self.assertEqual(siteswap.format_siteswap(siteswap.parse_siteswap('(4,2x)(2x,4)')), '(4,2x)*')
+
+    def test_format_many(self):
+        self.assertEqual(siteswap.format_many([(4, 4, 1), [5, 3, 1], Pattern([[5, 4], 2, 4])]),
+                         ['441', '531', '[54]24'])
+        generated = list(generate_siteswaps(3, 5, 5))
+        self.assertEqual([tuple(siteswap.parse_siteswap(_)) for _ in siteswap.format_many(generated)], generated)
+
+
+class SiteswapJSONTests(unittest.TestCase):
+    def test_to_json(self):
+        data = json.loads(siteswap.Siteswap('441').to_JSON())
+        self.assertEqual(data, {'is_valid': True, 'is_valid_syntax': True, 'notation_pattern': '441',
+                                'pattern': [4, 4, 1], 'period': 3, 'num_jugglers': 1, 'targets': None})
+
+        data = json.loads(siteswap.Siteswap('$$').to_JSON())
+        self.assertEqual(data, {'is_valid': False, 'is_valid_syntax': False, 'notation_pattern': '$$',
+                                'pattern': None, 'period': None, 'num_jugglers': 1, 'targets': None})
+
+        data = json.loads(siteswap.Siteswap('<4p|3><2|3p>', num_jugglers=2).to_JSON())
+        self.assertEqual((data['pattern'], data['targets']), ([[4, 2], [3, 3]], [[1, 0], [1, 0]]))
+
+    def test_to_json_fields(self):
+        s = siteswap.Siteswap('(4,2x)*')
+        self.assertEqual(s.to_JSON(['notation_pattern', 'num_objects', 'states'], compact=True),
+                         '{"notation_pattern":"(4,2x)*","num_objects":3,"states":[[1,1,0,1],[1,0,1,1]]}')
+        self.assertNotIn('\n', s.to_JSON(compact=True))
+        self.assertRaises(ValueError, s.to_JSON, ['ground_states'])
+
+    def test_from_json(self):
+        for pattern in ['441', '[54]24', '(6x,4)*', '$$']:
+            s = siteswap.Siteswap(pattern)
+            loaded = siteswap.Siteswap.from_JSON(s.to_JSON())
+            self.assertEqual(loaded.notation_pattern, s.notation_pattern)
+            self.assertEqual(loaded.pattern, s.pattern)
+        self.assertRaises(ValueError, siteswap.Siteswap.from_JSON, '{"pattern": [3]}')
+
+        s = siteswap.Siteswap('<4p|3><2|3p>', num_jugglers=2)
+        loaded = siteswap.Siteswap.from_JSON(s.to_JSON())
+        self.assertEqual(loaded.pattern, s.pattern)
+        self.assertEqual(loaded.to_JSON(), s.to_JSON())
+
+    def test_dump_many(self):
+        stream = io.StringIO()
+        notations = [siteswap.Siteswap(_) for _ in ['441', '531']]
+        self.assertEqual(dump_many(notations, stream, ['notation_pattern', 'is_valid']), 2)
+        self.assertEqual(stream.getvalue(), '{"is_valid":true,"notation_pattern":"441"}\n'
+                                            '{"is_valid":true,"notation_pattern":"531"}\n')
+        loaded = [siteswap.Siteswap.from_JSON(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([_.pattern for _ in loaded], [_.pattern for _ in notations])
@@ -0,0 +1,72 @@
+import unittest
+
+from juggling.pattern import Pattern, generate_state
+from juggling.pattern import state
+
+
+class StateTests(unittest.TestCase):
+    def test_throw(self):
+        self.assertEqual(state.throw(0b111, 4), 0b1011)
+        self.assertEqual(state.throw(0b1011, 4), 0b1101)
+        self.assertEqual(state.throw(0b1101, 1), 0b111)
+        self.assertEqual(state.throw(0b110, 0), 0b11)
+
+        self.assertRaises(ValueError, state.throw, 0b111, 2)
+        self.assertRaises(ValueError, state.throw, 0b111, 0)
+        self.assertRaises(ValueError, state.throw, 0b110, 3)
+
+    def test_multiplex_throw(self):
+        current = state.multiplex_state_from_list([2, 1])
+        self.assertEqual(state.multiplex_state_to_list(state.multiplex_throw(current, [3, 2])), [1, 1, 1])
+        self.assertEqual(state.multiplex_state_to_list(state.multiplex_throw(current, [2, 2])), [1, 2])
+        self.assertRaises(ValueError, state.multiplex_throw, current, [3])
+
+    def test_conversions(self):
+        self.assertEqual(state.state_to_list(0b1011), [1, 1, 0, 1])
+        self.assertEqual(state.state_from_list([1, 1, 0, 1]), 0b1011)
+        self.assertRaises(ValueError, state.state_from_list, [2, 1])
+        self.assertEqual(state.multiplex_state_to_list(state.multiplex_state_from_list([2, 0, 1])), [2, 0, 1])
+        self.assertEqual(state.multiplex_state_to_list(0), [])
+
+    def test_pattern_states(self):
+        self.assertEqual(Pattern([4, 4, 1]).states, ([1, 1, 1], [1, 1, 0, 1], [1, 0, 1, 1]))
+        self.assertEqual(Pattern([5, 0, 1]).states, ([1, 0, 1], [0, 1, 0, 0, 1], [1, 0, 0, 1]))
+        self.assertEqual(Pattern([[5, 4], 2, 4]).states[0], [2, 1, 1, 1])
+        self.assertEqual(Pattern([(6.5, 4), (4, 6.5)]).states, ([1, 1, 1, 1, 1], [1, 1, 1, 1, 0, 0, 1]))
+        self.assertEqual(Pattern([4, 4, 1]).states[1], generate_state(Pattern([4, 4, 1]), 1))
+        self.assertEqual(generate_state(Pattern([4, 4, 2]), 0), [])
+
+
+class StateGraphTests(unittest.TestCase):
+    def test_graph(self):
+        graph = state.StateGraph(3, 5)
+        self.assertEqual(len(graph), 10)
+        self.assertIn([1, 1, 1], graph)
+        self.assertIn(0b11001, graph)
+        self.assertNotIn([1, 1, 1, 1], graph)
+        self.assertEqual(graph.adjacency[graph.index[0b111]], [(3, graph.index[0b111]), (4, graph.index[0b1011]),
+                                                               (5, graph.index[0b10011])])
+        self.assertRaises(ValueError, state.StateGraph, 4, 3)
+
+    def test_shortest_transition(self):
+        graph = state.StateGraph(3, 5)
+        self.assertEqual(graph.shortest_transition([1, 1, 1], [1, 1, 1]), [])
+        self.assertEqual(graph.shortest_transition([1, 1, 1], [1, 1, 0, 1]), [4])
+        self.assertEqual(graph.shortest_transition([1, 1, 0, 1], [1, 1, 1]), [2])
+        self.assertEqual(graph.shortest_transition(0b11100, 0b111), [0, 0])
+        self.assertEqual(graph.shortest_transition(0b111, 0b11100), [5, 5, 5])
+        self.assertRaises(ValueError, graph.shortest_transition, [1, 1, 1, 1], [1, 1, 1])
+
+        # matches the ground state transitions of Pattern
+        for data in ([5, 1], [4, 1, 4], [5, 5, 0, 5, 0]):
+            pattern = Pattern(data)
+            self.assertEqual(graph.shortest_transition([1, 1, 1], pattern.current_state), pattern.entry_transitions)
+            self.assertEqual(graph.shortest_transition(pattern.current_state, [1, 1, 1]), pattern.exit_transitions)
+
+    def test_pattern_transition(self):
+        graph = state.StateGraph(3, 5)
+        self.assertEqual(graph.pattern_transition(Pattern([3]), Pattern([5, 1])), ([4], 0, 0))
+        self.assertEqual(graph.pattern_transition(Pattern([5, 1]), Pattern([3])), ([2], 0, 0))
+        self.assertEqual(graph.pattern_transition(Pattern([4, 4, 1]), Pattern([5, 3, 1])), ([], 0, 0))
+        self.assertEqual(graph.pattern_transition(Pattern([5, 5, 0, 5, 0]), Pattern([4, 4, 1]))[0], [])
+        self.assertRaises(ValueError, graph.pattern_transition, Pattern([4, 4, 2]), Pattern([3]))
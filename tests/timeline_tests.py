@@ -0,0 +1,76 @@
+import unittest
+
+from juggling.notation.siteswap import parse_siteswap
+from juggling.pattern import Pattern
+from juggling.pattern import timeline
+from juggling.pattern.timeline import PropEvent, Timeline
+
+
+SITESWAPS = ['3', '441', '531', 'b97531', '[54]24', '[43]23', '(4,4)', '(6x,4)*', '(4,2x)*', '([44x],2)*',
+             '(4,2)(2x,[44x])']
+
+
+class TimelineTests(unittest.TestCase):
+    use_numpy = False
+
+    def setUp(self):
+        if self.use_numpy and timeline.numpy is None:
+            self.skipTest('NumPy is not installed')
+
+    def _rows(self, values):
+        return [[float(_) for _ in row] for row in values]
+
+    def test_events(self):
+        t = Timeline([4, 4, 1])
+        self.assertEqual(t.num_props, 3)
+        self.assertEqual(t.cycle, 18)
+        self.assertEqual(t.events[0], [PropEvent(0, 0, 4, 4), PropEvent(0, 4, 8, 4), PropEvent(0, 8, 9, 1),
+                                       PropEvent(1, 9, 13, 4), PropEvent(1, 13, 17, 4), PropEvent(1, 17, 18, 1)])
+        self.assertEqual([_[0].throw_beat for _ in t.events], [0, 2, 1])
+
+        t = Timeline(parse_siteswap('(6x,4)*'))
+        self.assertEqual(t.cycle, 12)
+        self.assertEqual(t.events[0], [PropEvent(0, 0, 6, 6), PropEvent(1, 6, 12, 6)])
+
+        self.assertEqual(Timeline([0]).num_props, 0)
+        self.assertRaises(ValueError, Timeline, [4, 4, 2])
+
+    def test_props_are_always_in_the_air(self):
+        for siteswap in SITESWAPS:
+            t = Timeline(Pattern(parse_siteswap(siteswap)))
+            self.assertEqual(t.num_props, t.pattern.num_objects, siteswap)
+            for events in t.events:
+                self.assertEqual(events[0].throw_beat, min(_.throw_beat for _ in events))
+                following = events[1:] + [events[0]._replace(throw_beat=events[0].throw_beat + t.cycle)]
+                for event, next_event in zip(events, following):
+                    self.assertEqual(event.catch_beat, next_event.throw_beat, siteswap)
+                    self.assertEqual(event.catch_beat - event.throw_beat, event.height, siteswap)
+
+    def test_sample(self):
+        t = Timeline([4, 4, 1])
+        sample = t.sample([0, 0.5, 8.5, 18.5, -0.5], use_numpy=self.use_numpy)
+        self.assertEqual(self._rows(sample.height), [[4, 4, 4], [4, 4, 4], [1, 4, 4], [4, 4, 4], [1, 4, 4]])
+        self.assertEqual(self._rows(sample.throw_hand), [[0, 0, 1], [0, 0, 1], [0, 1, 0], [0, 0, 1], [1, 0, 1]])
+        self.assertEqual(self._rows(sample.catch_hand), [[0, 0, 1], [0, 0, 1], [1, 1, 0], [0, 0, 1], [0, 0, 1]])
+        self.assertEqual(self._rows(sample.progress), [[0, 0.5, 0.75], [0.125, 0.625, 0.875], [0.5, 0.375, 0.625],
+                                                       [0.125, 0.625, 0.875], [0.5, 0.375, 0.625]])
+
+        x, y = t.positions([0.5, 8.5], use_numpy=self.use_numpy)
+        self.assertEqual(self._rows(x), [[0, 0, 1], [0.5, 1, 0]])
+        self.assertEqual(self._rows(y), [[0.875, 1.875, 0.875], [0.125, 1.875, 1.875]])
+
+        self.assertEqual(len(t.sample([], use_numpy=self.use_numpy).height), 0)
+
+    def test_matches_pure_python(self):
+        times = [_ / 7. for _ in range(-20, 200)]
+        for siteswap in SITESWAPS:
+            t = Timeline(parse_siteswap(siteswap))
+            expected = t.sample(times, use_numpy=False)
+            for column, values in zip(t.sample(times, use_numpy=self.use_numpy), expected):
+                for row, expected_row in zip(self._rows(column), values):
+                    for value, expected_value in zip(row, expected_row):
+                        self.assertAlmostEqual(value, expected_value)
+
+
+class NumpyTimelineTests(TimelineTests):
+    use_numpy = True
@@ -0,0 +1,76 @@
+import unittest
+from array import array
+
+from juggling.utils import CacheProperties, cached_property, clears_cache
+from juggling.utils import array_to_bytes, gcd, lcm, numpy_enabled, numpy
+
+
+class Cached(CacheProperties):
+    _cache_exclude = ['uncached']
+
+    def __init__(self):
+        super(Cached, self).__init__()
+        self.calls = 0
+        self.value = 1
+
+    @property
+    def cached(self):
+        self.calls += 1
+        return self.value
+
+    @property
+    def uncached(self):
+        self.calls += 1
+        return self.value
+
+    @clears_cache
+    def mutate(self):
+        self.__dict__['value'] += 1
+
+
+class CachePropertiesTests(unittest.TestCase):
+    def test_properties_are_cached(self):
+        self.assertIsInstance(Cached.__dict__['cached'], cached_property)
+        self.assertNotIsInstance(Cached.__dict__['uncached'], cached_property)
+
+        c = Cached()
+        self.assertEqual(c.cached, 1)
+        self.assertEqual(c.cached, 1)
+        self.assertEqual(c.calls, 1)
+
+        self.assertEqual(c.uncached, 1)
+        self.assertEqual(c.uncached, 1)
+        self.assertEqual(c.calls, 3)
+
+    def test_clear_cache(self):
+        c = Cached()
+        self.assertEqual(c.cached, 1)
+        c.mutate()
+        self.assertEqual(c.cached, 2)
+        c._clear_cache()
+        self.assertEqual(c.cached, 2)
+        self.assertEqual(c.calls, 3)
+
+    def test_set_attribute(self):
+        c = Cached()
+        self.assertRaises(AttributeError, setattr, c, 'cached', 3)
+
+
+class HelperTests(unittest.TestCase):
+    def test_gcd_lcm(self):
+        self.assertEqual(gcd(12, 18), 6)
+        self.assertEqual(gcd(7, 0), 7)
+        self.assertEqual(lcm(2, 9), 18)
+        self.assertEqual(lcm(4, 6), 12)
+
+    def test_array_to_bytes(self):
+        self.assertEqual(array_to_bytes(array('B', [1, 2, 255])), b'\x01\x02\xff')
+        self.assertEqual(len(array_to_bytes(array('h', [1, -1]))), 4)
+
+    def test_numpy_enabled(self):
+        self.assertFalse(numpy_enabled(False))
+        self.assertEqual(numpy_enabled(), numpy is not None)
+        if numpy is None:
+            self.assertRaises(ImportError, numpy_enabled, True)
+        else:
+            self.assertTrue(numpy_enabled(True))